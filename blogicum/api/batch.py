@@ -0,0 +1,132 @@
+from django import forms
+
+from blog import bulk
+from blog.duplicates import index_posts
+from blog.forms import CommentForm, PostForm
+from blog.models import Comment, Post
+from blog.moderation import hold, screen_many
+from blog.tags import add_tags_to_posts
+
+
+class PreloadedModelChoiceField(forms.ModelChoiceField):
+    """Выбор объекта из заранее загруженного словаря {pk: объект}.
+
+    Для пачки элементов связанные объекты читаются одним запросом
+    `in_bulk`, а не запросом на каждый элемент.
+    """
+
+    def __init__(self, objects, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.objects = objects
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            return self.objects[int(value)]
+        except (KeyError, TypeError, ValueError):
+            raise forms.ValidationError(
+                self.error_messages['invalid_choice'], code='invalid_choice'
+            )
+
+
+def to_pk(value):
+    if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+        return int(value)
+    return None
+
+
+def referenced_ids(items, name):
+    return {to_pk(item.get(name)) for item in items} - {None}
+
+
+def make_batch_form(form_class, items, field_names):
+    """Подкласс формы, в котором внешние ключи берутся из предзагрузки.
+
+    Правила валидации остаются правилами `form_class`; исключается
+    только повторная проверка существования внешних ключей моделью.
+    """
+    attrs = {}
+    for name in field_names:
+        field = form_class.base_fields[name]
+        attrs[name] = PreloadedModelChoiceField(
+            field.queryset.in_bulk(referenced_ids(items, name)),
+            queryset=field.queryset,
+            required=field.required,
+            label=field.label,
+        )
+
+    def _get_validation_exclusions(self):
+        return [
+            *forms.ModelForm._get_validation_exclusions(self), *field_names
+        ]
+
+    attrs['_get_validation_exclusions'] = _get_validation_exclusions
+    return type(f'Batch{form_class.__name__}', (form_class,), attrs)
+
+
+def validate_items(form_class, items, author):
+    """Проверяет элементы формой `form_class`. Возвращает
+    ([(индекс, форма для сохранения)], {индекс: ошибки}).
+    """
+    valid, errors = [], {}
+    for index, item in enumerate(items):
+        form = form_class(data=item)
+        if form.is_valid():
+            form.save(commit=False).author = author
+            valid.append((index, form))
+        else:
+            errors[index] = form.errors.get_json_data()
+    return valid, errors
+
+
+def validate_posts(items, author):
+    return validate_items(
+        make_batch_form(PostForm, items, ('category', 'location')),
+        items,
+        author,
+    )
+
+
+def create_posts(forms):
+    """Сохраняет посты одним bulk_create, затем теги, их счётчики
+    и сигнатуры дубликатов — одним проходом на всю пачку.
+    """
+    posts = bulk.bulk_create(Post, [form.instance for form in forms])
+    add_tags_to_posts([
+        (form.instance, form.cleaned_data['tags']) for form in forms
+    ])
+    index_posts(posts)
+    return posts
+
+
+def validate_comments(items, author):
+    posts = Post.objects.in_bulk(referenced_ids(items, 'post'))
+    valid, errors = [], {}
+    for index, item in enumerate(items):
+        form = CommentForm(data=item)
+        post = posts.get(to_pk(item.get('post')))
+        if form.is_valid() and post is not None:
+            comment = form.save(commit=False)
+            comment.author = author
+            comment.post = post
+            valid.append((index, form))
+        else:
+            item_errors = form.errors.get_json_data()
+            if post is None:
+                item_errors['post'] = [{
+                    'message': 'Публикация не найдена.', 'code': 'invalid'
+                }]
+            errors[index] = item_errors
+    return valid, errors
+
+
+def create_comments(forms):
+    """Проверяет комментарии фильтром спама, как форма сайта, и
+    сохраняет их одним bulk_create.
+    """
+    comments = [form.instance for form in forms]
+    scores = screen_many(comments)
+    bulk.bulk_create(Comment, comments)
+    hold(comments, scores)
+    return comments
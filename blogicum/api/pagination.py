@@ -0,0 +1,72 @@
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from .serializers import ApiError
+
+
+class CursorPagination:
+    """Постраничная выдача по ключу (keyset) вместо OFFSET.
+
+    `ordering` — последовательность (поле, по убыванию, разбор значения).
+    Курсор хранит значения полей сортировки последней выданной строки,
+    поэтому следующая страница выбирается диапазоном по индексу.
+    """
+
+    def __init__(self, *ordering):
+        self.ordering = ordering
+
+    @property
+    def order_by(self):
+        return [
+            f'-{field}' if descending else field
+            for field, descending, _ in self.ordering
+        ]
+
+    @property
+    def columns(self):
+        return [field for field, _, _ in self.ordering]
+
+    def encode(self, row):
+        values = [
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in (row[field] for field in self.columns)
+        ]
+        return base64.urlsafe_b64encode(
+            json.dumps(values).encode()
+        ).decode().rstrip('=')
+
+    def decode(self, cursor):
+        try:
+            values = json.loads(
+                base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            )
+            if len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                parse(value)
+                for value, (_, _, parse) in zip(values, self.ordering)
+            ]
+        except (ValueError, TypeError, binascii.Error):
+            raise ApiError('Некорректный курсор.')
+
+    def filter(self, cursor):
+        """Условие «строго после курсора» в порядке сортировки."""
+        values = self.decode(cursor)
+        condition = Q()
+        equal = {}
+        for (field, descending, _), value in zip(self.ordering, values):
+            lookup = f'{field}__lt' if descending else f'{field}__gt'
+            condition |= Q(**equal, **{lookup: value})
+            equal[field] = value
+        return condition
+
+
+def parse_date(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(value)
+    return parsed
@@ -0,0 +1,114 @@
+from django.conf import settings
+
+
+class ApiError(Exception):
+    """Ошибка запроса к API, которая отдаётся клиенту как JSON."""
+
+    def __init__(self, detail, status=400):
+        super().__init__(detail)
+        self.detail = detail
+        self.status = status
+
+
+def isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def media_url(value):
+    return settings.MEDIA_URL + value if value else None
+
+
+class Serializer:
+    """Сериализатор строк `values()` в словари без создания моделей.
+
+    `fields` — {имя поля ответа: (колонки queryset, функция от строки)},
+    `annotations` — выражения для вычисляемых полей. Колонки выбранных
+    полей передаются в `values()`, поэтому из БД читается только то,
+    что запросил клиент параметром `?fields=`.
+    """
+
+    fields = {}
+    annotations = {}
+
+    def __init__(self, requested=None):
+        if requested:
+            names = [name for name in requested.split(',') if name]
+            unknown = set(names) - set(self.fields)
+            if unknown:
+                raise ApiError(
+                    'Неизвестные поля: ' + ', '.join(sorted(unknown))
+                )
+        else:
+            names = list(self.fields)
+        self.names = names
+
+    def columns(self, extra=()):
+        columns = {'pk', *extra}
+        for name in self.names:
+            columns.update(self.fields[name][0])
+        return sorted(columns)
+
+    def prepare(self, queryset, extra_columns=()):
+        for name in self.names:
+            if name in self.annotations:
+                queryset = queryset.annotate(**{name: self.annotations[name]})
+        return queryset.values(*self.columns(extra_columns))
+
+    def serialize(self, row):
+        return {name: self.fields[name][1](row) for name in self.names}
+
+
+def column(name, convert=None):
+    if convert is None:
+        return ((name,), lambda row: row[name])
+    return ((name,), lambda row: convert(row[name]))
+
+
+class PostSerializer(Serializer):
+    fields = {
+        'id': column('pk'),
+        'title': column('title'),
+        'text': column('text'),
+        'pub_date': column('pub_date', isoformat),
+        'author': column('author__username'),
+        'category': column('category__slug'),
+        'location': (
+            ('location__name', 'location__is_published'),
+            lambda row: (
+                row['location__name']
+                if row['location__is_published'] else None
+            ),
+        ),
+        'image': column('image', media_url),
+        'comment_count': column('comment_count'),
+    }
+
+
+class CommentSerializer(Serializer):
+    fields = {
+        'id': column('pk'),
+        'post': column('post_id'),
+        'author': column('author__username'),
+        'text': column('text'),
+        'created_at': column('created_at', isoformat),
+    }
+
+
+class CategorySerializer(Serializer):
+    fields = {
+        'slug': column('slug'),
+        'title': column('title'),
+        'description': column('description'),
+    }
+
+
+class ProfileSerializer(Serializer):
+    fields = {
+        'username': column('username'),
+        'first_name': column('first_name'),
+        'last_name': column('last_name'),
+        'date_joined': column('date_joined', isoformat),
+        'published_posts': column('stats__published_posts'),
+        'comments_received': column('stats__comments_received'),
+        'last_post_date': column('stats__last_post_date', isoformat),
+    }
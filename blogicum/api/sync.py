@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import Max
+from django.utils import timezone
+
+from blog.models import ChangeLog, Comment, Post
+from constants import Constants
+from .serializers import ApiError, CommentSerializer, PostSerializer
+
+
+def make_token(log_id, moment):
+    return f'{log_id}.{int(moment.timestamp())}'
+
+
+def parse_token(token):
+    try:
+        log_id, timestamp = token.split('.')
+        moment = datetime.fromtimestamp(int(timestamp), tz=dt_timezone.utc)
+        return int(log_id), moment
+    except (ValueError, OverflowError, OSError):
+        raise ApiError('Некорректный токен синхронизации.')
+
+
+def current_token():
+    last_id = ChangeLog.objects.aggregate(last=Max('pk'))['last'] or 0
+    return make_token(last_id, timezone.now())
+
+
+def latest_actions(rows):
+    """Итоговое действие по каждому объекту: created, updated или deleted.
+
+    Объект, созданный в пределах окна, остаётся созданным после
+    изменений; удаление перекрывает всё остальное.
+    """
+    actions = {}
+    for content, object_id, action in rows:
+        key = (content, object_id)
+        if action == ChangeLog.DELETED or key not in actions:
+            actions[key] = action
+    return actions
+
+
+def split_changes(actions, content, visible_rows, serializer):
+    """Раскладывает изменения объектов одного типа по спискам.
+
+    Объект, который больше не виден клиентам (удалён, снят
+    с публикации, спрятан вместе с категорией), отдаётся как удалённый.
+    """
+    changed_ids = {
+        object_id for (kind, object_id) in actions if kind == content
+    }
+    visible = {row['pk']: row for row in visible_rows(changed_ids)}
+    result = {'created': [], 'updated': [], 'deleted': []}
+    for object_id in sorted(changed_ids):
+        if object_id not in visible:
+            result['deleted'].append(object_id)
+            continue
+        action = actions[(content, object_id)]
+        bucket = 'created' if action == ChangeLog.CREATED else 'updated'
+        result[bucket].append(serializer.serialize(visible[object_id]))
+    return result
+
+
+def get_changes(since):
+    """Изменения после токена `since`.
+
+    Помимо журнала учитываются отложенные посты, дата публикации которых
+    наступила с момента выдачи токена: для них записи в журнале нет.
+    """
+    since_id, since_moment = parse_token(since)
+    now = timezone.now()
+    retention = timedelta(days=Constants.CHANGELOG_RETENTION_DAYS)
+    if since_moment < now - retention:
+        raise ApiError(
+            'Токен устарел, выполните полную синхронизацию.', status=410
+        )
+    rows = list(
+        ChangeLog.objects.filter(pk__gt=since_id).order_by('pk').values_list(
+            'pk', 'content', 'object_id', 'action'
+        )[:Constants.CHANGELOG_PAGE_SIZE]
+    )
+    has_more = len(rows) == Constants.CHANGELOG_PAGE_SIZE
+    actions = latest_actions(row[1:] for row in rows)
+    for post_id in Post.published_posts.filter(
+        pub_date__gt=since_moment, pub_date__lte=now
+    ).values_list('pk', flat=True):
+        actions.setdefault((ChangeLog.POST, post_id), ChangeLog.UPDATED)
+
+    post_serializer = PostSerializer()
+    comment_serializer = CommentSerializer()
+    visible_posts = Post.published_posts.all()
+
+    def visible_post_rows(ids):
+        return post_serializer.prepare(visible_posts.filter(pk__in=ids))
+
+    def visible_comment_rows(ids):
+        return comment_serializer.prepare(
+            Comment.objects.filter(
+                pk__in=ids, is_published=True, post__in=visible_posts
+            )
+        )
+
+    last_id = rows[-1][0] if rows else since_id
+    return {
+        'token': make_token(last_id, now if not has_more else since_moment),
+        'has_more': has_more,
+        'posts': split_changes(
+            actions, ChangeLog.POST, visible_post_rows, post_serializer
+        ),
+        'comments': split_changes(
+            actions, ChangeLog.COMMENT, visible_comment_rows,
+            comment_serializer
+        ),
+    }
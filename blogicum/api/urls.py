@@ -0,0 +1,38 @@
+from django.urls import path
+
+from blog.throttling import throttle
+from . import views
+
+
+app_name = 'api'
+
+urlpatterns = [
+    path('posts/', views.PostListView.as_view(), name='posts'),
+    path(
+        'posts/batch/',
+        throttle(user='10/h', ip='30/h')(views.PostBatchView.as_view()),
+        name='posts_batch'
+    ),
+    path(
+        'posts/<int:post_id>/',
+        views.PostDetailView.as_view(),
+        name='post'
+    ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.CommentListView.as_view(),
+        name='comments'
+    ),
+    path(
+        'comments/batch/',
+        throttle(user='10/h', ip='30/h')(views.CommentBatchView.as_view()),
+        name='comments_batch'
+    ),
+    path('changes/', views.ChangesView.as_view(), name='changes'),
+    path('categories/', views.CategoryListView.as_view(), name='categories'),
+    path(
+        'profiles/<str:username>/',
+        views.ProfileDetailView.as_view(),
+        name='profile'
+    ),
+]
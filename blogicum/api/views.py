@@ -0,0 +1,315 @@
+import base64
+import binascii
+import json
+
+from django.contrib.auth import authenticate, get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from blog import bulk
+from blog.models import Category, Comment, Post
+from constants import Constants
+from .batch import (
+    create_comments,
+    create_posts,
+    validate_comments,
+    validate_items,
+    validate_posts,
+)
+from .pagination import CursorPagination, parse_date
+from .sync import current_token, get_changes
+from .serializers import (
+    ApiError,
+    CategorySerializer,
+    CommentSerializer,
+    PostSerializer,
+    ProfileSerializer,
+)
+
+User = get_user_model()
+
+
+def dumps(data):
+    return json.dumps(data, ensure_ascii=False)
+
+
+class ApiView(View):
+    """Базовое представление API: только чтение, ошибки в JSON."""
+
+    http_method_names = ('get', 'head', 'options')
+    serializer_class = None
+    model = None
+    queryset = None
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return JsonResponse({'detail': error.detail}, status=error.status)
+        except Http404:
+            return JsonResponse({'detail': 'Не найдено.'}, status=404)
+
+    def get_serializer(self):
+        return self.serializer_class(self.request.GET.get('fields'))
+
+    def get_queryset(self):
+        """Как в generic-представлениях Django: копия `queryset` или
+        все объекты `model`.
+        """
+        if self.queryset is not None:
+            return self.queryset.all()
+        if self.model is not None:
+            return self.model._default_manager.all()
+        raise ImproperlyConfigured(
+            f'{self.__class__.__name__}: укажите model или queryset.'
+        )
+
+
+class DetailApiView(ApiView):
+    """Один объект: поле `lookup_field` равно параметру адреса
+    `lookup_url_kwarg`.
+    """
+
+    lookup_field = 'pk'
+    lookup_url_kwarg = 'pk'
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        row = serializer.prepare(self.get_queryset().filter(
+            **{self.lookup_field: self.kwargs[self.lookup_url_kwarg]}
+        )).first()
+        if row is None:
+            raise Http404
+        return JsonResponse(
+            serializer.serialize(row),
+            json_dumps_params={'ensure_ascii': False},
+        )
+
+
+class ListApiView(ApiView):
+    """Список с курсорной пагинацией, который отдаётся потоком.
+
+    Строки читаются из БД итератором и сериализуются по одной, поэтому
+    ответ не собирается в памяти целиком.
+    """
+
+    pagination = CursorPagination(('pk', False, int))
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get('limit', Constants.API_PAGE_SIZE))
+        except ValueError:
+            raise ApiError('Параметр limit должен быть числом.')
+        return max(1, min(limit, Constants.API_MAX_PAGE_SIZE))
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer()
+        limit = self.get_limit()
+        queryset = self.get_queryset().order_by(*self.pagination.order_by)
+        cursor = request.GET.get('cursor')
+        if cursor:
+            queryset = queryset.filter(self.pagination.filter(cursor))
+        rows = serializer.prepare(
+            queryset, self.pagination.columns
+        )[:limit + 1]
+        return StreamingHttpResponse(
+            self.stream(rows, serializer, limit),
+            content_type='application/json',
+        )
+
+    def next_url(self, row):
+        query = self.request.GET.copy()
+        query['cursor'] = self.pagination.encode(row)
+        return self.request.build_absolute_uri(
+            f'{self.request.path}?{query.urlencode()}'
+        )
+
+    def stream(self, rows, serializer, limit):
+        yield '{"results": ['
+        next_url = None
+        previous = None
+        for number, row in enumerate(rows.iterator()):
+            if number == limit:
+                next_url = self.next_url(previous)
+                break
+            yield (',' if number else '') + dumps(serializer.serialize(row))
+            previous = row
+        yield '], "next": ' + dumps(next_url) + '}'
+
+
+class PostListView(ListApiView):
+    serializer_class = PostSerializer
+    pagination = CursorPagination(
+        ('pub_date', True, parse_date), ('pk', True, int)
+    )
+
+    def get_queryset(self):
+        # Не атрибут queryset: видимость зависит от текущего времени.
+        queryset = Post.published_posts.all()
+        if 'category' in self.request.GET:
+            queryset = queryset.filter(
+                category__slug=self.request.GET['category']
+            )
+        if 'author' in self.request.GET:
+            queryset = queryset.filter(
+                author__username=self.request.GET['author']
+            )
+        return queryset
+
+
+class PostDetailView(DetailApiView):
+    serializer_class = PostSerializer
+    lookup_url_kwarg = 'post_id'
+
+    def get_queryset(self):
+        return Post.published_posts.all()
+
+
+class CommentListView(ListApiView):
+    serializer_class = CommentSerializer
+
+    def get_queryset(self):
+        if not Post.published_posts.filter(
+            pk=self.kwargs['post_id']
+        ).exists():
+            raise Http404
+        return Comment.objects.filter(
+            post_id=self.kwargs['post_id'], is_published=True
+        )
+
+
+class CategoryListView(ListApiView):
+    serializer_class = CategorySerializer
+    queryset = Category.objects.filter(is_published=True)
+
+
+class ProfileDetailView(DetailApiView):
+    serializer_class = ProfileSerializer
+    queryset = User.objects.filter(is_active=True)
+    lookup_field = lookup_url_kwarg = 'username'
+
+
+class ChangesView(ApiView):
+    """Изменения постов и комментариев после токена `?since=`.
+
+    Без `since` возвращается только текущий токен: клиент загружает
+    данные списками и дальше синхронизируется от этого токена.
+    """
+
+    def get(self, request, *args, **kwargs):
+        since = request.GET.get('since')
+        if not since:
+            return JsonResponse({'token': current_token()})
+        return JsonResponse(
+            get_changes(since), json_dumps_params={'ensure_ascii': False}
+        )
+
+
+def authenticate_request(request):
+    """Пользователь запроса к API на запись.
+
+    Принимается HTTP Basic (для скриптов миграции) или сессия сайта;
+    для сессии CSRF-токен проверяется так же, как в формах.
+    """
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if header.startswith('Basic '):
+        try:
+            username, password = base64.b64decode(
+                header[len('Basic '):]
+            ).decode().split(':', 1)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ApiError('Некорректный заголовок Authorization.', 401)
+        user = authenticate(request, username=username, password=password)
+        if user is None:
+            raise ApiError('Неверное имя пользователя или пароль.', 401)
+        return user
+    if request.user.is_authenticated:
+        rejected = CsrfViewMiddleware(lambda request: None).process_view(
+            request, None, (), {}
+        )
+        if rejected is not None:
+            raise ApiError('Ошибка проверки CSRF.', 403)
+        return request.user
+    raise ApiError('Требуется авторизация.', 401)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class BatchCreateView(ApiView):
+    """Пакетное создание объектов из JSON `{"items": [...]}`.
+
+    Элементы проверяются правилами форм сайта (по умолчанию
+    `form_class`), корректные сохраняются через bulk_create в одной
+    транзакции вместе с тегами, счётчиками и очередью модерации,
+    в ответе — результат по каждому элементу.
+    """
+
+    http_method_names = ('post', 'options')
+    form_class = None
+
+    def validate(self, items, author):
+        return validate_items(self.form_class, items, author)
+
+    def create(self, forms):
+        return bulk.bulk_create(self.model, [form.instance for form in forms])
+
+    def get_items(self):
+        try:
+            items = json.loads(self.request.body)['items']
+        except (ValueError, KeyError, TypeError):
+            raise ApiError('Ожидается JSON-объект с ключом items.')
+        if not isinstance(items, list) or not all(
+            isinstance(item, dict) for item in items
+        ):
+            raise ApiError('items должен быть списком объектов.')
+        if len(items) > Constants.API_BATCH_MAX_ITEMS:
+            raise ApiError(
+                f'Не больше {Constants.API_BATCH_MAX_ITEMS} элементов '
+                'за запрос.', 413
+            )
+        return items
+
+    def post(self, request, *args, **kwargs):
+        author = authenticate_request(request)
+        items = self.get_items()
+        valid, errors = self.validate(items, author)
+        with transaction.atomic():
+            self.create([form for _, form in valid])
+        results = [None] * len(items)
+        for index, form in valid:
+            results[index] = {'index': index, 'id': form.instance.pk}
+        for index, item_errors in errors.items():
+            results[index] = {'index': index, 'errors': item_errors}
+        return JsonResponse(
+            {
+                'created': len(valid),
+                'failed': len(errors),
+                'results': results,
+            },
+            status=201 if valid else 400,
+            json_dumps_params={'ensure_ascii': False},
+        )
+
+
+class PostBatchView(BatchCreateView):
+    model = Post
+
+    def validate(self, items, author):
+        return validate_posts(items, author)
+
+    def create(self, forms):
+        return create_posts(forms)
+
+
+class CommentBatchView(BatchCreateView):
+    model = Comment
+
+    def validate(self, items, author):
+        return validate_comments(items, author)
+
+    def create(self, forms):
+        return create_comments(forms)
@@ -1,11 +1,158 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
 
-from .models import Post, Category, Location, Comment
+from constants import Constants
+from . import bulk, moderation
+from .models import (
+    Category,
+    Comment,
+    CommentModeration,
+    Location,
+    Post,
+    PostSignature,
+    Tag,
+)
+from .paginators import EstimatedCountPaginator
 
 admin.site.empty_value_display = 'Не задано'
 
 
-admin.site.register(Post)
-admin.site.register(Category)
-admin.site.register(Location)
-admin.site.register(Comment)
+class HighVolumeAdmin(admin.ModelAdmin):
+    """Список без полного COUNT(*) для больших таблиц."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = Constants.ADMIN_LIST_PER_PAGE
+    actions = ('publish', 'unpublish')
+
+    @admin.action(description='Опубликовать выбранные')
+    def publish(self, request, queryset):
+        updated = bulk.set_published(queryset, True)
+        self.message_user(request, f'Опубликовано: {updated}.')
+
+    @admin.action(description='Снять с публикации выбранные')
+    def unpublish(self, request, queryset):
+        updated = bulk.set_published(queryset, False)
+        self.message_user(request, f'Снято с публикации: {updated}.')
+
+
+class PostActionForm(ActionForm):
+    category = forms.ModelChoiceField(
+        queryset=Category.objects.all(),
+        required=False,
+        label='Категория',
+    )
+
+
+@admin.register(Post)
+class PostAdmin(HighVolumeAdmin):
+    list_display = (
+        'title',
+        'author',
+        'category',
+        'location',
+        'pub_date',
+        'is_published',
+    )
+    list_editable = ('is_published',)
+    list_filter = ('is_published', 'category')
+    list_select_related = ('author', 'category', 'location')
+    search_fields = ('^title', '=author__username')
+    autocomplete_fields = ('author', 'category', 'location')
+    date_hierarchy = 'pub_date'
+    ordering = ('-pub_date',)
+    action_form = PostActionForm
+    actions = HighVolumeAdmin.actions + ('change_category',)
+
+    @admin.action(description='Перенести выбранные в категорию')
+    def change_category(self, request, queryset):
+        form = PostActionForm(request.POST)
+        if not form.is_valid() or form.cleaned_data['category'] is None:
+            self.message_user(
+                request, 'Выберите категорию.', level=messages.WARNING
+            )
+            return
+        category = form.cleaned_data['category']
+        updated = bulk.set_category(queryset, category)
+        self.message_user(
+            request, f'Перенесено в «{category}»: {updated}.'
+        )
+
+
+@admin.register(Comment)
+class CommentAdmin(HighVolumeAdmin):
+    list_display = ('__str__', 'author', 'post', 'created_at', 'is_published')
+    list_editable = ('is_published',)
+    list_filter = ('is_published',)
+    list_select_related = ('author', 'post')
+    search_fields = ('=author__username',)
+    autocomplete_fields = ('author', 'post')
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at',)
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ('title', 'slug', 'is_published', 'created_at')
+    list_editable = ('is_published',)
+    search_fields = ('title', 'slug')
+    prepopulated_fields = {'slug': ('title',)}
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'is_published', 'created_at')
+    list_editable = ('is_published',)
+    search_fields = ('name',)
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug', 'post_count')
+    readonly_fields = ('post_count',)
+    search_fields = ('name', 'slug')
+    prepopulated_fields = {'slug': ('name',)}
+
+
+@admin.register(PostSignature)
+class DuplicatePostAdmin(admin.ModelAdmin):
+    """Группы почти дубликатов для модерации."""
+
+    list_display = ('post', 'cluster')
+    list_select_related = ('post',)
+    exclude = ('signature',)
+    readonly_fields = ('post', 'cluster')
+    ordering = ('cluster', 'post')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).filter(cluster__isnull=False)
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(CommentModeration)
+class CommentModerationAdmin(admin.ModelAdmin):
+    """Очередь комментариев, похожих на спам."""
+
+    list_display = ('comment', 'score', 'status', 'created_at')
+    list_filter = ('status',)
+    list_select_related = ('comment',)
+    readonly_fields = ('comment', 'score', 'created_at')
+    ordering = ('-score',)
+    list_per_page = Constants.ADMIN_LIST_PER_PAGE
+    actions = ('mark_spam', 'mark_ham')
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description='Подтвердить спам')
+    def mark_spam(self, request, queryset):
+        updated = moderation.review(queryset, True)
+        self.message_user(request, f'Отмечено как спам: {updated}.')
+
+    @admin.action(description='Не спам: опубликовать')
+    def mark_ham(self, request, queryset):
+        updated = moderation.review(queryset, False)
+        self.message_user(request, f'Опубликовано: {updated}.')
@@ -0,0 +1,158 @@
+from django.db import DatabaseError, connections, router, transaction
+from django.dispatch import Signal
+
+from constants import Constants
+from .models import Comment, Post
+
+# Отправляется один раз после массового изменения:
+# sender — модель, previous — состояние строк до изменения,
+# values — записанные значения полей.
+bulk_updated = Signal()
+# Отправляется перед bulk_create: objects — объекты, которые
+# ещё можно изменить (pre_save для них не отправляется).
+bulk_creating = Signal()
+# Отправляется один раз после bulk_create: objects — созданные объекты
+# с заполненными первичными ключами.
+bulk_created = Signal()
+
+SNAPSHOT_FIELDS = {
+    Post: (
+        'pk',
+        'author_id',
+        'author__username',
+        'category__slug',
+        'category__is_published',
+        'is_published',
+        'pub_date',
+    ),
+    Comment: (
+        'pk',
+        'post_id',
+        'post__author__username',
+        'post__category__slug',
+        'is_published',
+    ),
+}
+
+
+def iterate_batches(queryset, fields, batch_size=None):
+    """Обходит queryset пачками по первичному ключу (keyset, без OFFSET)."""
+    batch_size = batch_size or Constants.BULK_BATCH_SIZE
+    rows = queryset.order_by('pk').values(*fields)
+    last_pk = None
+    while True:
+        page = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+        batch = list(page[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1]['pk']
+
+
+def bulk_update(queryset, **values):
+    """Массово записывает `values` одной командой UPDATE на пачку строк.
+
+    Сигналы save для отдельных объектов не отправляются: вместо них
+    после транзакции отправляется один `bulk_updated`.
+    """
+    model = queryset.model
+    previous = []
+    updated = 0
+    with transaction.atomic():
+        for batch in iterate_batches(queryset, SNAPSHOT_FIELDS[model]):
+            updated += model.objects.filter(
+                pk__in=[row['pk'] for row in batch]
+            ).update(**values)
+            previous.extend(batch)
+        if previous:
+            bulk_updated.send(sender=model, previous=previous, values=values)
+    return updated
+
+
+def set_published(queryset, is_published):
+    return bulk_update(queryset, is_published=is_published)
+
+
+def set_category(queryset, category):
+    return bulk_update(queryset, category=category)
+
+
+def insert_rows(queryset, objects, fields, using):
+    """Вставляет объекты по одной строке; ключ каждой строки
+    возвращает её INSERT.
+    """
+    returning_fields = queryset.model._meta.db_returning_fields
+    for obj in objects:
+        (returned,) = queryset._insert(
+            [obj],
+            fields=fields,
+            returning_fields=returning_fields,
+            using=using,
+        )
+        for value, field in zip(returned, returning_fields):
+            setattr(obj, field.attname, value)
+
+
+def insert_sqlite_batches(queryset, objects, fields, using):
+    """Вставляет объекты многострочными INSERT.
+
+    SQLite выполняет INSERT целиком под блокировкой записи и выдаёт
+    строкам одной команды ключи подряд, поэтому ключи пачки
+    восстанавливаются по last_insert_rowid() и changes() этой команды
+    в этом соединении — чужие вставки на них не влияют.
+    """
+    connection = connections[using]
+    batch_size = min(
+        Constants.BULK_BATCH_SIZE,
+        connection.ops.bulk_batch_size(fields, objects),
+    )
+    for start in range(0, len(objects), batch_size):
+        batch = objects[start:start + batch_size]
+        queryset._insert(batch, fields=fields, using=using)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT last_insert_rowid(), changes()')
+            last_pk, inserted = cursor.fetchone()
+        if inserted != len(batch):
+            raise DatabaseError(
+                f'Вставлено {inserted} строк вместо {len(batch)}.'
+            )
+        for pk, obj in enumerate(batch, start=last_pk - len(batch) + 1):
+            obj.pk = pk
+
+
+def insert_returning_pks(model, objects, using):
+    """bulk_create для бэкендов, которые не возвращают ключи
+    из многострочного INSERT (SQLite и MySQL в Django 3.2).
+    Вызывается внутри транзакции.
+    """
+    opts = model._meta
+    fields = [
+        field for field in opts.concrete_fields if field is not opts.auto_field
+    ]
+    queryset = model._base_manager.using(using)
+    queryset._prepare_for_bulk_create(objects)
+    if connections[using].vendor == 'sqlite':
+        insert_sqlite_batches(queryset, objects, fields, using)
+    else:
+        insert_rows(queryset, objects, fields, using)
+    for obj in objects:
+        obj._state.adding = False
+        obj._state.db = using
+
+
+def bulk_create(model, objects):
+    """Создаёт объекты пачками в одной транзакции и отправляет
+    один сигнал `bulk_created` вместо post_save на каждый объект.
+    """
+    using = router.db_for_write(model)
+    with transaction.atomic(using=using):
+        bulk_creating.send(sender=model, objects=objects)
+        if connections[using].features.can_return_rows_from_bulk_insert:
+            model.objects.bulk_create(
+                objects, batch_size=Constants.BULK_BATCH_SIZE
+            )
+        else:
+            insert_returning_pks(model, objects, using)
+        if objects:
+            bulk_created.send(sender=model, objects=objects)
+    return objects
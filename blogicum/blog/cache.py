@@ -0,0 +1,150 @@
+import json
+import re
+from contextlib import ExitStack
+from urllib.parse import parse_qsl, urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+from django.template import RequestContext
+from django.template.loader import get_template
+from django.urls import reverse
+
+from constants import Constants
+
+PAGE_CACHE_PREFIX = 'page'
+# Варианты записи одной страницы: сжатые копии для анонимов
+# и общая копия с «дырками» для авторизованных пользователей.
+SHARED_VARIANT = 'shared'
+PAGE_VARIANTS = ('identity', 'gzip', 'br', SHARED_VARIANT)
+
+HOLE_RE = re.compile(r'<!--hole (\{.*?\}) -->')
+
+
+def normalize_query(query_string):
+    """Сортирует параметры запроса, чтобы `?a=1&b=2` и `?b=2&a=1`
+    попадали в одну запись кеша.
+    """
+    return urlencode(sorted(parse_qsl(query_string, keep_blank_values=True)))
+
+
+def page_cache_key(path, query_string, variant):
+    return (
+        f'{PAGE_CACHE_PREFIX}:{variant or "identity"}:'
+        f'{path}?{normalize_query(query_string)}'
+    )
+
+
+def make_hole(template_name, params):
+    """Метка на месте пользовательского фрагмента в общей копии страницы."""
+    return '<!--hole {} -->'.format(
+        json.dumps({'template': template_name, 'params': params})
+    )
+
+
+def fill_holes(content, request):
+    """Подставляет в общую копию страницы фрагменты текущего пользователя.
+
+    Контекст запроса строится один раз на ответ: context processors
+    не выполняются заново для каждого фрагмента.
+    """
+    context = RequestContext(request)
+    templates = {}
+
+    with ExitStack() as stack:
+        def render_hole(match):
+            hole = json.loads(match.group(1))
+            name = hole['template']
+            if name not in templates:
+                templates[name] = get_template(name).template
+            if context.template is None:
+                stack.enter_context(context.bind_template(templates[name]))
+            with context.push(hole['params']):
+                return templates[name].render(context)
+
+        return HOLE_RE.sub(render_hole, content)
+
+
+def feed_urls(path):
+    """Адреса первых страниц ленты: `path` и `path?page=1..N`."""
+    urls = [(path, '')]
+    urls += [
+        (path, f'page={number}')
+        for number in range(1, Constants.PAGE_CACHE_INVALIDATE_PAGES + 1)
+    ]
+    return urls
+
+
+def index_urls():
+    return feed_urls(reverse('blog:index'))
+
+
+def trending_urls():
+    return feed_urls(reverse('blog:trending'))
+
+
+def category_urls(slug):
+    if not slug:
+        return []
+    return feed_urls(reverse('blog:category_posts', args=(slug,)))
+
+
+def profile_urls(username):
+    if not username:
+        return []
+    return feed_urls(reverse('blog:profile', args=(username,)))
+
+
+def _delete_urls(keys):
+    cache.delete_many(keys)
+
+
+def invalidate_urls(urls):
+    """Удаляет из кеша страницы по списку пар (path, query_string).
+
+    Удаление выполняется сразу и повторяется после фиксации транзакции,
+    чтобы страница, закешированная до коммита, не пережила изменение.
+    """
+    keys = {
+        page_cache_key(path, query_string, variant)
+        for path, query_string in urls
+        for variant in PAGE_VARIANTS
+    }
+    if not keys:
+        return
+    keys = list(keys)
+    _delete_urls(keys)
+    transaction.on_commit(lambda: _delete_urls(keys))
+
+
+def detail_urls(post_id):
+    return [(reverse('blog:post_detail', args=(post_id,)), '')]
+
+
+def post_urls(post_id, category_slug, username):
+    """Страницы, на которых выводится пост или его карточка."""
+    return (
+        detail_urls(post_id)
+        + index_urls()
+        + trending_urls()
+        + category_urls(category_slug)
+        + profile_urls(username)
+    )
+
+
+def posts_urls(posts):
+    """Страницы, затрагиваемые изменением набора постов (queryset)."""
+    post_ids, category_slugs, usernames = set(), set(), set()
+    for post_id, category_slug, username in posts.values_list(
+        'pk', 'category__slug', 'author__username'
+    ):
+        post_ids.add(post_id)
+        category_slugs.add(category_slug)
+        usernames.add(username)
+    urls = index_urls() + trending_urls()
+    for post_id in post_ids:
+        urls += detail_urls(post_id)
+    for category_slug in category_slugs:
+        urls += category_urls(category_slug)
+    for username in usernames:
+        urls += profile_urls(username)
+    return urls
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+# Бэкенды, данные которых не видны другим процессам.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+# Бэкенды, у которых incr — это get и set без блокировки: параллельные
+# запросы теряют приращения.
+NON_ATOMIC_CACHES = (
+    'django.core.cache.backends.db.DatabaseCache',
+    'django.core.cache.backends.filebased.FileBasedCache',
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Кеш страниц, буферизованные счётчики и ограничение частоты
+    запросов работают только с общим для всех процессов кешем
+    с атомарным incr: иначе `flush_counters` не видит накопленных
+    просмотров и лайков, сброс страниц из команд не доходит
+    до веб-процессов, а параллельные запросы теряют приращения
+    счётчиков и проходят мимо ограничения частоты.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    hint = 'Укажите в CACHES Memcached или Redis.'
+    if backend in NON_ATOMIC_CACHES:
+        return [
+            Error(
+                f'У {backend} неатомарный incr, а буферизованные '
+                'счётчики и ограничение частоты запросов требуют '
+                'атомарных приращений.',
+                hint=hint,
+                id='blog.E001',
+            )
+        ]
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    users = ['буферизованные счётчики', 'ограничение частоты запросов']
+    if settings.PAGE_CACHE_ENABLED:
+        users.insert(0, 'кеш страниц')
+    return [
+        Error(
+            f'{backend} хранит данные в памяти одного процесса, '
+            f'а {", ".join(users)} требуют общего кеша.',
+            hint=hint,
+            id='blog.E001',
+        )
+    ]
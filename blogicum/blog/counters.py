@@ -0,0 +1,167 @@
+"""Буферизованные счётчики: просмотры постов, лайки постов и комментариев.
+
+Событие меняет счётчик в кеше (атомарный incr), а команда
+`flush_counters` переносит накопленное в БД одним UPDATE на пачку
+объектов, так что читатели и популярные посты не упираются
+в единственного писателя SQLite и блокировку строки счётчика.
+
+Счётчики разбиты на поколения. Сброс переключает текущее поколение
+и переносит в БД поколения старше предыдущего: запросы, успевшие
+прочитать старый номер поколения, к этому времени уже завершены.
+Нужен общий для процессов кеш с атомарным incr (Memcached, Redis).
+"""
+from django.core.cache import cache
+from django.db.models import Case, F, Value, When
+
+from constants import Constants
+from .models import Comment, Post, TrendingPost
+
+
+class BufferedCounter:
+    """Счётчик в поле `field` модели `model`, накапливаемый в кеше."""
+
+    def __init__(self, name, model, field):
+        self.name = name
+        self.model = model
+        self.field = field
+
+    @property
+    def generation_key(self):
+        return f'counter:{self.name}:generation'
+
+    @property
+    def flushed_key(self):
+        return f'counter:{self.name}:flushed'
+
+    def counter_key(self, generation, object_id):
+        return f'counter:{self.name}:{generation}:{object_id}'
+
+    def journal_key(self, generation, number=None):
+        if number is None:
+            return f'counter:{self.name}:{generation}:journal'
+        return f'counter:{self.name}:{generation}:journal:{number}'
+
+    def get_generation(self):
+        return cache.get(self.generation_key, 0)
+
+    def record(self, object_id, delta=1):
+        """Изменяет счётчик. Объект попадает в журнал поколения один
+        раз: при создании его счётчика.
+        """
+        generation = self.get_generation()
+        key = self.counter_key(generation, object_id)
+        try:
+            cache.incr(key, delta)
+            return
+        except ValueError:
+            if not cache.add(key, delta, Constants.COUNTER_TIMEOUT):
+                cache.incr(key, delta)
+                return
+        journal = self.journal_key(generation)
+        cache.add(journal, 0, Constants.COUNTER_TIMEOUT)
+        cache.set(
+            self.journal_key(generation, cache.incr(journal)),
+            object_id,
+            Constants.COUNTER_TIMEOUT,
+        )
+
+    def pending_generations(self):
+        return range(
+            cache.get(self.flushed_key, -1) + 1, self.get_generation() + 1
+        )
+
+    def pending_many(self, object_ids):
+        """Изменения, ещё не перенесённые в БД: {id: приращение}."""
+        keys = {
+            self.counter_key(generation, object_id): object_id
+            for generation in self.pending_generations()
+            for object_id in object_ids
+        }
+        pending = dict.fromkeys(object_ids, 0)
+        for key, value in cache.get_many(keys).items():
+            pending[keys[key]] += value
+        return pending
+
+    def pending(self, object_id):
+        return self.pending_many([object_id])[object_id]
+
+    def total(self, object_id):
+        stored = self.model.objects.filter(pk=object_id).values_list(
+            self.field, flat=True
+        ).first() or 0
+        return max(stored + self.pending(object_id), 0)
+
+    def collect_generation(self, generation):
+        count = cache.get(self.journal_key(generation), 0)
+        journal = [
+            self.journal_key(generation, number)
+            for number in range(1, count + 1)
+        ]
+        keys = {
+            self.counter_key(generation, object_id): object_id
+            for object_id in set(cache.get_many(journal).values())
+        }
+        counts = {
+            keys[key]: value for key, value in cache.get_many(keys).items()
+        }
+        cache.delete_many(
+            journal + list(keys) + [self.journal_key(generation)]
+        )
+        return counts
+
+    def save(self, counts):
+        """Добавляет приращения в БД: один UPDATE … CASE на пачку."""
+        object_ids = [
+            object_id for object_id, delta in counts.items() if delta
+        ]
+        size = Constants.BULK_BATCH_SIZE
+        for start in range(0, len(object_ids), size):
+            batch = object_ids[start:start + size]
+            self.model.objects.filter(pk__in=batch).update(**{
+                self.field: F(self.field) + Case(
+                    *(When(pk=object_id, then=Value(counts[object_id]))
+                      for object_id in batch),
+                    default=Value(0),
+                )
+            })
+
+    def flush(self):
+        """Переносит в БД изменения завершённых поколений.
+
+        Возвращает перенесённые приращения: {id: приращение}.
+        """
+        cache.add(self.generation_key, 0, None)
+        current = cache.incr(self.generation_key) - 1
+        flushed = cache.get(self.flushed_key, -1)
+        counts = {}
+        for generation in range(flushed + 1, current):
+            for object_id, delta in self.collect_generation(
+                generation
+            ).items():
+                counts[object_id] = counts.get(object_id, 0) + delta
+        self.save(counts)
+        cache.set(self.flushed_key, max(flushed, current - 1), None)
+        return counts
+
+
+post_views = BufferedCounter('views', Post, 'views')
+post_likes = BufferedCounter('likes:post', Post, 'likes')
+comment_likes = BufferedCounter('likes:comment', Comment, 'likes')
+
+COUNTERS = (post_views, post_likes, comment_likes)
+
+
+def flush_counters():
+    """Сбрасывает все счётчики и добавляет просмотры в рейтинг
+    популярных постов. Возвращает {имя счётчика: сумма приращений}.
+    """
+    totals = {}
+    for counter in COUNTERS:
+        counts = counter.flush()
+        totals[counter.name] = sum(counts.values())
+        if counter is post_views:
+            TrendingPost.objects.add({
+                post_id: views * Constants.TRENDING_VIEW_WEIGHT
+                for post_id, views in counts.items()
+            })
+    return totals
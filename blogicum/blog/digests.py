@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import models, transaction
+from django.template.loader import render_to_string
+
+from constants import Constants
+from outbox.mail import get_outbox_connection
+from .models import Comment, Watermark
+
+COMMENT_DIGEST = 'comment_digest'
+
+
+def collect_comment_digests(after_id, upto_id):
+    """Новые комментарии к постам, сгруппированные по авторам постов.
+
+    Вся агрегация делается одним GROUP BY по диапазону ключей
+    комментариев; комментарии автора к своим постам не учитываются.
+    Возвращает словари автора со списком постов и числом комментариев.
+    """
+    rows = Comment.objects.filter(
+        pk__gt=after_id,
+        pk__lte=upto_id,
+        is_published=True,
+    ).exclude(
+        author_id=models.F('post__author_id')
+    ).exclude(
+        post__author__email=''
+    ).values(
+        'post__author_id',
+        'post__author__username',
+        'post__author__email',
+        'post_id',
+        'post__title',
+    ).annotate(
+        comments=models.Count('pk'),
+        last_comment=models.Max('created_at'),
+    ).order_by('post__author_id', '-comments', 'post_id')
+
+    digests = {}
+    for row in rows.iterator():
+        digest = digests.setdefault(row['post__author_id'], {
+            'username': row['post__author__username'],
+            'email': row['post__author__email'],
+            'total': 0,
+            'posts': [],
+        })
+        digest['total'] += row['comments']
+        digest['posts'].append({
+            'id': row['post_id'],
+            'title': row['post__title'],
+            'comments': row['comments'],
+            'last_comment': row['last_comment'],
+        })
+    return list(digests.values())
+
+
+def build_digest_message(digest):
+    posts = digest['posts']
+    context = dict(
+        digest,
+        posts=posts[:Constants.COMMENT_DIGEST_MAX_POSTS],
+        more_posts=max(len(posts) - Constants.COMMENT_DIGEST_MAX_POSTS, 0),
+        site_url=settings.SITE_URL,
+    )
+    return EmailMessage(
+        f'Новые комментарии к вашим постам: {digest["total"]}',
+        render_to_string('emails/comment_digest.txt', context),
+        settings.DEFAULT_FROM_EMAIL,
+        [digest['email']],
+    )
+
+
+def send_comment_digests():
+    """Ставит в исходящие по одному письму на автора и сдвигает отметку.
+
+    Письма и новая отметка записываются в одной транзакции: при ошибке
+    следующая рассылка повторит тот же диапазон комментариев.
+    Возвращает число писем.
+    """
+    with transaction.atomic():
+        watermark, _ = Watermark.objects.select_for_update(
+        ).get_or_create(name=COMMENT_DIGEST)
+        upto_id = Comment.objects.aggregate(
+            last=models.Max('pk')
+        )['last'] or 0
+        if upto_id <= watermark.last_id:
+            return 0
+        messages = [
+            build_digest_message(digest)
+            for digest in collect_comment_digests(
+                watermark.last_id, upto_id
+            )
+        ]
+        get_outbox_connection().send_messages(messages)
+        watermark.last_id = upto_id
+        watermark.save(update_fields=('last_id', 'updated_at'))
+    return len(messages)
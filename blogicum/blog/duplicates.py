@@ -0,0 +1,387 @@
+"""Поиск почти дубликатов постов: MinHash и LSH.
+
+Текст поста разбивается на шинглы из `SHINGLE_SIZE` слов, сигнатура —
+минимумы `MINHASH_PERMUTATIONS` хеш-функций по шинглам; доля совпавших
+позиций двух сигнатур оценивает коэффициент Жаккара текстов. Сигнатура
+режется на `MINHASH_BANDS` полос, каждая полоса хешируется в корзину
+`PostBucket`: кандидаты в дубликаты нового поста выбираются одним
+запросом по индексу (band, bucket) и проверяются по сигнатурам.
+"""
+import os
+import random
+import re
+import zlib
+from array import array
+from collections import deque
+from multiprocessing import Pool
+
+from django.db import transaction
+from django.db.models import Q
+
+from constants import Constants
+from .models import Post, PostBucket, PostSignature
+
+WORD_RE = re.compile(r'\w+')
+# Простое число Мерсенна 2^61 - 1 для хеш-функций вида (a * x + b) mod p.
+PRIME = (1 << 61) - 1
+_random = random.Random(Constants.MINHASH_PERMUTATIONS)
+PERMUTATIONS = [
+    (_random.randrange(1, PRIME), _random.randrange(PRIME))
+    for _ in range(Constants.MINHASH_PERMUTATIONS)
+]
+ROWS_PER_BAND = Constants.MINHASH_PERMUTATIONS // Constants.MINHASH_BANDS
+
+
+def shingles(text):
+    words = WORD_RE.findall(text.lower())
+    size = min(Constants.SHINGLE_SIZE, len(words))
+    return {
+        zlib.crc32(' '.join(words[start:start + size]).encode())
+        for start in range(len(words) - size + 1)
+    } if words else set()
+
+
+def signature(text):
+    """MinHash-сигнатура текста или None для текста без слов."""
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    return array('Q', [
+        min((a * value + b) % PRIME for value in hashes)
+        for a, b in PERMUTATIONS
+    ])
+
+
+def load_signature(data):
+    result = array('Q')
+    result.frombytes(bytes(data))
+    return result
+
+
+def bands(sig):
+    """Корзины сигнатуры: [(полоса, корзина)]."""
+    return [
+        (band, zlib.crc32(
+            sig[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes()
+        ))
+        for band in range(Constants.MINHASH_BANDS)
+    ]
+
+
+def similarity(first, second):
+    """Оценка коэффициента Жаккара по доле совпавших позиций."""
+    return sum(a == b for a, b in zip(first, second)) / len(first)
+
+
+def find_duplicates(sig, exclude=None):
+    """Почти дубликаты сигнатуры: {post_id: (сходство, группа)}.
+
+    Кандидаты выбираются одним запросом по корзинам LSH.
+    """
+    candidates = PostSignature.objects.filter(
+        post_id__in=PostBucket.objects.filter(Q(*[
+            Q(band=band, bucket=bucket) for band, bucket in bands(sig)
+        ], _connector=Q.OR)).values('post_id')
+    )
+    if exclude is not None:
+        candidates = candidates.exclude(post_id=exclude)
+    duplicates = {}
+    for post_id, data, cluster in candidates.values_list(
+        'post_id', 'signature', 'cluster'
+    ):
+        score = similarity(sig, load_signature(data))
+        if score >= Constants.DUPLICATE_SIMILARITY:
+            duplicates[post_id] = (score, cluster)
+    return duplicates
+
+
+def index_post(post):
+    """Сохраняет сигнатуру поста и отмечает группу, если у поста
+    нашлись почти дубликаты. Вызывается из `PostForm.save_m2m`.
+    """
+    sig = signature(post.text)
+    if sig is None:
+        PostSignature.objects.filter(post=post).delete()
+        PostBucket.objects.filter(post=post).delete()
+        return {}
+    duplicates = find_duplicates(sig, exclude=post.pk)
+    cluster = None
+    if duplicates:
+        cluster = min(
+            [post.pk] + [
+                group if group is not None else post_id
+                for post_id, (_, group) in duplicates.items()
+            ]
+        )
+    with transaction.atomic():
+        PostSignature.objects.update_or_create(
+            post=post,
+            defaults={'signature': sig.tobytes(), 'cluster': cluster},
+        )
+        PostBucket.objects.filter(post=post).delete()
+        PostBucket.objects.bulk_create([
+            PostBucket(post=post, band=band, bucket=bucket)
+            for band, bucket in bands(sig)
+        ])
+        if duplicates:
+            PostSignature.objects.filter(
+                Q(post_id__in=duplicates) | Q(cluster__in={
+                    group for _, group in duplicates.values()
+                    if group is not None
+                })
+            ).update(cluster=cluster)
+    return duplicates
+
+
+def bucket_neighbours(buckets, exclude):
+    """Дописывает в корзины {(полоса, корзина): [id]} уже
+    проиндексированные посты; `BULK_BATCH_SIZE` корзин на запрос.
+    """
+    keys = sorted(buckets)
+    size = Constants.BULK_BATCH_SIZE
+    for start in range(0, len(keys), size):
+        by_band = {}
+        for band, bucket in keys[start:start + size]:
+            by_band.setdefault(band, []).append(bucket)
+        for post_id, band, bucket in PostBucket.objects.filter(Q(*[
+            Q(band=band, bucket__in=band_buckets)
+            for band, band_buckets in by_band.items()
+        ], _connector=Q.OR)).values_list('post_id', 'band', 'bucket'):
+            if post_id not in exclude:
+                buckets[(band, bucket)].append(post_id)
+
+
+def load_clusters(post_ids, signatures, clusters):
+    """Читает сигнатуры постов в `signatures` и переносит их группы
+    в `clusters`. Возвращает {post_id: группа}.
+    """
+    post_ids = list(post_ids)
+    groups = {}
+    size = Constants.BULK_BATCH_SIZE
+    for start in range(0, len(post_ids), size):
+        for post_id, data, cluster in PostSignature.objects.filter(
+            post_id__in=post_ids[start:start + size]
+        ).values_list('post_id', 'signature', 'cluster'):
+            signatures[post_id] = load_signature(data)
+            if cluster is not None:
+                groups[post_id] = cluster
+                clusters.union(post_id, cluster)
+    return groups
+
+
+def index_posts(posts):
+    """Индексирует пачку новых постов одним проходом.
+
+    Кандидаты для всех постов читаются запросами по корзинам, почти
+    дубликаты внутри пачки тоже объединяются в группы, сигнатуры
+    и корзины сохраняются bulk_create.
+    Возвращает {группа: [id постов пачки]}.
+    """
+    signatures = {}
+    for post in posts:
+        sig = signature(post.text)
+        if sig is not None:
+            signatures[post.pk] = sig
+    buckets = {}
+    for post_id, sig in signatures.items():
+        for key in bands(sig):
+            buckets.setdefault(key, []).append(post_id)
+    bucket_neighbours(buckets, exclude=signatures)
+
+    known = dict(signatures)
+    clusters = Clusters()
+    old_groups = load_clusters({
+        post_id for post_ids in buckets.values() for post_id in post_ids
+    } - set(signatures), known, clusters)
+    for post_ids in buckets.values():
+        link_bucket(clusters, post_ids, known)
+
+    members = {}
+    for post_id in list(clusters.parents):
+        members.setdefault(clusters.find(post_id), []).append(post_id)
+    groups = {}
+    with transaction.atomic():
+        for cluster, post_ids in members.items():
+            new = [post_id for post_id in post_ids if post_id in signatures]
+            if not new or len(post_ids) < 2:
+                continue
+            groups[cluster] = new
+            old = [post_id for post_id in post_ids if post_id not in new]
+            if old:
+                PostSignature.objects.filter(
+                    Q(post_id__in=old) | Q(cluster__in={
+                        old_groups.get(post_id, post_id) for post_id in old
+                    })
+                ).update(cluster=cluster)
+        save_signatures(signatures, {
+            post_id: cluster
+            for cluster, post_ids in groups.items() for post_id in post_ids
+        })
+    return groups
+
+
+def save_signatures(signatures, clusters):
+    """Сохраняет сигнатуры {post_id: сигнатура} с группами
+    {post_id: группа} и их корзины.
+    """
+    PostSignature.objects.bulk_create(
+        [
+            PostSignature(
+                post_id=post_id,
+                signature=sig.tobytes(),
+                cluster=clusters.get(post_id),
+            )
+            for post_id, sig in signatures.items()
+        ],
+        batch_size=Constants.BULK_BATCH_SIZE,
+    )
+    PostBucket.objects.bulk_create(
+        [
+            PostBucket(post_id=post_id, band=band, bucket=bucket)
+            for post_id, sig in signatures.items()
+            for band, bucket in bands(sig)
+        ],
+        batch_size=Constants.BULK_BATCH_SIZE,
+    )
+
+
+def chunk_signatures(rows):
+    """Сигнатуры пачки постов; выполняется в рабочем процессе,
+    без обращений к базе данных.
+    """
+    return [
+        (post_id, sig.tobytes())
+        for post_id, sig in (
+            (post_id, signature(text)) for post_id, text in rows
+        )
+        if sig is not None
+    ]
+
+
+def post_chunks():
+    """Пачки (id, текст) всех постов по возрастанию id."""
+    last_id = 0
+    while True:
+        rows = list(
+            Post.objects.filter(pk__gt=last_id).order_by('pk').values_list(
+                'pk', 'text'
+            )[:Constants.DUPLICATE_SCAN_CHUNK]
+        )
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+
+
+class Clusters:
+    """Система непересекающихся множеств; корень группы — меньший id."""
+
+    def __init__(self):
+        self.parents = {}
+
+    def find(self, item):
+        root = self.parents.setdefault(item, item)
+        if root != item:
+            root = self.parents[item] = self.find(root)
+        return root
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            self.parents[max(first, second)] = min(first, second)
+
+
+def link_bucket(clusters, post_ids, signatures):
+    """Объединяет почти дубликаты среди постов одной корзины.
+
+    Пост сравнивается только с одним представителем каждой группы,
+    уже встреченной в корзине, поэтому корзина из одинаковых постов
+    обходится за линейное число сравнений.
+    """
+    seen = {}
+    for post_id in post_ids:
+        if post_id not in signatures or clusters.find(post_id) in seen:
+            continue
+        for root, other in list(seen.items()):
+            if similarity(
+                signatures[post_id], signatures[other]
+            ) >= Constants.DUPLICATE_SIMILARITY:
+                del seen[root]
+                clusters.union(post_id, other)
+        seen[clusters.find(post_id)] = post_id
+
+
+def compute_signatures(workers):
+    """Сигнатуры всех постов: (post_id, сигнатура).
+
+    Посты читаются пачками в основном процессе, сигнатуры пачек
+    считаются в `workers` рабочих процессах; в очереди держится
+    не больше двух пачек на процесс.
+    """
+    if workers == 1:
+        for rows in post_chunks():
+            yield from chunk_signatures(rows)
+        return
+    workers = workers or os.cpu_count()
+    with Pool(workers) as pool:
+        pending = deque()
+        for rows in post_chunks():
+            pending.append(pool.apply_async(chunk_signatures, (rows,)))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+
+
+def group_duplicates(signatures, buckets):
+    """Группы почти дубликатов среди постов с общими корзинами:
+    {меньший id группы: [id постов]}.
+    """
+    clusters = Clusters()
+    for post_ids in buckets.values():
+        link_bucket(clusters, post_ids, signatures)
+    groups = {}
+    for post_id in list(clusters.parents):
+        groups.setdefault(clusters.find(post_id), []).append(post_id)
+    return {
+        cluster: post_ids
+        for cluster, post_ids in groups.items() if len(post_ids) > 1
+    }
+
+
+def scan(workers=None):
+    """Пересчитывает сигнатуры, корзины и группы дубликатов всех постов.
+    Возвращает {группа: [id постов]}.
+    """
+    signatures = {}
+    buckets = {}
+    for post_id, data in compute_signatures(workers):
+        sig = load_signature(data)
+        signatures[post_id] = sig
+        for key in bands(sig):
+            buckets.setdefault(key, []).append(post_id)
+    groups = group_duplicates(signatures, buckets)
+
+    with transaction.atomic():
+        PostSignature.objects.all().delete()
+        PostBucket.objects.all().delete()
+        PostSignature.objects.bulk_create(
+            [
+                PostSignature(post_id=post_id, signature=sig.tobytes())
+                for post_id, sig in signatures.items()
+            ],
+            batch_size=Constants.BULK_BATCH_SIZE,
+        )
+        PostBucket.objects.bulk_create(
+            [
+                PostBucket(post_id=post_id, band=band, bucket=bucket)
+                for (band, bucket), post_ids in buckets.items()
+                for post_id in post_ids
+            ],
+            batch_size=Constants.BULK_BATCH_SIZE,
+        )
+        for cluster, post_ids in groups.items():
+            PostSignature.objects.filter(post_id__in=post_ids).update(
+                cluster=cluster
+            )
+    return groups
@@ -1,12 +1,36 @@
 from django import forms
 from django.contrib.auth import get_user_model
 
+from .duplicates import index_post
 from .models import Post, Comment
+from .tags import parse_tags, set_post_tags
 
 User = get_user_model()
 
 
 class PostForm(forms.ModelForm):
+    tags = forms.CharField(
+        required=False,
+        label='Теги',
+        help_text='Через запятую, например: путешествия, горы',
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk is not None:
+            self.initial.setdefault('tags', ', '.join(
+                self.instance.tags.values_list('name', flat=True)
+            ))
+
+    def clean_tags(self):
+        return parse_tags(self.cleaned_data['tags'])
+
+    def _save_m2m(self):
+        # Выполняется и при save(), и через save_m2m() после
+        # save(commit=False), например при пакетном создании в API.
+        super()._save_m2m()
+        set_post_tags(self.instance, self.cleaned_data['tags'])
+        index_post(self.instance)
 
     class Meta:
         model = Post
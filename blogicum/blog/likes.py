@@ -0,0 +1,35 @@
+from django.db import transaction
+
+from .counters import comment_likes, post_likes
+from .models import CommentLike, PostLike
+
+
+def set_like(model, counter, user, object_id, liked):
+    """Ставит или снимает лайк. Повторный запрос ничего не меняет.
+
+    Строка лайка уникальна по (user, объект); число лайков меняется
+    в буферизованном счётчике после фиксации транзакции, поэтому
+    строка поста или комментария не блокируется.
+    Возвращает True, если состояние изменилось.
+    """
+    field = 'post_id' if model is PostLike else 'comment_id'
+    if liked:
+        _, changed = model.objects.get_or_create(
+            user=user, **{field: object_id}
+        )
+    else:
+        changed = model.objects.filter(
+            user=user, **{field: object_id}
+        ).delete()[0] > 0
+    if changed:
+        delta = 1 if liked else -1
+        transaction.on_commit(lambda: counter.record(object_id, delta))
+    return changed
+
+
+def set_post_like(user, post_id, liked):
+    return set_like(PostLike, post_likes, user, post_id, liked)
+
+
+def set_comment_like(user, comment_id, liked):
+    return set_like(CommentLike, comment_likes, user, comment_id, liked)
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog import related
+
+
+class Command(BaseCommand):
+    help = (
+        'Рассчитывает похожие посты по TF-IDF: целиком (--full) или '
+        'для новых и изменённых постов по журналу изменений.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Пересчитать индекс для всех постов.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, опрашивая журнал.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=60,
+            help='Пауза между опросами пустого журнала, секунд.'
+        )
+
+    def handle(self, *args, full, loop, interval, **options):
+        if full:
+            count = related.rebuild()
+            self.stdout.write(self.style.SUCCESS(
+                f'Постов в индексе: {count}'
+            ))
+            return
+        total = 0
+        while True:
+            processed = related.process_changes()
+            total += processed
+            if not processed:
+                if not loop:
+                    break
+                time.sleep(interval)
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано записей журнала: {total}'
+        ))
@@ -0,0 +1,65 @@
+from argparse import ArgumentTypeError
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import bulk
+from blog.models import Category, Comment, Post
+
+MODELS = {'posts': Post, 'comments': Comment}
+
+
+def parse_ids(value):
+    try:
+        return [int(pk) for pk in value.split(',')]
+    except ValueError:
+        raise ArgumentTypeError(
+            f'Идентификаторы должны быть целыми числами через запятую: {value}'
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        'Массово публикует, снимает с публикации или переносит в другую '
+        'категорию посты и комментарии.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=MODELS)
+        action = parser.add_mutually_exclusive_group(required=True)
+        action.add_argument('--publish', action='store_true')
+        action.add_argument('--unpublish', action='store_true')
+        action.add_argument(
+            '--category', metavar='SLUG',
+            help='Перенести посты в категорию с этим идентификатором.'
+        )
+        parser.add_argument(
+            '--ids', type=parse_ids, default=(),
+            help='Идентификаторы через запятую.'
+        )
+        parser.add_argument(
+            '--author', metavar='USERNAME',
+            help='Только записи этого автора.'
+        )
+
+    def handle(self, *args, model, **options):
+        queryset = MODELS[model].objects.all()
+        if options['ids']:
+            queryset = queryset.filter(pk__in=options['ids'])
+        if options['author']:
+            queryset = queryset.filter(author__username=options['author'])
+        if not (options['ids'] or options['author']):
+            raise CommandError('Укажите --ids или --author.')
+
+        if options['category']:
+            if model != 'posts':
+                raise CommandError('Категорию можно менять только у постов.')
+            try:
+                category = Category.objects.get(slug=options['category'])
+            except Category.DoesNotExist:
+                raise CommandError(
+                    f'Категория {options["category"]} не найдена.'
+                )
+            updated = bulk.set_category(queryset, category)
+        else:
+            updated = bulk.set_published(queryset, options['publish'])
+        self.stdout.write(self.style.SUCCESS(f'Изменено записей: {updated}'))
@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.models import ChangeLog
+from constants import Constants
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет записи журнала изменений старше срока хранения. Клиенты '
+        'с более старым токеном выполняют полную синхронизацию.'
+    )
+
+    def handle(self, *args, **options):
+        border = timezone.now() - timedelta(
+            days=Constants.CHANGELOG_RETENTION_DAYS
+        )
+        old = ChangeLog.objects.filter(created_at__lt=border)
+        deleted = 0
+        while True:
+            batch = list(
+                old.order_by('pk').values_list('pk', flat=True)[
+                    :Constants.BULK_BATCH_SIZE
+                ]
+            )
+            if not batch:
+                break
+            deleted += ChangeLog.objects.filter(pk__in=batch).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f'Удалено записей: {deleted}'))
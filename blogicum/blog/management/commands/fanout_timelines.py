@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.timeline import process_changes
+
+
+class Command(BaseCommand):
+    help = (
+        'Раздаёт новые и изменённые посты в ленты подписчиков по журналу '
+        'изменений.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, опрашивая журнал.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза между опросами пустого журнала, секунд.'
+        )
+
+    def handle(self, *args, loop, interval, **options):
+        total = 0
+        while True:
+            processed = process_changes()
+            total += processed
+            if not processed:
+                if not loop:
+                    break
+                time.sleep(interval)
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано записей журнала: {total}'
+        ))
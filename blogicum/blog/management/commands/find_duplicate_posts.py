@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from blog.duplicates import scan
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает MinHash-сигнатуры всех постов и отмечает группы '
+        'почти одинаковых постов для модераторов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Число рабочих процессов (по умолчанию — число ядер).'
+        )
+
+    def handle(self, *args, workers, **options):
+        groups = scan(workers)
+        posts = sum(len(post_ids) for post_ids in groups.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Найдено групп дубликатов: {len(groups)}, постов в них: {posts}'
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.counters import flush_counters
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит накопленные в кеше просмотры и лайки в БД. '
+        'Запускается по расписанию, например раз в минуту.'
+    )
+
+    def handle(self, *args, **options):
+        for name, total in flush_counters().items():
+            self.stdout.write(self.style.SUCCESS(f'{name}: {total}'))
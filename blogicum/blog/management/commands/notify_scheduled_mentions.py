@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.notifications import notify_scheduled_mentions
+
+
+class Command(BaseCommand):
+    help = (
+        'Уведомляет об упоминаниях в отложенных постах, дата публикации '
+        'которых наступила. Запускается по расписанию.'
+    )
+
+    def handle(self, *args, **options):
+        sent = notify_scheduled_mentions()
+        self.stdout.write(self.style.SUCCESS(f'Уведомлений: {sent}'))
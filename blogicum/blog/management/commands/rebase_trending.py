@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blog.trending import rebase
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит точку отсчёта рейтинга популярных постов и удаляет '
+        'остывшие посты. Запускается по расписанию, например раз в час.'
+    )
+
+    def handle(self, *args, **options):
+        deleted = rebase()
+        self.stdout.write(
+            self.style.SUCCESS(f'Удалено из рейтинга: {deleted}')
+        )
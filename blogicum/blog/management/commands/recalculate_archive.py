@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import PostArchive
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает помесячные счётчики архива по таблице постов.'
+
+    def handle(self, *args, **options):
+        PostArchive.objects.recalculate()
+        self.stdout.write(self.style.SUCCESS(
+            f'Месяцев в архиве: {PostArchive.objects.count()}'
+        ))
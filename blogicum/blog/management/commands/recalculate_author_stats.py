@@ -0,0 +1,21 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from blog.models import AuthorStats
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает статистику авторов целиком, например после '
+        'загрузки данных через loaddata.'
+    )
+
+    def handle(self, *args, **options):
+        author_ids = User.objects.values_list('pk', flat=True)
+        for author_id in author_ids.iterator():
+            AuthorStats.objects.recalculate(author_id)
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано авторов: {author_ids.count()}')
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает число комментариев у всех постов.'
+
+    def handle(self, *args, **options):
+        updated = Post.objects.recalculate_comment_counts()
+        self.stdout.write(self.style.SUCCESS(f'Пересчитано постов: {updated}'))
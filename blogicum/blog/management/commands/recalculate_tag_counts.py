@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Tag
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает число опубликованных постов у всех тегов.'
+
+    def handle(self, *args, **options):
+        updated = Tag.objects.recalculate()
+        self.stdout.write(self.style.SUCCESS(f'Пересчитано тегов: {updated}'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blog.moderation import rescore
+
+
+class Command(BaseCommand):
+    help = (
+        'Оценивает опубликованные непроверенные комментарии фильтром '
+        'спама и отправляет похожие на спам в очередь модерации.'
+    )
+
+    def handle(self, *args, **options):
+        scored, queued = rescore()
+        self.stdout.write(self.style.SUCCESS(
+            f'Оценено комментариев: {scored}, в очереди: {queued}'
+        ))
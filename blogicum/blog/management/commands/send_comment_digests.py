@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.digests import send_comment_digests
+
+
+class Command(BaseCommand):
+    help = (
+        'Ставит в исходящие дайджесты новых комментариев для авторов '
+        'постов. Запускается по расписанию; письма отправляет send_outbox.'
+    )
+
+    def handle(self, *args, **options):
+        sent = send_comment_digests()
+        self.stdout.write(self.style.SUCCESS(f'Дайджестов: {sent}'))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.moderation import train
+
+
+class Command(BaseCommand):
+    help = (
+        'Обучает фильтр спама на комментариях, снятых модераторами '
+        'с публикации, и на опубликованных комментариях.'
+    )
+
+    def handle(self, *args, **options):
+        trained = train()
+        if trained is None:
+            raise CommandError(
+                'Для обучения нужны и снятые с публикации, '
+                'и опубликованные комментарии.'
+            )
+        spam, ham = trained
+        self.stdout.write(self.style.SUCCESS(
+            f'Фильтр обучен: спам — {spam}, обычные — {ham}'
+        ))
@@ -1,6 +1,44 @@
-from django.db import models
+from datetime import datetime
+
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Coalesce, TruncMonth
 from django.utils import timezone
 
+from constants import Constants
+
+
+class PostManager(models.Manager):
+    def change_comment_counts(self, deltas):
+        """Изменяет `comment_count` постов: {post_id: приращение}.
+
+        Посты с одинаковым приращением обновляются одним запросом.
+        """
+        by_delta = {}
+        for post_id, delta in deltas.items():
+            if delta:
+                by_delta.setdefault(delta, []).append(post_id)
+        for delta, post_ids in by_delta.items():
+            self.filter(pk__in=post_ids).update(
+                comment_count=models.F('comment_count') + delta
+            )
+
+    def recalculate_comment_counts(self):
+        """Пересчитывает `comment_count` всех постов одним запросом.
+        Нужен только для восстановления данных.
+        """
+        from .models import Comment
+
+        return self.update(comment_count=Coalesce(
+            models.Subquery(
+                Comment.objects.filter(
+                    post_id=models.OuterRef('pk'), is_published=True
+                ).values('post_id').annotate(
+                    count=models.Count('pk')
+                ).values('count')
+            ),
+            0,
+        ))
+
 
 class PublishedPostManager(models.Manager):
     def get_queryset(self):
@@ -11,6 +49,277 @@ class PublishedPostManager(models.Manager):
         ).order_by('-pub_date')
 
     def add_count(self):
+        # Число комментариев хранится в `Post.comment_count`.
         return self.get_queryset(
-        ).select_related('author', 'location', 'category'
-                         ).annotate(comment_count=models.Count('comments'))
+        ).select_related('author', 'location', 'category')
+
+
+class AuthorStatsManager(models.Manager):
+    def change(self, author_id, **deltas):
+        """Атомарно изменяет счётчики автора на заданные приращения."""
+        self.filter(author_id=author_id).update(**{
+            field: models.F(field) + delta
+            for field, delta in deltas.items()
+        })
+
+    def update_last_post_date(self, author_id, pub_date):
+        self.filter(author_id=author_id).filter(
+            models.Q(last_post_date__isnull=True)
+            | models.Q(last_post_date__lt=pub_date)
+        ).update(last_post_date=pub_date)
+
+    def refresh_last_post_date(self, author_id):
+        from .models import Post
+
+        self.filter(author_id=author_id).update(
+            last_post_date=models.Subquery(
+                Post.objects.filter(
+                    author_id=models.OuterRef('author_id')
+                ).order_by('-pub_date').values('pub_date')[:1]
+            )
+        )
+
+    def recalculate(self, author_id):
+        """Полный пересчёт статистики автора по таблицам постов и
+        комментариев. Нужен только для восстановления данных.
+        """
+        from .models import Comment, Follow, Post
+
+        posts = Post.objects.filter(author_id=author_id).aggregate(
+            published_posts=models.Count(
+                'pk', filter=models.Q(is_published=True)
+            ),
+            drafts=models.Count('pk', filter=models.Q(is_published=False)),
+            last_post_date=models.Max('pub_date'),
+        )
+        comments_received = Comment.objects.filter(
+            post__author_id=author_id, is_published=True
+        ).count()
+        followers = Follow.objects.filter(author_id=author_id).count()
+        self.update_or_create(
+            author_id=author_id,
+            defaults=dict(
+                posts,
+                comments_received=comments_received,
+                followers=followers,
+            ),
+        )
+
+
+class ChangeLogManager(models.Manager):
+    def record(self, content, object_ids, action):
+        """Записывает изменения пачкой: одна строка на объект."""
+        self.bulk_create(
+            [
+                self.model(
+                    content=content, object_id=object_id, action=action
+                )
+                for object_id in object_ids
+            ],
+            batch_size=Constants.BULK_BATCH_SIZE,
+        )
+
+
+class TagManager(models.Manager):
+    def change_counts(self, deltas):
+        """Изменяет `post_count` тегов: {tag_id: приращение}.
+
+        Теги с одинаковым приращением обновляются одним запросом.
+        """
+        by_delta = {}
+        for tag_id, delta in deltas.items():
+            if delta:
+                by_delta.setdefault(delta, []).append(tag_id)
+        for delta, tag_ids in by_delta.items():
+            self.filter(pk__in=tag_ids).update(
+                post_count=models.F('post_count') + delta
+            )
+
+    def cloud(self):
+        """Популярные теги. `post_count` учитывает и отложенные посты,
+        поэтому для тегов облака они вычитаются одним запросом.
+        """
+        from .models import PostTag
+
+        tags = list(self.filter(post_count__gt=0).order_by(
+            '-post_count', 'name'
+        )[:Constants.TAG_CLOUD_SIZE])
+        scheduled = dict(PostTag.objects.filter(
+            tag__in=tags,
+            post__is_published=True,
+            post__category__is_published=True,
+            post__pub_date__gt=timezone.now(),
+        ).values('tag_id').annotate(
+            count=models.Count('pk')
+        ).values_list('tag_id', 'count'))
+        for tag in tags:
+            tag.post_count -= scheduled.get(tag.pk, 0)
+        return sorted(
+            [tag for tag in tags if tag.post_count > 0],
+            key=lambda tag: (-tag.post_count, tag.name),
+        )
+
+    def recalculate(self):
+        """Пересчитывает `post_count` всех тегов одним запросом.
+        Нужен только для восстановления данных.
+        """
+        from .models import PostTag
+
+        return self.update(post_count=Coalesce(
+            models.Subquery(
+                PostTag.objects.filter(
+                    tag_id=models.OuterRef('pk'),
+                    post__is_published=True,
+                    post__category__is_published=True,
+                ).values('tag_id').annotate(
+                    count=models.Count('pk')
+                ).values('count')
+            ),
+            0,
+        ))
+
+
+class TrendingManager(models.Manager):
+    def add(self, weights):
+        """Добавляет к рейтингу постов веса событий: {post_id: вес}.
+
+        Веса приводятся к точке отсчёта; на пачку постов — один UPDATE
+        с CASE и один bulk_create для постов без строки рейтинга.
+        """
+        from .models import Post
+        from .trending import event_factor
+
+        factor = event_factor()
+        post_ids = [post_id for post_id, weight in weights.items() if weight]
+        size = Constants.BULK_BATCH_SIZE
+        for start in range(0, len(post_ids), size):
+            batch = post_ids[start:start + size]
+            existing = set(self.filter(post_id__in=batch).values_list(
+                'post_id', flat=True
+            ))
+            if existing:
+                self.filter(post_id__in=existing).update(
+                    score=models.F('score') + models.Case(
+                        *(
+                            models.When(
+                                post_id=post_id,
+                                then=models.Value(weights[post_id] * factor),
+                            )
+                            for post_id in existing
+                        ),
+                        default=models.Value(0.0),
+                        output_field=models.FloatField(),
+                    )
+                )
+            missing = Post.objects.filter(
+                pk__in=set(batch) - existing
+            ).values_list('pk', flat=True)
+            self.bulk_create(
+                [
+                    self.model(
+                        post_id=post_id, score=weights[post_id] * factor
+                    )
+                    for post_id in missing
+                ],
+                ignore_conflicts=True,
+            )
+
+
+def archive_month(pub_date):
+    pub_date = timezone.localtime(pub_date)
+    return pub_date.year, pub_date.month
+
+
+def month_range(year, month):
+    """Начало месяца и начало следующего месяца в текущей зоне."""
+    return (
+        timezone.make_aware(datetime(year, month, 1)),
+        timezone.make_aware(datetime(year + month // 12, month % 12 + 1, 1)),
+    )
+
+
+def month_counts(posts):
+    """Число постов по месяцам: {(год, месяц): число}, один GROUP BY."""
+    return {
+        (row['month'].year, row['month'].month): row['count']
+        for row in posts.annotate(
+            month=TruncMonth('pub_date')
+        ).values('month').annotate(count=models.Count('pk')).order_by()
+    }
+
+
+class PostArchiveManager(models.Manager):
+    """Счётчики постов по месяцам.
+
+    Учитываются опубликованные посты опубликованных категорий, как
+    в `PublishedPostManager`. Условие на дату публикации меняется
+    само по себе, без записи в БД, поэтому отложенные посты текущего
+    месяца вычитаются при чтении (`histogram`).
+    """
+
+    def change(self, deltas):
+        """Изменяет счётчики месяцев: {(год, месяц): приращение}.
+
+        Строка месяца создаётся первым приращением; если её в это же
+        время создал другой процесс, приращение повторяется через
+        UPDATE ... F().
+        """
+        for (year, month), delta in deltas.items():
+            while delta and not self.filter(year=year, month=month).update(
+                post_count=models.F('post_count') + delta
+            ):
+                if delta < 0:
+                    break
+                try:
+                    with transaction.atomic():
+                        self.create(year=year, month=month, post_count=delta)
+                    break
+                except IntegrityError:
+                    continue
+
+    def change_for_dates(self, pub_dates, sign):
+        deltas = {}
+        for pub_date in pub_dates:
+            month = archive_month(pub_date)
+            deltas[month] = deltas.get(month, 0) + sign
+        self.change(deltas)
+
+    def change_for_posts(self, posts, sign):
+        self.change({
+            month: sign * count for month, count in month_counts(posts).items()
+        })
+
+    def histogram(self):
+        """Месяцы с видимыми постами, не позже текущего."""
+        from .models import Post
+
+        now = timezone.now()
+        year, month = archive_month(now)
+        months = list(self.filter(post_count__gt=0).filter(
+            models.Q(year__lt=year) | models.Q(year=year, month__lte=month)
+        ))
+        if months and (months[0].year, months[0].month) == (year, month):
+            months[0].post_count -= Post.objects.filter(
+                is_published=True,
+                category__is_published=True,
+                pub_date__gt=now,
+                pub_date__lt=month_range(year, month)[1],
+            ).count()
+            if months[0].post_count <= 0:
+                del months[0]
+        return months
+
+    def recalculate(self):
+        """Пересобирает таблицу по постам. Нужен только для
+        восстановления данных.
+        """
+        from .models import Post
+
+        counts = month_counts(Post.objects.filter(
+            is_published=True, category__is_published=True
+        ))
+        self.all().delete()
+        self.bulk_create([
+            self.model(year=year, month=month, post_count=count)
+            for (year, month), count in counts.items()
+        ])
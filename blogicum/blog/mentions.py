@@ -0,0 +1,81 @@
+"""Упоминания @username в текстах постов и комментариев.
+
+Упоминания разбираются при сохранении: все имена из набора текстов
+проверяются одним запросом `username__in`, а найденные сохраняются
+в поле `mentions` как [начало, конец, id, username]. При выводе
+ссылки расставляются по сохранённым смещениям, без разбора и запросов.
+"""
+import re
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils.html import escape, format_html
+from django.utils.safestring import mark_safe
+
+from constants import Constants
+
+User = get_user_model()
+
+MENTION_RE = re.compile(r'(?<![\w@.+-])@([\w.@+-]+)')
+TRAILING_PUNCTUATION = '.-+@'
+
+
+def find_mentions(text):
+    """Кандидаты в упоминания: (начало, конец, имя, имя без
+    завершающей пунктуации).
+    """
+    mentions = []
+    for match in MENTION_RE.finditer(text or ''):
+        name = match.group(1)
+        mentions.append((
+            match.start(),
+            match.end(),
+            name,
+            name.rstrip(TRAILING_PUNCTUATION),
+        ))
+        if len(mentions) >= Constants.MAX_MENTIONS:
+            break
+    return mentions
+
+
+def resolve_mentions(objects):
+    """Заполняет `mentions` у объектов; один запрос на весь набор."""
+    found = [(obj, find_mentions(obj.text)) for obj in objects]
+    names = {
+        name
+        for _, mentions in found
+        for _, _, full, short in mentions
+        for name in (full, short)
+        if name
+    }
+    users = dict(
+        User.objects.filter(username__in=names).values_list('username', 'pk')
+    ) if names else {}
+    for obj, mentions in found:
+        obj.mentions = []
+        for start, end, full, short in mentions:
+            name = full if full in users else short
+            if name in users:
+                obj.mentions.append([
+                    start, start + 1 + len(name), users[name], name
+                ])
+
+
+def mentioned_ids(mentions):
+    return {user_id for _, _, user_id, _ in mentions or ()}
+
+
+def render_mentions(text, mentions):
+    """HTML текста со ссылками на профили упомянутых пользователей."""
+    parts = []
+    position = 0
+    for start, end, _, username in mentions or ():
+        parts.append(escape(text[position:start]))
+        parts.append(format_html(
+            '<a href="{}">{}</a>',
+            reverse('blog:profile', args=(username,)),
+            text[start:end],
+        ))
+        position = end
+    parts.append(escape(text[position:]))
+    return mark_safe(''.join(parts))
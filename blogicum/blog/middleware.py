@@ -0,0 +1,248 @@
+import gzip
+import re
+
+import brotli
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+
+from constants import Constants
+from .cache import SHARED_VARIANT, fill_holes, page_cache_key
+
+# Типы содержимого, которые уже сжаты и повторно не сжимаются.
+INCOMPRESSIBLE_TYPES = (
+    'image/',
+    'video/',
+    'audio/',
+    'application/zip',
+    'application/gzip',
+    'application/x-gzip',
+    'application/pdf',
+    'font/woff',
+)
+
+
+def parse_accept_encoding(accept_encoding):
+    """Кодировки из заголовка Accept-Encoding с q > 0."""
+    accepted = set()
+    for item in accept_encoding.split(','):
+        token, *params = (part.strip() for part in item.split(';'))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if token and quality > 0:
+            accepted.add(token.lower())
+    return accepted
+
+
+def choose_encoding(accept_encoding):
+    """Выбирает кодировку по заголовку Accept-Encoding: brotli или gzip."""
+    accepted = parse_accept_encoding(accept_encoding)
+    if 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress_string(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=Constants.BROTLI_QUALITY)
+    return gzip.compress(
+        content, compresslevel=Constants.GZIP_LEVEL, mtime=0
+    )
+
+
+def compress_brotli_sequence(sequence):
+    compressor = brotli.Compressor(quality=Constants.BROTLI_QUALITY)
+    for chunk in sequence:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def compress_stream(sequence, encoding):
+    """Сжимает потоковый ответ по частям, не накапливая его в памяти."""
+    if encoding == 'br':
+        return compress_brotli_sequence(sequence)
+    return compress_sequence(sequence)
+
+
+class CompressionMiddleware:
+    """Сжатие ответов brotli/gzip.
+
+    Маленькие ответы и уже сжатые медиафайлы отдаются как есть.
+    Middleware подключается внутри кеша страниц, поэтому в кеш попадает
+    уже сжатое тело и повторное сжатие при попадании в кеш не нужно.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        content_type = response.get('Content-Type', '')
+        if content_type.startswith(INCOMPRESSIBLE_TYPES):
+            return response
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content, encoding
+            )
+            del response['Content-Length']
+        else:
+            if len(response.content) < Constants.COMPRESSION_MIN_LENGTH:
+                return response
+            compressed = compress_string(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        if response.has_header('ETag'):
+            response['ETag'] = re.sub(
+                r'"$', f';{encoding}"', response['ETag']
+            )
+        response['Content-Encoding'] = encoding
+        return response
+
+
+class AnonymousPageCacheMiddleware:
+    """Полностраничный кеш лент для анонимных посетителей.
+
+    Ключ кеша — адрес страницы, параметры запроса и выбранная кодировка
+    сжатия. Записи удаляются сигналами моделей (см. `blog.signals`).
+    Middleware подключается перед `CompressionMiddleware`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not (
+            settings.PAGE_CACHE_ENABLED and self.is_cacheable_request(request)
+        ):
+            return self.get_response(request)
+        key = page_cache_key(
+            request.path,
+            request.META.get('QUERY_STRING', ''),
+            choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', '')),
+        )
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = self.get_response(request)
+        if self.is_cacheable_response(request, response):
+            cache.set(key, response, Constants.PAGE_CACHE_TIMEOUT)
+        return response
+
+    def is_cacheable_request(self, request):
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        if settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return False
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return False
+        return match.view_name in Constants.PAGE_CACHE_VIEW_NAMES
+
+    def is_cacheable_response(self, request, response):
+        user = getattr(request, 'user', None)
+        return (
+            request.method == 'GET'
+            and response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and (user is None or not user.is_authenticated)
+        )
+
+
+class HolePunchedPageCacheMiddleware:
+    """Кеш страниц для авторизованных пользователей.
+
+    Общая для всех копия страницы рендерится с метками вместо
+    пользовательских фрагментов (шапка, CSRF-токен, ссылки автора),
+    а фрагменты текущего пользователя подставляются при каждом ответе.
+    Кешируются только представления с `SharedPageCacheMixin`.
+    Middleware подключается после `AuthenticationMiddleware`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        match = self.get_shared_match(request)
+        if match is None:
+            return self.get_response(request)
+        key = page_cache_key(
+            request.path,
+            request.META.get('QUERY_STRING', ''),
+            SHARED_VARIANT,
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            request.resolver_match = match
+            match.func.view_class.shared_page_served(request, **match.kwargs)
+            response = HttpResponse(
+                fill_holes(cached['content'], request),
+                content_type=cached['content_type'],
+            )
+            patch_vary_headers(response, ('Cookie',))
+            return response
+
+        request.punch_holes = True
+        response = self.get_response(request)
+        if response.streaming:
+            return response
+        content = response.content.decode(response.charset)
+        if (
+            request.method == 'GET'
+            and response.status_code == 200
+            and getattr(response, 'is_shared_page', False)
+        ):
+            cache.set(
+                key,
+                {'content': content, 'content_type': response['Content-Type']},
+                Constants.PAGE_CACHE_TIMEOUT,
+            )
+        response.content = fill_holes(content, request)
+        return response
+
+    def get_shared_match(self, request):
+        if not settings.PAGE_CACHE_ENABLED:
+            return None
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        if not request.user.is_authenticated:
+            return None
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        view_class = getattr(match.func, 'view_class', None)
+        if not getattr(view_class, 'shared_page_cache', False):
+            return None
+        if not view_class.is_shared_request(request, **match.kwargs):
+            return None
+        return match
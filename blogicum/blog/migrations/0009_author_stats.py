@@ -0,0 +1,63 @@
+# Generated by Django 3.2.16 on 2026-10-19 09:56
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_author_stats(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    AuthorStats = apps.get_model('blog', 'AuthorStats')
+    Comment = apps.get_model('blog', 'Comment')
+    comments = dict(
+        Comment.objects.filter(is_published=True).values(
+            'post__author'
+        ).annotate(
+            total=models.Count('pk')
+        ).values_list('post__author', 'total')
+    )
+    authors = User.objects.annotate(
+        published_posts=models.Count(
+            'posts', filter=models.Q(posts__is_published=True)
+        ),
+        drafts=models.Count(
+            'posts', filter=models.Q(posts__is_published=False)
+        ),
+        last_post_date=models.Max('posts__pub_date'),
+    ).values_list('pk', 'published_posts', 'drafts', 'last_post_date')
+    AuthorStats.objects.bulk_create(
+        AuthorStats(
+            author_id=pk,
+            published_posts=published_posts,
+            drafts=drafts,
+            comments_received=comments.get(pk, 0),
+            last_post_date=last_post_date,
+        )
+        for pk, published_posts, drafts, last_post_date in authors
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('blog', '0008_auto_20240921_1939'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStats',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='auth.user', verbose_name='Автор')),
+                ('published_posts', models.PositiveIntegerField(default=0, verbose_name='Опубликованных постов')),
+                ('drafts', models.PositiveIntegerField(default=0, verbose_name='Снятых с публикации постов')),
+                ('comments_received', models.PositiveIntegerField(default=0, verbose_name='Получено комментариев')),
+                ('last_post_date', models.DateTimeField(blank=True, null=True, verbose_name='Дата последней публикации')),
+            ],
+            options={
+                'verbose_name': 'статистика автора',
+                'verbose_name_plural': 'Статистика авторов',
+            },
+        ),
+        migrations.RunPython(fill_author_stats, migrations.RunPython.noop),
+    ]
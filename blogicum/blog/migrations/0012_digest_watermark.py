@@ -0,0 +1,25 @@
+# Generated by Django 3.2.16 on 2026-10-19 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_change_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DigestWatermark',
+            fields=[
+                ('name', models.CharField(max_length=64, primary_key=True, serialize=False, verbose_name='Рассылка')),
+                ('last_comment_id', models.PositiveBigIntegerField(default=0, verbose_name='ID последнего учтённого комментария')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'отметка рассылки',
+                'verbose_name_plural': 'Отметки рассылок',
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 3.2.16 on 2026-10-19 10:14
+
+from django.db import migrations, models
+from django.db.models.functions import TruncMonth
+
+
+def fill_post_archive(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    PostArchive = apps.get_model('blog', 'PostArchive')
+    # Те же посты, что считает PostArchiveManager.recalculate.
+    rows = Post.objects.filter(
+        is_published=True, category__is_published=True
+    ).annotate(
+        month=TruncMonth('pub_date')
+    ).values('month').annotate(count=models.Count('pk')).order_by()
+    PostArchive.objects.bulk_create([
+        PostArchive(
+            year=row['month'].year,
+            month=row['month'].month,
+            post_count=row['count'],
+        )
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0015_trending'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Год')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Месяц')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Опубликованных постов')),
+            ],
+            options={
+                'verbose_name': 'месяц архива',
+                'verbose_name_plural': 'Архив',
+                'ordering': ('-year', '-month'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='postarchive',
+            constraint=models.UniqueConstraint(fields=('year', 'month'), name='unique_archive_month'),
+        ),
+        migrations.RunPython(fill_post_archive, migrations.RunPython.noop),
+    ]
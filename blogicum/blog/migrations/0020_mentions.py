@@ -0,0 +1,28 @@
+# Generated by Django 3.2.16 on 2026-10-19 10:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0019_notifications'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='mentions',
+            field=models.JSONField(default=list, editable=False, verbose_name='Упоминания'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='mentions',
+            field=models.JSONField(default=list, editable=False, verbose_name='Упоминания'),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='kind',
+            field=models.CharField(choices=[('comment', 'Комментарий к вашему посту'), ('reply', 'Новый комментарий в обсуждении'), ('mention', 'Упоминание')], max_length=16, verbose_name='Тип'),
+        ),
+    ]
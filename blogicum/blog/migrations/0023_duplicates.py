@@ -0,0 +1,43 @@
+# Generated by Django 3.2.16 on 2026-10-19 10:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0022_related_posts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSignature',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('signature', models.BinaryField(verbose_name='Сигнатура')),
+                ('cluster', models.PositiveBigIntegerField(blank=True, db_index=True, null=True, verbose_name='Группа дубликатов')),
+            ],
+            options={
+                'verbose_name': 'почти дубликат',
+                'verbose_name_plural': 'Почти дубликаты',
+            },
+        ),
+        migrations.CreateModel(
+            name='PostBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField(verbose_name='Полоса')),
+                ('bucket', models.BigIntegerField(verbose_name='Корзина')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.post', verbose_name='Публикация')),
+            ],
+            options={
+                'verbose_name': 'корзина LSH',
+                'verbose_name_plural': 'Корзины LSH',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='postbucket',
+            index=models.Index(fields=['band', 'bucket'], name='post_bucket_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 3.2.16 on 2026-10-19 10:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0023_duplicates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentModeration',
+            fields=[
+                ('comment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='moderation', serialize=False, to='blog.comment', verbose_name='Комментарий')),
+                ('score', models.FloatField(verbose_name='Вероятность спама')),
+                ('status', models.CharField(choices=[('queued', 'Ожидает проверки'), ('spam', 'Спам'), ('ham', 'Не спам')], default='queued', max_length=16, verbose_name='Статус')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+            ],
+            options={
+                'verbose_name': 'комментарий на модерации',
+                'verbose_name_plural': 'Очередь модерации',
+            },
+        ),
+        migrations.CreateModel(
+            name='SpamFilter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weights', models.BinaryField(verbose_name='Веса признаков')),
+                ('bias', models.FloatField(default=0, verbose_name='Смещение')),
+                ('spam_documents', models.PositiveIntegerField(default=0, verbose_name='Комментариев-спама')),
+                ('ham_documents', models.PositiveIntegerField(default=0, verbose_name='Обычных комментариев')),
+                ('trained_at', models.DateTimeField(auto_now=True, verbose_name='Обучен')),
+            ],
+            options={
+                'verbose_name': 'фильтр спама',
+                'verbose_name_plural': 'Фильтр спама',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='commentmoderation',
+            index=models.Index(fields=['status', '-score'], name='moderation_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 3.2.16 on 2026-10-19 11:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+import numpy as np
+
+INDEX_TERMS = 20
+
+
+def fill_post_terms(apps, schema_editor):
+    # Обратный индекс по уже посчитанным векторам и частотам.
+    PostTerm = apps.get_model('blog', 'PostTerm')
+    PostVector = apps.get_model('blog', 'PostVector')
+    RelatedPostsIndex = apps.get_model('blog', 'RelatedPostsIndex')
+    index = RelatedPostsIndex.objects.filter(pk=1).first()
+    if index is None or not index.frequencies:
+        return
+    frequencies = np.frombuffer(bytes(index.frequencies), dtype=np.int32)
+    idf = np.log(
+        (1 + index.documents) / (1 + frequencies.astype(np.float32))
+    ) + 1
+    rows = []
+    for vector in PostVector.objects.iterator():
+        terms = np.frombuffer(bytes(vector.terms), dtype=np.int32)
+        weights = np.frombuffer(bytes(vector.weights), dtype=np.float32)
+        if len(terms) > INDEX_TERMS:
+            terms = terms[np.argpartition(
+                -weights * idf[terms], INDEX_TERMS - 1
+            )[:INDEX_TERMS]]
+        rows += [
+            PostTerm(post_id=vector.post_id, term=term)
+            for term in terms.tolist()
+        ]
+    PostTerm.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0024_comment_moderation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.IntegerField(verbose_name='Корзина слова')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.post', verbose_name='Публикация')),
+            ],
+            options={
+                'verbose_name': 'слово публикации',
+                'verbose_name_plural': 'Слова публикаций',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='postterm',
+            index=models.Index(fields=['term', 'post'], name='post_term_idx'),
+        ),
+        migrations.RunPython(fill_post_terms, migrations.RunPython.noop),
+    ]
@@ -44,3 +44,30 @@ class CommentSuccessUrlMixin(LoginRequiredMixin):
             'blog:post_detail',
             kwargs={'post_id': self.object.post.pk}
         )
+
+
+class SharedPageCacheMixin:
+    """Страница, общая копия которой кешируется для всех пользователей.
+
+    См. `blog.middleware.HolePunchedPageCacheMiddleware`.
+    """
+
+    shared_page_cache = True
+
+    @classmethod
+    def is_shared_request(cls, request, **kwargs):
+        return True
+
+    @classmethod
+    def shared_page_served(cls, request, **kwargs):
+        """Вызывается, когда страница отдана из кеша без вызова
+        представления.
+        """
+
+    def is_shared_page(self):
+        return True
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        response.is_shared_page = self.is_shared_page()
+        return response
@@ -3,7 +3,15 @@ from django.contrib.auth import get_user_model
 from django.urls import reverse
 
 from constants import Constants
-from .managers import PublishedPostManager
+from .managers import (
+    AuthorStatsManager,
+    ChangeLogManager,
+    PostArchiveManager,
+    PostManager,
+    PublishedPostManager,
+    TagManager,
+    TrendingManager,
+)
 
 User = get_user_model()
 
@@ -64,9 +72,11 @@ class Post(PublishedModel):
     title = models.CharField(
         max_length=Constants.MAX_LENGTH_TEXT,
         verbose_name='Заголовок',
+        db_index=True,
     )
     text = models.TextField(verbose_name='Текст')
     pub_date = models.DateTimeField(
+        db_index=True,
         verbose_name='Дата и время публикации',
         help_text=('Если установить дату и время'
                    ' в будущем — можно делать отложенные публикации.')
@@ -95,7 +105,33 @@ class Post(PublishedModel):
         upload_to='media',
         blank=True
     )
-    objects = models.Manager()
+    views = models.PositiveBigIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Просмотров'
+    )
+    likes = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Лайков'
+    )
+    comment_count = models.IntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Комментариев'
+    )
+    mentions = models.JSONField(
+        default=list,
+        editable=False,
+        verbose_name='Упоминания'
+    )
+    tags = models.ManyToManyField(
+        'Tag',
+        through='PostTag',
+        blank=True,
+        verbose_name='Теги'
+    )
+    objects = PostManager()
     published_posts = PublishedPostManager()
 
     class Meta():
@@ -123,11 +159,814 @@ class Comment(PublishedModel):
         verbose_name='Комментируемый пост',
     )
     text = models.TextField(verbose_name='Текст комментария')
+    likes = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Лайков'
+    )
+    mentions = models.JSONField(
+        default=list,
+        editable=False,
+        verbose_name='Упоминания'
+    )
 
     class Meta:
         default_related_name = 'comments'
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(fields=('created_at',), name='comment_created_idx'),
+        )
 
     def __str__(self):
         return self.text[:30]
+
+
+class AuthorStats(models.Model):
+    """Статистика автора, которая обновляется при записи постов
+    и комментариев (см. `blog.signals`).
+    """
+
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Автор',
+    )
+    published_posts = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Опубликованных постов'
+    )
+    drafts = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Снятых с публикации постов'
+    )
+    comments_received = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Получено комментариев'
+    )
+    followers = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Подписчиков'
+    )
+    last_post_date = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Дата последней публикации'
+    )
+    objects = AuthorStatsManager()
+
+    class Meta:
+        verbose_name = 'статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self):
+        return f'Статистика {self.author_id}'
+
+
+class ChangeLog(models.Model):
+    """Журнал изменений постов и комментариев для синхронизации клиентов.
+
+    Первичный ключ растёт монотонно и служит токеном синхронизации:
+    клиент запрашивает записи с ключом больше последнего полученного.
+    """
+
+    POST = 'post'
+    COMMENT = 'comment'
+    CONTENT_CHOICES = (
+        (POST, 'Публикация'),
+        (COMMENT, 'Комментарий'),
+    )
+    CREATED = 'created'
+    UPDATED = 'updated'
+    DELETED = 'deleted'
+    ACTION_CHOICES = (
+        (CREATED, 'Создание'),
+        (UPDATED, 'Изменение'),
+        (DELETED, 'Удаление'),
+    )
+
+    content = models.CharField(
+        max_length=16,
+        choices=CONTENT_CHOICES,
+        verbose_name='Тип объекта'
+    )
+    object_id = models.PositiveBigIntegerField(verbose_name='ID объекта')
+    action = models.CharField(
+        max_length=16,
+        choices=ACTION_CHOICES,
+        verbose_name='Действие'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name='Добавлено'
+    )
+    objects = ChangeLogManager()
+
+    class Meta:
+        verbose_name = 'запись журнала изменений'
+        verbose_name_plural = 'Журнал изменений'
+        ordering = ('pk',)
+
+    def __str__(self):
+        return f'{self.content} {self.object_id} {self.action}'
+
+
+class Watermark(models.Model):
+    """Последний обработанный ключ для периодических обработчиков.
+
+    Обработчик выбирает только строки с большим ключом: комментарии для
+    дайджестов, записи журнала изменений для лент подписчиков.
+    """
+
+    name = models.CharField(
+        max_length=64,
+        primary_key=True,
+        verbose_name='Обработчик'
+    )
+    last_id = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Последний обработанный ID'
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Обновлено'
+    )
+
+    class Meta:
+        verbose_name = 'отметка обработки'
+        verbose_name_plural = 'Отметки обработки'
+
+    def __str__(self):
+        return f'{self.name}: {self.last_id}'
+
+
+class Tag(models.Model):
+    """Тег поста.
+
+    `post_count` — число опубликованных постов опубликованных категорий
+    с тегом; обновляется при изменении тегов и публикации постов
+    и категорий (см. `blog.signals`), поэтому облако тегов
+    не сканирует таблицу связей. Отложенные посты вычитаются
+    при чтении.
+    """
+
+    name = models.CharField(
+        max_length=Constants.TAG_MAX_LENGTH,
+        verbose_name='Название'
+    )
+    slug = models.SlugField(
+        max_length=Constants.TAG_MAX_LENGTH,
+        unique=True,
+        allow_unicode=True,
+        verbose_name='Идентификатор'
+    )
+    post_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Опубликованных постов'
+    )
+    objects = TagManager()
+
+    class Meta:
+        verbose_name = 'тег'
+        verbose_name_plural = 'Теги'
+        ordering = ('name',)
+        indexes = (
+            models.Index(fields=('-post_count',), name='tag_post_count_idx'),
+        )
+
+    def __str__(self):
+        return self.name
+
+    def get_absolute_url(self):
+        return reverse('blog:tag_posts', args=(self.slug,))
+
+
+class PostTag(models.Model):
+    """Связь поста и тега.
+
+    Составной уникальный индекс (tag, post) обслуживает ленту тега,
+    отдельный индекс по посту — выборку тегов поста.
+    """
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='post_tags',
+    )
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='post_tags',
+    )
+
+    class Meta:
+        verbose_name = 'тег поста'
+        verbose_name_plural = 'Теги постов'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('tag', 'post'), name='unique_tag_post'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.post_id} #{self.tag_id}'
+
+
+class TrendingState(models.Model):
+    """Точка отсчёта весов в `TrendingPost` (одна строка)."""
+
+    epoch = models.DateTimeField(verbose_name='Точка отсчёта')
+
+    class Meta:
+        verbose_name = 'состояние рейтинга'
+        verbose_name_plural = 'Состояние рейтинга'
+
+    def __str__(self):
+        return self.epoch.isoformat()
+
+
+class TrendingPost(models.Model):
+    """Затухающий рейтинг поста по комментариям и просмотрам.
+
+    Событие в момент t добавляет вес w * 2^((t - epoch) / период
+    полураспада): более поздние события весят больше, поэтому хранимые
+    значения не нужно уменьшать со временем, а порядок по `score`
+    совпадает с порядком по затухающему рейтингу. Команда
+    `rebase_trending` переносит точку отсчёта и удаляет остывшие посты.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending',
+        verbose_name='Публикация',
+    )
+    score = models.FloatField(default=0, verbose_name='Рейтинг')
+    objects = TrendingManager()
+
+    class Meta:
+        verbose_name = 'рейтинг публикации'
+        verbose_name_plural = 'Рейтинг публикаций'
+        indexes = (
+            models.Index(fields=('-score',), name='trending_score_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.post_id}: {self.score:.2f}'
+
+
+class PostArchive(models.Model):
+    """Число опубликованных постов за месяц для архива.
+
+    Обновляется при публикации, снятии с публикации и переносе даты
+    поста (см. `blog.signals`), поэтому гистограмма архива не требует
+    GROUP BY по таблице постов.
+    """
+
+    year = models.PositiveSmallIntegerField(verbose_name='Год')
+    month = models.PositiveSmallIntegerField(verbose_name='Месяц')
+    post_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Опубликованных постов'
+    )
+    objects = PostArchiveManager()
+
+    class Meta:
+        verbose_name = 'месяц архива'
+        verbose_name_plural = 'Архив'
+        ordering = ('-year', '-month')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('year', 'month'), name='unique_archive_month'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.month:02}.{self.year}: {self.post_count}'
+
+    def get_absolute_url(self):
+        return reverse('blog:archive', args=(self.year, self.month))
+
+
+class Follow(models.Model):
+    """Подписка пользователя на автора."""
+
+    follower = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following',
+        verbose_name='Подписчик',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='followers',
+        verbose_name='Автор',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+
+    class Meta:
+        verbose_name = 'подписка'
+        verbose_name_plural = 'Подписки'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('follower', 'author'), name='unique_follow'
+            ),
+            models.CheckConstraint(
+                check=~models.Q(follower=models.F('author')),
+                name='follow_not_self',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.follower_id} -> {self.author_id}'
+
+
+class TimelineEntry(models.Model):
+    """Строка персональной ленты подписчика.
+
+    Заполняется командой `fanout_timelines` при публикации поста
+    (раздача при записи), поэтому лента читается диапазоном по индексу
+    (user, pub_date, post) независимо от числа подписок.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='+',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='+',
+    )
+    pub_date = models.DateTimeField()
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Записи лент'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'post'), name='unique_timeline_post'
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('user', '-pub_date', '-post'),
+                name='timeline_user_date_idx',
+            ),
+            models.Index(
+                fields=('user', 'author'), name='timeline_user_author_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.user_id}: {self.post_id}'
+
+
+class PostLike(models.Model):
+    """Лайк поста. Число лайков хранится в `Post.likes` и обновляется
+    буферизованным счётчиком (см. `blog.counters`).
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='+',
+        verbose_name='Пользователь',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Публикация',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+
+    class Meta:
+        verbose_name = 'лайк публикации'
+        verbose_name_plural = 'Лайки публикаций'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'post'), name='unique_post_like'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.user_id} -> {self.post_id}'
+
+
+class CommentLike(models.Model):
+    """Лайк комментария; число лайков хранится в `Comment.likes`."""
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='+',
+        verbose_name='Пользователь',
+    )
+    comment = models.ForeignKey(
+        Comment,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Комментарий',
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+
+    class Meta:
+        verbose_name = 'лайк комментария'
+        verbose_name_plural = 'Лайки комментариев'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'comment'), name='unique_comment_like'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.user_id} -> {self.comment_id}'
+
+
+class Notification(models.Model):
+    """Уведомление пользователя о событии на сайте.
+
+    Список (сначала непрочитанные) и счётчик непрочитанных выбираются
+    по индексу (recipient, unread, created_at).
+    """
+
+    COMMENT = 'comment'
+    REPLY = 'reply'
+    MENTION = 'mention'
+    KIND_CHOICES = (
+        (COMMENT, 'Комментарий к вашему посту'),
+        (REPLY, 'Новый комментарий в обсуждении'),
+        (MENTION, 'Упоминание'),
+    )
+
+    recipient = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='notifications',
+        verbose_name='Получатель',
+    )
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Автор события',
+    )
+    kind = models.CharField(
+        max_length=16,
+        choices=KIND_CHOICES,
+        verbose_name='Тип'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Публикация',
+    )
+    comment = models.ForeignKey(
+        Comment,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Комментарий',
+    )
+    unread = models.BooleanField(default=True, verbose_name='Не прочитано')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+
+    class Meta:
+        verbose_name = 'уведомление'
+        verbose_name_plural = 'Уведомления'
+        ordering = ('-created_at',)
+        indexes = (
+            models.Index(
+                fields=('recipient', '-unread', '-created_at'),
+                name='notification_inbox_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.recipient_id}: {self.kind}'
+
+
+class ReadMarker(models.Model):
+    """Отметка прочтения поста пользователем: последний увиденный
+    комментарий и число комментариев на момент визита.
+
+    Одна строка на пару (пользователь, пост); перезаписывается только
+    при появлении новых комментариев (см. `blog.read_markers`).
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='+',
+        verbose_name='Пользователь',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Публикация',
+    )
+    last_comment_id = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name='Последний прочитанный комментарий'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Прочитано комментариев'
+    )
+
+    class Meta:
+        verbose_name = 'отметка прочтения'
+        verbose_name_plural = 'Отметки прочтения'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'post'), name='unique_read_marker'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.user_id}: {self.post_id} ({self.last_comment_id})'
+
+
+class PostVector(models.Model):
+    """Хешированные частоты слов поста для расчёта похожих постов.
+
+    Хранятся сырые частоты (номера корзин int32 и веса float32), без
+    IDF: веса IDF применяются при расчёте, поэтому добавление поста
+    не требует пересчёта векторов остальных (см. `blog.related`).
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+',
+        verbose_name='Публикация',
+    )
+    terms = models.BinaryField(verbose_name='Корзины слов')
+    weights = models.BinaryField(verbose_name='Веса слов')
+
+    class Meta:
+        verbose_name = 'вектор публикации'
+        verbose_name_plural = 'Векторы публикаций'
+
+    def __str__(self):
+        return str(self.post_id)
+
+
+class PostTerm(models.Model):
+    """Слово поста с наибольшим весом TF-IDF.
+
+    Обратный индекс для расчёта похожих постов: кандидаты в соседи
+    изменённого поста выбираются по индексу (term, post), а не
+    сравнением со всеми векторами (см. `blog.related`).
+    """
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Публикация',
+    )
+    term = models.IntegerField(verbose_name='Корзина слова')
+
+    class Meta:
+        verbose_name = 'слово публикации'
+        verbose_name_plural = 'Слова публикаций'
+        indexes = (
+            models.Index(fields=('term', 'post'), name='post_term_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.post_id}: {self.term}'
+
+
+class RelatedPostsIndex(models.Model):
+    """Состояние индекса похожих постов: число документов и
+    документные частоты корзин (int32), из которых считается IDF.
+    """
+
+    documents = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Документов'
+    )
+    frequencies = models.BinaryField(
+        default=bytes,
+        verbose_name='Документные частоты'
+    )
+
+    class Meta:
+        verbose_name = 'индекс похожих постов'
+        verbose_name_plural = 'Индекс похожих постов'
+
+    def __str__(self):
+        return f'{self.documents}'
+
+
+class RelatedPost(models.Model):
+    """Похожий пост со сходством по TF-IDF.
+
+    Список соседей поста выбирается одним запросом по индексу
+    (post, -score).
+    """
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        db_index=False,
+        related_name='+',
+        verbose_name='Публикация',
+    )
+    related = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Похожая публикация',
+    )
+    score = models.FloatField(verbose_name='Сходство')
+
+    class Meta:
+        verbose_name = 'похожая публикация'
+        verbose_name_plural = 'Похожие публикации'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('post', 'related'), name='unique_related_post'
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('post', '-score'), name='related_post_score_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.post_id} -> {self.related_id}: {self.score:.2f}'
+
+
+class PostSignature(models.Model):
+    """MinHash-сигнатура текста поста для поиска почти дубликатов.
+
+    `cluster` — id самого раннего поста в группе почти одинаковых
+    постов; заполняется при сохранении формы и командой
+    `find_duplicate_posts` (см. `blog.duplicates`).
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+',
+        verbose_name='Публикация',
+    )
+    signature = models.BinaryField(verbose_name='Сигнатура')
+    cluster = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name='Группа дубликатов'
+    )
+
+    class Meta:
+        verbose_name = 'почти дубликат'
+        verbose_name_plural = 'Почти дубликаты'
+
+    def __str__(self):
+        return f'{self.post_id}: {self.cluster}'
+
+
+class PostBucket(models.Model):
+    """Корзина LSH: пост попадает в одну корзину на каждую полосу
+    сигнатуры, кандидаты в дубликаты ищутся по индексу (band, bucket).
+    """
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Публикация',
+    )
+    band = models.PositiveSmallIntegerField(verbose_name='Полоса')
+    bucket = models.BigIntegerField(verbose_name='Корзина')
+
+    class Meta:
+        verbose_name = 'корзина LSH'
+        verbose_name_plural = 'Корзины LSH'
+        indexes = (
+            models.Index(fields=('band', 'bucket'), name='post_bucket_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.post_id}: {self.band}/{self.bucket}'
+
+
+class SpamFilter(models.Model):
+    """Обученный наивный байесовский классификатор комментариев.
+
+    Одна строка: логарифмы отношения правдоподобий хешированных
+    признаков (float32) и априорный логарифм отношения классов
+    (см. `blog.moderation`).
+    """
+
+    weights = models.BinaryField(verbose_name='Веса признаков')
+    bias = models.FloatField(default=0, verbose_name='Смещение')
+    spam_documents = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Комментариев-спама'
+    )
+    ham_documents = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Обычных комментариев'
+    )
+    trained_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Обучен'
+    )
+
+    class Meta:
+        verbose_name = 'фильтр спама'
+        verbose_name_plural = 'Фильтр спама'
+
+    def __str__(self):
+        return f'{self.trained_at:%Y-%m-%d %H:%M}'
+
+
+class CommentModeration(models.Model):
+    """Комментарий в очереди модерации.
+
+    Комментарии, похожие на спам, снимаются с публикации и попадают
+    в очередь; модератор подтверждает спам или возвращает комментарий.
+    Очередь выбирается по индексу (status, -score).
+    """
+
+    QUEUED = 'queued'
+    SPAM = 'spam'
+    HAM = 'ham'
+    STATUS_CHOICES = (
+        (QUEUED, 'Ожидает проверки'),
+        (SPAM, 'Спам'),
+        (HAM, 'Не спам'),
+    )
+
+    comment = models.OneToOneField(
+        Comment,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='moderation',
+        verbose_name='Комментарий',
+    )
+    score = models.FloatField(verbose_name='Вероятность спама')
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=QUEUED,
+        verbose_name='Статус'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+
+    class Meta:
+        verbose_name = 'комментарий на модерации'
+        verbose_name_plural = 'Очередь модерации'
+        indexes = (
+            models.Index(
+                fields=('status', '-score'), name='moderation_queue_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.comment_id}: {self.score:.2f}'
@@ -0,0 +1,241 @@
+"""Оценка комментариев наивным байесовским классификатором.
+
+Признаки — слова и пары соседних слов, хешированные в
+`Constants.SPAM_FEATURES` корзин. Классификатор обучается на
+комментариях, которые модераторы сняли с публикации (спам), и на
+опубликованных; веса хранятся в `SpamFilter` и загружаются в память
+процесса заново, когда меняется `SpamFilter.trained_at`: время
+обучения читается из БД не чаще раза в `SPAM_FILTER_CHECK_TIMEOUT`
+секунд. Оценка комментария — сумма весов его
+признаков. Пересчёт оценок накопившихся комментариев выполняется
+пачками, пачка считается векторно (numpy).
+"""
+import math
+import re
+import zlib
+from array import array
+from itertools import chain
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+
+from constants import Constants
+from . import bulk
+from .models import Comment, CommentModeration, SpamFilter
+
+WORD_RE = re.compile(r'\w+')
+FILTER_TRAINED_AT_KEY = 'spam:trained_at'
+
+# Веса классификатора, загруженные в этот процесс.
+_loaded = {}
+
+
+def features(text):
+    words = WORD_RE.findall(text.lower())
+    tokens = chain(words, map(' '.join, zip(words, words[1:])))
+    return {
+        zlib.crc32(token.encode()) % Constants.SPAM_FEATURES
+        for token in tokens
+    }
+
+
+def get_filter():
+    """Веса классификатора или None, если он ещё не обучен."""
+    trained_at = cache.get(FILTER_TRAINED_AT_KEY)
+    if trained_at is None:
+        trained_at = SpamFilter.objects.filter(pk=1).values_list(
+            'trained_at', flat=True
+        ).first()
+        if trained_at is None:
+            _loaded.clear()
+            return None
+        cache.set(
+            FILTER_TRAINED_AT_KEY,
+            trained_at,
+            Constants.SPAM_FILTER_CHECK_TIMEOUT,
+        )
+    if _loaded.get('trained_at') == trained_at:
+        return _loaded
+    spam_filter = SpamFilter.objects.filter(pk=1).first()
+    if spam_filter is None:
+        _loaded.clear()
+        return None
+    weights = array('f')
+    weights.frombytes(bytes(spam_filter.weights))
+    _loaded.update(
+        trained_at=spam_filter.trained_at,
+        weights=weights,
+        bias=spam_filter.bias,
+    )
+    cache.set(
+        FILTER_TRAINED_AT_KEY,
+        spam_filter.trained_at,
+        Constants.SPAM_FILTER_CHECK_TIMEOUT,
+    )
+    return _loaded
+
+
+def screen_many(comments):
+    """Снимает с публикации ещё не сохранённые комментарии, похожие
+    на спам. Возвращает оценки по порядку комментариев: None для
+    обычного комментария.
+    """
+    spam_filter = get_filter()
+    if spam_filter is None:
+        return [None] * len(comments)
+    scores = score_batch([comment.text for comment in comments], spam_filter)
+    result = []
+    for comment, score in zip(comments, scores):
+        if score < Constants.SPAM_THRESHOLD:
+            result.append(None)
+            continue
+        comment.is_published = False
+        result.append(score)
+    return result
+
+
+def screen(comment):
+    return screen_many([comment])[0]
+
+
+def hold(comments, scores):
+    """Ставит в очередь модерации сохранённые комментарии, которые
+    снял с публикации `screen_many`. Прежнее решение модератора
+    по отредактированному комментарию сбрасывается.
+    """
+    held = [
+        CommentModeration(comment=comment, score=score)
+        for comment, score in zip(comments, scores)
+        if score is not None
+    ]
+    if not held:
+        return
+    with transaction.atomic():
+        CommentModeration.objects.filter(
+            comment__in=[moderation.comment for moderation in held]
+        ).delete()
+        CommentModeration.objects.bulk_create(held)
+
+
+def training_sets():
+    """(спам, обычные): снятые модераторами с публикации комментарии
+    и опубликованные. Непроверенная очередь в обучение не входит.
+    """
+    spam = Comment.objects.filter(is_published=False).exclude(
+        moderation__status=CommentModeration.QUEUED
+    )
+    ham = Comment.objects.filter(is_published=True)
+    return spam, ham
+
+
+def count_features(queryset):
+    counts = array('L', [0]) * Constants.SPAM_FEATURES
+    documents = 0
+    for text in queryset.values_list('text', flat=True).iterator():
+        documents += 1
+        for index in features(text):
+            counts[index] += 1
+    return counts, documents
+
+
+def train():
+    """Обучает классификатор заново. Возвращает (спам, обычные) или
+    None, если одного из классов нет в данных.
+    """
+    spam, ham = training_sets()
+    spam_counts, spam_documents = count_features(spam)
+    ham_counts, ham_documents = count_features(ham)
+    if not (spam_documents and ham_documents):
+        return None
+    weights = array('f', (
+        math.log((spam_count + 1) / (spam_documents + 2))
+        - math.log((ham_count + 1) / (ham_documents + 2))
+        for spam_count, ham_count in zip(spam_counts, ham_counts)
+    ))
+    SpamFilter.objects.update_or_create(pk=1, defaults={
+        'weights': weights.tobytes(),
+        'bias': math.log((spam_documents + 1) / (ham_documents + 1)),
+        'spam_documents': spam_documents,
+        'ham_documents': ham_documents,
+    })
+    cache.delete(FILTER_TRAINED_AT_KEY)
+    return spam_documents, ham_documents
+
+
+def score_batch(texts, spam_filter):
+    """Вероятности спама для пачки текстов."""
+    batch = [features(text) for text in texts]
+    weights = np.frombuffer(spam_filter['weights'], dtype=np.float32)
+    indexes = np.fromiter(
+        chain.from_iterable(batch), dtype=np.int64,
+        count=sum(map(len, batch)),
+    )
+    rows = np.repeat(np.arange(len(batch)), [len(item) for item in batch])
+    log_ratios = spam_filter['bias'] + np.bincount(
+        rows, weights=weights[indexes], minlength=len(batch)
+    )
+    return (1 / (1 + np.exp(-np.clip(log_ratios, -50, 50)))).tolist()
+
+
+def enqueue(scores):
+    """Снимает с публикации комментарии {id: оценка} и ставит их
+    в очередь модерации.
+    """
+    with transaction.atomic():
+        CommentModeration.objects.bulk_create(
+            [
+                CommentModeration(comment_id=comment_id, score=score)
+                for comment_id, score in scores.items()
+            ],
+            ignore_conflicts=True,
+        )
+        bulk.set_published(Comment.objects.filter(pk__in=scores), False)
+
+
+def rescore():
+    """Оценивает опубликованные непроверенные комментарии и ставит
+    похожие на спам в очередь. Возвращает (оценено, в очереди).
+    """
+    spam_filter = get_filter()
+    if spam_filter is None:
+        return 0, 0
+    backlog = Comment.objects.filter(
+        is_published=True, moderation__isnull=True
+    ).order_by('pk')
+    scored = queued = 0
+    last_id = 0
+    while True:
+        rows = list(backlog.filter(pk__gt=last_id).values_list(
+            'pk', 'text'
+        )[:Constants.SPAM_RESCORE_BATCH])
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        scores = score_batch([text for _, text in rows], spam_filter)
+        spam = {
+            comment_id: score
+            for (comment_id, _), score in zip(rows, scores)
+            if score >= Constants.SPAM_THRESHOLD
+        }
+        if spam:
+            enqueue(spam)
+        scored += len(rows)
+        queued += len(spam)
+    return scored, queued
+
+
+def review(queryset, is_spam):
+    """Решение модератора по комментариям из очереди."""
+    comment_ids = list(queryset.values_list('comment_id', flat=True))
+    with transaction.atomic():
+        updated = CommentModeration.objects.filter(
+            comment_id__in=comment_ids
+        ).update(
+            status=CommentModeration.SPAM if is_spam else CommentModeration.HAM
+        )
+        if not is_spam:
+            bulk.set_published(
+                Comment.objects.filter(pk__in=comment_ids), True
+            )
+    return updated
@@ -0,0 +1,207 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from constants import Constants
+from .mentions import mentioned_ids
+from .models import Comment, Notification, Post
+
+
+def unread_key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def notify(notifications):
+    """Сохраняет уведомления одним bulk_create и увеличивает
+    закешированные счётчики непрочитанных у получателей.
+    """
+    if not notifications:
+        return
+    Notification.objects.bulk_create(
+        notifications, batch_size=Constants.BULK_BATCH_SIZE
+    )
+    per_recipient = {}
+    for notification in notifications:
+        per_recipient[notification.recipient_id] = (
+            per_recipient.get(notification.recipient_id, 0) + 1
+        )
+
+    def bump_counters():
+        for recipient_id, count in per_recipient.items():
+            try:
+                cache.incr(unread_key(recipient_id), count)
+            except ValueError:
+                # Счётчика нет в кеше: он будет посчитан при чтении.
+                pass
+
+    transaction.on_commit(bump_counters)
+
+
+def unread_count(user):
+    """Число непрочитанных уведомлений; COUNT по индексу только
+    при промахе кеша.
+    """
+    key = unread_key(user.pk)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(
+            recipient=user, unread=True
+        ).count()
+        cache.add(key, count, Constants.NOTIFICATION_COUNT_TIMEOUT)
+    return count
+
+
+def mark_all_read(user):
+    """Отмечает все уведомления прочитанными одним UPDATE."""
+    updated = Notification.objects.filter(
+        recipient=user, unread=True
+    ).update(unread=False)
+    transaction.on_commit(lambda: cache.delete(unread_key(user.pk)))
+    return updated
+
+
+def mention_notifications(obj, post_id, comment_id=None, exclude=()):
+    """Уведомления упомянутым в тексте пользователям, кроме `exclude`
+    и самого автора.
+    """
+    return [
+        Notification(
+            recipient_id=user_id,
+            actor_id=obj.author_id,
+            kind=Notification.MENTION,
+            post_id=post_id,
+            comment_id=comment_id,
+        )
+        for user_id in mentioned_ids(obj.mentions)
+        if user_id != obj.author_id and user_id not in exclude
+    ]
+
+
+def comment_notifications(comments):
+    """Уведомления о новых комментариях: упомянутым пользователям,
+    автору поста и участникам обсуждения; каждому получателю — одно
+    уведомление на комментарий. Комментарии к скрытым постам
+    уведомлений не создают. Запросы выполняются на весь набор.
+    """
+    post_ids = {comment.post_id for comment in comments}
+    post_authors = dict(
+        Post.published_posts.filter(pk__in=post_ids).values_list(
+            'pk', 'author_id'
+        )
+    )
+    participants = {}
+    for post_id, author_id in Comment.objects.filter(
+        post_id__in=post_ids
+    ).values_list('post_id', 'author_id').distinct():
+        participants.setdefault(post_id, set()).add(author_id)
+
+    notifications = []
+    for comment in comments:
+        post_author_id = post_authors.get(comment.post_id)
+        if post_author_id is None:
+            continue
+        mentioned = mentioned_ids(comment.mentions)
+        notifications += mention_notifications(
+            comment, comment.post_id, comment.pk
+        )
+        if post_author_id not in mentioned | {comment.author_id}:
+            notifications.append(Notification(
+                recipient_id=post_author_id,
+                actor_id=comment.author_id,
+                kind=Notification.COMMENT,
+                post_id=comment.post_id,
+                comment_id=comment.pk,
+            ))
+        notifications += [
+            Notification(
+                recipient_id=recipient_id,
+                actor_id=comment.author_id,
+                kind=Notification.REPLY,
+                post_id=comment.post_id,
+                comment_id=comment.pk,
+            )
+            for recipient_id in participants.get(comment.post_id, ())
+            if recipient_id not in mentioned | {
+                comment.author_id, post_author_id
+            }
+        ]
+    return notifications
+
+
+def unsent_mentions(notifications):
+    """Уведомления об упоминаниях без тех, что уже отправлены тем же
+    получателям о том же посте или комментарии.
+    """
+    if not notifications:
+        return []
+    sent = set(Notification.objects.filter(
+        kind=Notification.MENTION,
+        post_id__in={notification.post_id for notification in notifications},
+        recipient_id__in={
+            notification.recipient_id for notification in notifications
+        },
+    ).values_list('post_id', 'comment_id', 'recipient_id'))
+    result = []
+    for notification in notifications:
+        key = (
+            notification.post_id,
+            notification.comment_id,
+            notification.recipient_id,
+        )
+        if key not in sent:
+            sent.add(key)
+            result.append(notification)
+    return result
+
+
+def post_mentions(post_ids):
+    """Неотправленные уведомления об упоминаниях в видимых постах
+    из `post_ids` и в опубликованных комментариях к ним. Вызывается,
+    когда пост сохранён или стал видимым.
+    """
+    posts = Post.published_posts.filter(pk__in=post_ids)
+    notifications = []
+    for post in posts.exclude(mentions=[]).only('author_id', 'mentions'):
+        notifications += mention_notifications(post, post.pk)
+    for comment in Comment.objects.filter(
+        post__in=posts.values('pk'), is_published=True
+    ).exclude(mentions=[]).only('post_id', 'author_id', 'mentions'):
+        notifications += mention_notifications(
+            comment, comment.post_id, comment.pk
+        )
+    return unsent_mentions(notifications)
+
+
+def comment_mentions(comments):
+    """Неотправленные уведомления об упоминаниях в опубликованных
+    комментариях к видимым постам.
+    """
+    visible = set(Post.published_posts.filter(
+        pk__in={comment.post_id for comment in comments}
+    ).values_list('pk', flat=True))
+    notifications = []
+    for comment in comments:
+        if comment.is_published and comment.post_id in visible:
+            notifications += mention_notifications(
+                comment, comment.post_id, comment.pk
+            )
+    return unsent_mentions(notifications)
+
+
+def notify_scheduled_mentions():
+    """Уведомляет об упоминаниях в отложенных постах, дата публикации
+    которых наступила за последние `SCHEDULED_MENTIONS_LOOKBACK`
+    секунд. Повторный запуск уже отправленных уведомлений не создаёт.
+    Возвращает число уведомлений.
+    """
+    now = timezone.now()
+    new = post_mentions(Post.objects.filter(
+        pub_date__gt=now - timedelta(
+            seconds=Constants.SCHEDULED_MENTIONS_LOOKBACK
+        ),
+        pub_date__lte=now,
+    ).values('pk'))
+    notify(new)
+    return len(new)
@@ -0,0 +1,42 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from constants import Constants
+
+
+def estimate_table_rows(queryset):
+    """Приблизительное число строк таблицы без COUNT(*)."""
+    model = queryset.model
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+    # Для автоинкрементного ключа максимум берётся по индексу.
+    return model._default_manager.using(queryset.db).order_by(
+        '-pk'
+    ).values_list('pk', flat=True).first()
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор, который точно считает строки только до порога.
+
+    Дальше COUNT(*) ограничивается LIMIT, а для списка без фильтров
+    используется оценка размера таблицы.
+    """
+
+    limit = Constants.ADMIN_EXACT_COUNT_LIMIT
+
+    @cached_property
+    def count(self):
+        bounded = self.object_list.order_by()[:self.limit + 1].count()
+        if bounded <= self.limit:
+            return bounded
+        if self.object_list.query.where:
+            return self.limit
+        return max(estimate_table_rows(self.object_list) or 0, self.limit)
@@ -0,0 +1,84 @@
+"""Отметки прочтения: какие комментарии пользователь уже видел.
+
+Для пары (пользователь, пост) хранится id последнего увиденного
+комментария и число комментариев на момент визита. Отметка
+записывается одним запросом за визит и только если появились новые
+комментарии; её сдвигает представление поста, а не шаблон. Бейджи
+«N новых» в лентах считаются как
+`Post.comment_count` минус сохранённое число, отметки всех постов
+страницы выбираются одним запросом.
+"""
+from django.db.models import Max, Q
+
+from .models import Post, ReadMarker
+
+
+def load_read_markers(request, post_ids):
+    """Отметки текущего пользователя для постов: {post_id: отметка или
+    None}. Результат запоминается на время запроса, повторно
+    выбираются только посты, которых ещё нет в памяти.
+    """
+    markers = request.__dict__.setdefault('_read_markers', {})
+    missing = [post_id for post_id in post_ids if post_id not in markers]
+    if missing and request.user.is_authenticated:
+        markers.update(dict.fromkeys(missing))
+        for marker in ReadMarker.objects.filter(
+            user=request.user, post_id__in=missing
+        ).only('post_id', 'last_comment_id', 'comment_count'):
+            markers[marker.post_id] = marker
+    return markers
+
+
+def mark_read(request, post_id, last_comment_id, comment_count):
+    """Сдвигает отметку поста на последний комментарий.
+
+    В памяти запроса остаётся прежняя отметка, чтобы на этой же
+    странице подсветить комментарии, появившиеся с прошлого визита.
+    """
+    if not request.user.is_authenticated:
+        return
+    marker = load_read_markers(request, [post_id])[post_id]
+    if marker is None:
+        ReadMarker.objects.bulk_create([ReadMarker(
+            user=request.user,
+            post_id=post_id,
+            last_comment_id=last_comment_id,
+            comment_count=comment_count,
+        )], ignore_conflicts=True)
+    elif (
+        last_comment_id > marker.last_comment_id
+        or comment_count != marker.comment_count
+    ):
+        ReadMarker.objects.filter(
+            user=request.user, post_id=post_id
+        ).update(
+            last_comment_id=max(last_comment_id, marker.last_comment_id),
+            comment_count=comment_count,
+        )
+
+
+def mark_post_read(request, post_id):
+    """`mark_read` для страницы поста, отданной из кеша: последний
+    опубликованный комментарий и их число читаются одним запросом.
+    """
+    if not request.user.is_authenticated:
+        return
+    row = Post.objects.filter(pk=post_id).annotate(
+        last_comment_id=Max(
+            'comments__pk', filter=Q(comments__is_published=True)
+        )
+    ).values_list('last_comment_id', 'comment_count').first()
+    if row is not None:
+        mark_read(request, post_id, row[0] or 0, row[1])
+
+
+def is_new_comment(request, post_id, comment_id):
+    marker = load_read_markers(request, [post_id])[post_id]
+    return marker is not None and comment_id > marker.last_comment_id
+
+
+def new_comment_count(request, post_id, comment_count):
+    marker = load_read_markers(request, [post_id])[post_id]
+    if marker is None:
+        return 0
+    return max(comment_count - marker.comment_count, 0)
@@ -0,0 +1,384 @@
+"""Похожие посты по TF-IDF.
+
+Заголовок и текст поста превращаются в вектор частот слов, хешированных
+в `Constants.RELATED_FEATURES` корзин. Сырые частоты хранятся
+в `PostVector`, документные частоты корзин — в `RelatedPostsIndex`,
+поэтому IDF применяется при расчёте, а новый пост добавляется без
+пересчёта всего корпуса. Слова поста с наибольшими весами TF-IDF
+хранятся в обратном индексе `PostTerm`: изменённый пост сравнивается
+только с постами, у которых есть общие с ним такие слова. Ближайшие
+соседи ищутся произведением плотных блоков матриц (numpy)
+и сохраняются в `RelatedPost`; страница поста читает их одним
+запросом по индексу.
+"""
+import re
+import zlib
+
+import numpy as np
+from django.db import models, transaction
+from django.utils import timezone
+
+from constants import Constants
+from .cache import detail_urls, invalidate_urls
+from .models import (
+    ChangeLog,
+    Post,
+    PostTerm,
+    PostVector,
+    RelatedPost,
+    RelatedPostsIndex,
+    Watermark,
+)
+
+RELATED_POSTS = 'related_posts'
+WORD_RE = re.compile(r'\w{2,}')
+
+
+def related_posts(post):
+    """Опубликованные похожие посты: один запрос по индексу."""
+    return [
+        row.related
+        for row in RelatedPost.objects.filter(
+            post=post,
+            related__is_published=True,
+            related__category__is_published=True,
+            related__pub_date__lte=timezone.now(),
+        ).select_related('related').order_by('-score')[
+            :Constants.RELATED_POSTS
+        ]
+    ]
+
+
+def candidate_posts():
+    """Посты, между которыми ищутся похожие. Дата публикации
+    не проверяется: отложенные посты отсеиваются при выводе.
+    """
+    return Post.objects.filter(
+        is_published=True, category__is_published=True
+    )
+
+
+def hash_terms(title, text):
+    """Хешированные частоты слов: (номера корзин, веса 1 + log tf)."""
+    counts = {}
+    for word in WORD_RE.findall(f'{title} {text}'.lower()):
+        bucket = zlib.crc32(word.encode()) % Constants.RELATED_FEATURES
+        counts[bucket] = counts.get(bucket, 0) + 1
+    terms = np.array(sorted(counts), dtype=np.int32)
+    weights = 1 + np.log(
+        np.array([counts[term] for term in terms], dtype=np.float32)
+    )
+    return terms, weights
+
+
+def vectorize(posts):
+    """Векторы постов из queryset: [(post_id, корзины, веса)]."""
+    return [
+        (post_id, *hash_terms(title, text))
+        for post_id, title, text in posts.values_list(
+            'pk', 'title', 'text'
+        ).iterator()
+    ]
+
+
+def load_vectors(vectors):
+    """Векторы из строк `PostVector`: [(post_id, корзины, веса)]."""
+    return [
+        (
+            vector.post_id,
+            np.frombuffer(bytes(vector.terms), dtype=np.int32),
+            np.frombuffer(bytes(vector.weights), dtype=np.float32),
+        )
+        for vector in vectors
+    ]
+
+
+def save_vectors(vectors):
+    PostVector.objects.bulk_create(
+        [
+            PostVector(
+                post_id=post_id,
+                terms=terms.tobytes(),
+                weights=weights.tobytes(),
+            )
+            for post_id, terms, weights in vectors
+        ],
+        batch_size=Constants.BULK_BATCH_SIZE,
+    )
+
+
+def top_terms(vectors, idf):
+    """Слова постов с наибольшими весами TF-IDF: [(post_id, корзина)]."""
+    rows = []
+    for post_id, terms, weights in vectors:
+        if len(terms) > Constants.RELATED_INDEX_TERMS:
+            terms = terms[np.argpartition(
+                -weights * idf[terms], Constants.RELATED_INDEX_TERMS - 1
+            )[:Constants.RELATED_INDEX_TERMS]]
+        rows += [(post_id, term) for term in terms.tolist()]
+    return rows
+
+
+def save_terms(rows):
+    PostTerm.objects.bulk_create(
+        [PostTerm(post_id=post_id, term=term) for post_id, term in rows],
+        batch_size=Constants.BULK_BATCH_SIZE,
+    )
+
+
+def candidate_ids(rows):
+    """Посты, у которых есть общие слова из `rows` в `PostTerm`."""
+    terms = sorted({term for _, term in rows})
+    post_ids = set()
+    size = Constants.BULK_BATCH_SIZE
+    for start in range(0, len(terms), size):
+        post_ids.update(PostTerm.objects.filter(
+            term__in=terms[start:start + size]
+        ).values_list('post_id', flat=True).distinct())
+    return sorted(post_ids)
+
+
+def in_chunks(queryset, post_ids):
+    """Строки queryset для `post_ids`: `BULK_BATCH_SIZE` id на запрос."""
+    size = Constants.BULK_BATCH_SIZE
+    for start in range(0, len(post_ids), size):
+        yield from queryset.filter(
+            post_id__in=post_ids[start:start + size]
+        ).iterator()
+
+
+def lock_index():
+    index, _ = RelatedPostsIndex.objects.select_for_update().get_or_create(
+        pk=1
+    )
+    if index.frequencies:
+        frequencies = np.frombuffer(bytes(index.frequencies), dtype=np.int32)
+    else:
+        frequencies = np.zeros(Constants.RELATED_FEATURES, dtype=np.int32)
+    return index, frequencies.copy()
+
+
+def save_index(index, frequencies):
+    index.frequencies = frequencies.tobytes()
+    index.save()
+
+
+def inverse_frequencies(documents, frequencies):
+    return (
+        np.log((1 + documents) / (1 + frequencies.astype(np.float32))) + 1
+    )
+
+
+def to_matrix(vectors, idf):
+    """Плотная матрица нормированных TF-IDF векторов пачки постов."""
+    matrix = np.zeros((len(vectors), len(idf)), dtype=np.float32)
+    for row, (_, terms, weights) in enumerate(vectors):
+        matrix[row, terms] = weights * idf[terms]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+def nearest(queries, corpus, idf, on_block=None):
+    """Top-k похожих постов корпуса для каждого поста из `queries`.
+
+    Сходства считаются блоками `RELATED_BATCH_SIZE` x `RELATED_BATCH_SIZE`
+    одним матричным произведением; лучшие k соседей пачки сливаются
+    с каждым блоком через `argpartition`. `on_block(ids пачки, ids блока,
+    сходства)` вызывается для каждого блока.
+    Возвращает {post_id: [(related_id, score), ...]}.
+    """
+    size = Constants.RELATED_BATCH_SIZE
+    k = Constants.RELATED_NEIGHBOURS
+    corpus_ids = np.array(
+        [post_id for post_id, _, _ in corpus], dtype=np.int64
+    )
+    neighbours = {}
+    for start in range(0, len(queries), size):
+        batch = queries[start:start + size]
+        batch_ids = np.array([post_id for post_id, _, _ in batch])
+        matrix = to_matrix(batch, idf)
+        best_scores = np.zeros((len(batch), 0), dtype=np.float32)
+        best_ids = np.zeros((len(batch), 0), dtype=np.int64)
+        for block_start in range(0, len(corpus), size):
+            block_ids = corpus_ids[block_start:block_start + size]
+            scores = matrix @ to_matrix(
+                corpus[block_start:block_start + size], idf
+            ).T
+            scores[batch_ids[:, None] == block_ids[None, :]] = 0
+            if on_block is not None:
+                on_block(batch_ids, block_ids, scores)
+            best_scores = np.concatenate((best_scores, scores), axis=1)
+            best_ids = np.concatenate(
+                (best_ids, np.broadcast_to(block_ids, scores.shape)), axis=1
+            )
+            if best_scores.shape[1] > k:
+                top = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, top, axis=1)
+                best_ids = np.take_along_axis(best_ids, top, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_ids = np.take_along_axis(best_ids, order, axis=1)
+        for row, post_id in enumerate(batch_ids):
+            neighbours[int(post_id)] = [
+                (int(related_id), float(score))
+                for related_id, score in zip(best_ids[row], best_scores[row])
+                if score >= Constants.RELATED_MIN_SCORE
+            ]
+    return neighbours
+
+
+def save_neighbours(neighbours):
+    RelatedPost.objects.bulk_create(
+        [
+            RelatedPost(post_id=post_id, related_id=related_id, score=score)
+            for post_id, rows in neighbours.items()
+            for related_id, score in rows
+        ],
+        batch_size=Constants.BULK_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def last_change_id():
+    return ChangeLog.objects.aggregate(last=models.Max('pk'))['last'] or 0
+
+
+def rebuild():
+    """Пересчитывает векторы, IDF и списки соседей всех постов.
+    Возвращает число постов в индексе.
+    """
+    with transaction.atomic():
+        watermark, _ = Watermark.objects.select_for_update(
+        ).get_or_create(name=RELATED_POSTS)
+        watermark.last_id = last_change_id()
+        index, _ = lock_index()
+        vectors = vectorize(candidate_posts())
+        frequencies = np.zeros(Constants.RELATED_FEATURES, dtype=np.int32)
+        for _, terms, _ in vectors:
+            frequencies[terms] += 1
+        index.documents = len(vectors)
+        save_index(index, frequencies)
+        idf = inverse_frequencies(len(vectors), frequencies)
+        PostVector.objects.all().delete()
+        save_vectors(vectors)
+        PostTerm.objects.all().delete()
+        save_terms(top_terms(vectors, idf))
+        RelatedPost.objects.all().delete()
+        save_neighbours(nearest(vectors, vectors, idf))
+        watermark.save(update_fields=('last_id', 'updated_at'))
+    return len(vectors)
+
+
+def trim_neighbours(post_ids):
+    """Оставляет у постов не больше `RELATED_NEIGHBOURS` соседей."""
+    extra = []
+    kept = {}
+    for pk, post_id in RelatedPost.objects.filter(
+        post_id__in=post_ids
+    ).order_by('post_id', '-score').values_list('pk', 'post_id'):
+        kept[post_id] = kept.get(post_id, 0) + 1
+        if kept[post_id] > Constants.RELATED_NEIGHBOURS:
+            extra.append(pk)
+    RelatedPost.objects.filter(pk__in=extra).delete()
+
+
+def update_posts(post_ids):
+    """Обновляет индекс для новых, изменённых и удалённых постов.
+
+    Векторы остальных постов не пересчитываются: изменённые посты
+    сравниваются только с кандидатами из `PostTerm`, векторы и пороги
+    кандидатов читаются по индексу. Если изменённый пост ближе
+    к кандидату, чем его худший сосед, он добавляется в список
+    соседей кандидата.
+    """
+    post_ids = list(post_ids)
+    index, frequencies = lock_index()
+    for _, terms, _ in load_vectors(
+        PostVector.objects.filter(post_id__in=post_ids).iterator()
+    ):
+        frequencies[terms] -= 1
+        index.documents -= 1
+    PostVector.objects.filter(post_id__in=post_ids).delete()
+    PostTerm.objects.filter(post_id__in=post_ids).delete()
+    RelatedPost.objects.filter(
+        models.Q(post_id__in=post_ids) | models.Q(related_id__in=post_ids)
+    ).delete()
+
+    changed = vectorize(candidate_posts().filter(pk__in=post_ids))
+    for _, terms, _ in changed:
+        frequencies[terms] += 1
+        index.documents += 1
+    save_index(index, frequencies)
+    save_vectors(changed)
+    if not changed:
+        return
+    idf = inverse_frequencies(index.documents, frequencies)
+    changed_terms = top_terms(changed, idf)
+    save_terms(changed_terms)
+
+    candidates = candidate_ids(changed_terms)
+    thresholds = {
+        row['post_id']: (
+            row['lowest']
+            if row['count'] >= Constants.RELATED_NEIGHBOURS
+            else Constants.RELATED_MIN_SCORE
+        )
+        for row in in_chunks(
+            RelatedPost.objects.values('post_id').annotate(
+                count=models.Count('pk'), lowest=models.Min('score')
+            ).order_by(),
+            candidates,
+        )
+    }
+    changed_ids = {post_id for post_id, _, _ in changed}
+    reverse = {}
+
+    def collect_reverse(batch_ids, block_ids, scores):
+        limits = np.array([
+            np.inf if post_id in changed_ids
+            else thresholds.get(post_id, Constants.RELATED_MIN_SCORE)
+            for post_id in block_ids.tolist()
+        ], dtype=np.float32)
+        rows, columns = np.nonzero(scores >= limits[None, :])
+        for row, column in zip(rows.tolist(), columns.tolist()):
+            reverse.setdefault(int(block_ids[column]), []).append(
+                (int(batch_ids[row]), float(scores[row, column]))
+            )
+
+    corpus = load_vectors(in_chunks(PostVector.objects.all(), candidates))
+    save_neighbours(nearest(changed, corpus, idf, on_block=collect_reverse))
+    save_neighbours(reverse)
+    trim_neighbours(list(reverse))
+    urls = []
+    for post_id in changed_ids | set(reverse):
+        urls += detail_urls(post_id)
+    invalidate_urls(urls)
+
+
+def process_changes():
+    """Обновляет индекс по странице журнала изменений после отметки.
+
+    Возвращает число обработанных записей журнала.
+    """
+    with transaction.atomic():
+        watermark, _ = Watermark.objects.select_for_update(
+        ).get_or_create(name=RELATED_POSTS)
+        changes = list(
+            ChangeLog.objects.filter(
+                pk__gt=watermark.last_id
+            ).order_by('pk').values_list('pk', 'content', 'object_id')[
+                :Constants.CHANGELOG_PAGE_SIZE
+            ]
+        )
+        if not changes:
+            return 0
+        post_ids = {
+            object_id for _, content, object_id in changes
+            if content == ChangeLog.POST
+        }
+        if post_ids:
+            update_posts(post_ids)
+        watermark.last_id = changes[-1][0]
+        watermark.save(update_fields=('last_id', 'updated_at'))
+    return len(changes)
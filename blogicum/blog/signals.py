@@ -0,0 +1,780 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from constants import Constants
+
+from . import notifications, timeline
+from .bulk import bulk_created, bulk_creating, bulk_updated
+from .cache import (
+    category_urls,
+    detail_urls,
+    index_urls,
+    invalidate_urls,
+    post_urls,
+    posts_urls,
+    profile_urls,
+    trending_urls,
+)
+from .managers import archive_month
+from .mentions import resolve_mentions
+from .models import (
+    AuthorStats,
+    Category,
+    ChangeLog,
+    Comment,
+    Follow,
+    Location,
+    Post,
+    PostArchive,
+    PostTag,
+    Tag,
+    TimelineEntry,
+    TrendingPost,
+)
+
+User = get_user_model()
+
+
+def remember_previous(instance, queryset, fields):
+    """Сохраняет в экземпляре прежние значения полей до записи в БД."""
+    previous = None
+    if instance.pk is not None:
+        previous = queryset.filter(pk=instance.pk).values(*fields).first()
+    instance._previous = previous or {}
+
+
+# Видимость постов для денормализованных счётчиков (архив, теги):
+# опубликованный пост опубликованной категории, как в
+# `PublishedPostManager`. Дата публикации учитывается при чтении.
+
+def is_listed(post):
+    return bool(
+        post.is_published
+        and post.category_id is not None
+        and post.category.is_published
+    )
+
+
+def was_listed(row):
+    """Видимость по снимку полей до записи (`_previous`, `bulk_updated`)."""
+    return bool(row.get('is_published') and row.get('category__is_published'))
+
+
+def listed_after_update(row, values):
+    category_is_published = row['category__is_published']
+    if 'category' in values:
+        category = values['category']
+        category_is_published = category is not None and category.is_published
+    return bool(
+        values.get('is_published', row['is_published'])
+        and category_is_published
+    )
+
+
+def listed_posts(posts):
+    """Видимые посты из списка. Категории, не загруженные вместе
+    с постами, читаются одним запросом.
+    """
+    published = {
+        post.category_id: post.category.is_published
+        for post in posts
+        if post.category_id is not None and Post.category.is_cached(post)
+    }
+    missing = {post.category_id for post in posts} - set(published)
+    if missing - {None}:
+        published.update(Category.objects.filter(
+            pk__in=missing, is_published=True
+        ).values_list('pk', 'is_published'))
+    return [
+        post for post in posts
+        if post.is_published and published.get(post.category_id)
+    ]
+
+
+def category_visibility_change(instance, created, raw):
+    """+1, если категорию опубликовали, -1, если сняли с публикации."""
+    was_published = getattr(instance, '_previous', {}).get('is_published')
+    if raw or created or was_published in (None, instance.is_published):
+        return 0
+    return 1 if instance.is_published else -1
+
+
+@receiver(pre_save, sender=Post)
+def post_pre_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    remember_previous(instance, Post.objects, (
+        'category__slug',
+        'category__is_published',
+        'author__username',
+        'author_id',
+        'is_published',
+        'pub_date',
+    ))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous', {})
+    invalidate_urls(
+        post_urls(
+            instance.pk,
+            instance.category.slug if instance.category_id else None,
+            instance.author.username,
+        )
+        + category_urls(previous.get('category__slug'))
+        + profile_urls(previous.get('author__username'))
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    post = Post.objects.filter(pk=instance.post_id).values(
+        'category__slug', 'author__username'
+    ).first()
+    if post is not None:
+        invalidate_urls(post_urls(
+            instance.post_id, post['category__slug'], post['author__username']
+        ))
+
+
+@receiver(pre_save, sender=Category)
+def category_pre_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    remember_previous(instance, Category.objects, ('slug', 'is_published'))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous', {})
+    invalidate_urls(
+        posts_urls(Post.objects.filter(category=instance))
+        + category_urls(instance.slug)
+        + category_urls(previous.get('slug'))
+    )
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def location_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_urls(posts_urls(Post.objects.filter(location=instance)))
+
+
+def is_login_update(update_fields):
+    # Вход пользователя обновляет только last_login — ленты не меняются.
+    return update_fields is not None and set(update_fields) <= {'last_login'}
+
+
+@receiver(pre_save, sender=User)
+def user_pre_save(
+        sender, instance, update_fields=None, raw=False, **kwargs
+):
+    if not raw and not is_login_update(update_fields):
+        remember_previous(instance, User.objects, ('username',))
+
+
+@receiver(post_save, sender=User)
+def user_changed(
+        sender, instance, created, update_fields=None, raw=False, **kwargs
+):
+    if raw or created or is_login_update(update_fields):
+        return
+    previous = getattr(instance, '_previous', {})
+    commented = Comment.objects.filter(author=instance).values('post_id')
+    invalidate_urls(
+        posts_urls(Post.objects.filter(author=instance))
+        + posts_urls(Post.objects.filter(pk__in=commented))
+        + profile_urls(instance.username)
+        + profile_urls(previous.get('username'))
+    )
+
+
+# Статистика авторов: счётчики меняются на ±1 при каждой записи,
+# поэтому страница профиля не пересчитывает их запросами.
+
+def post_counter(is_published):
+    return 'published_posts' if is_published else 'drafts'
+
+
+@receiver(post_save, sender=User)
+def create_author_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        AuthorStats.objects.get_or_create(author=instance)
+
+
+@receiver(post_save, sender=Post)
+def update_stats_on_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous', {})
+    if created or not previous:
+        AuthorStats.objects.change(
+            instance.author_id, **{post_counter(instance.is_published): 1}
+        )
+        AuthorStats.objects.update_last_post_date(
+            instance.author_id, instance.pub_date
+        )
+        return
+    if previous['author_id'] != instance.author_id:
+        AuthorStats.objects.change(
+            previous['author_id'],
+            **{post_counter(previous['is_published']): -1}
+        )
+        AuthorStats.objects.refresh_last_post_date(previous['author_id'])
+        AuthorStats.objects.recalculate(instance.author_id)
+        return
+    if previous['is_published'] != instance.is_published:
+        AuthorStats.objects.change(instance.author_id, **{
+            post_counter(previous['is_published']): -1,
+            post_counter(instance.is_published): 1,
+        })
+    if previous['pub_date'] != instance.pub_date:
+        AuthorStats.objects.refresh_last_post_date(instance.author_id)
+
+
+@receiver(post_delete, sender=Post)
+def update_stats_on_post_delete(sender, instance, **kwargs):
+    AuthorStats.objects.change(
+        instance.author_id, **{post_counter(instance.is_published): -1}
+    )
+    AuthorStats.objects.refresh_last_post_date(instance.author_id)
+
+
+def change_comment_counts(per_post):
+    """Изменяет число опубликованных комментариев постов и их авторов:
+    {post_id: приращение}.
+    """
+    per_post = {post_id: delta for post_id, delta in per_post.items() if delta}
+    if not per_post:
+        return
+    received = {}
+    for post_id, author_id in Post.objects.filter(
+        pk__in=per_post
+    ).values_list('pk', 'author_id'):
+        received[author_id] = received.get(author_id, 0) + per_post[post_id]
+    for author_id, delta in received.items():
+        if delta:
+            AuthorStats.objects.change(author_id, comments_received=delta)
+    Post.objects.change_comment_counts(per_post)
+
+
+def comment_published_delta(instance, created):
+    """+1, если комментарий стал опубликованным, -1, если снят
+    с публикации, иначе 0.
+    """
+    if created:
+        return 1 if instance.is_published else 0
+    was_published = getattr(instance, '_previous', {}).get('is_published')
+    if was_published is None or was_published == instance.is_published:
+        return 0
+    return 1 if instance.is_published else -1
+
+
+# Комментарии, отправленные на модерацию, в счётчиках не учитываются.
+
+@receiver(post_save, sender=Comment)
+def update_stats_on_comment_save(
+        sender, instance, created, raw=False, **kwargs
+):
+    if not raw:
+        change_comment_counts({
+            instance.post_id: comment_published_delta(instance, created)
+        })
+
+
+@receiver(post_delete, sender=Comment)
+def update_stats_on_comment_delete(sender, instance, **kwargs):
+    if instance.is_published:
+        change_comment_counts({instance.post_id: -1})
+
+
+# Массовые изменения из админки и команды bulk_moderate: одна
+# инвалидация и одно изменение счётчиков на автора вместо работы по строкам.
+
+@receiver(bulk_updated, sender=Post)
+def posts_bulk_updated(sender, previous, values, **kwargs):
+    urls = index_urls() + trending_urls()
+    category_slugs, usernames = set(), set()
+    moved = {}
+    for row in previous:
+        urls += detail_urls(row['pk'])
+        category_slugs.add(row['category__slug'])
+        usernames.add(row['author__username'])
+        if row['is_published'] != values.get(
+            'is_published', row['is_published']
+        ):
+            moved[row['author_id']] = moved.get(row['author_id'], 0) + 1
+    if values.get('category') is not None:
+        category_slugs.add(values['category'].slug)
+    for category_slug in category_slugs:
+        urls += category_urls(category_slug)
+    for username in usernames:
+        urls += profile_urls(username)
+    invalidate_urls(urls)
+
+    published = 1 if values.get('is_published') else -1
+    for author_id, count in moved.items():
+        AuthorStats.objects.change(
+            author_id,
+            published_posts=published * count,
+            drafts=-published * count,
+        )
+
+
+@receiver(bulk_updated, sender=Comment)
+def comments_bulk_updated(sender, previous, values, **kwargs):
+    posts = {
+        (
+            row['post_id'],
+            row['post__category__slug'],
+            row['post__author__username'],
+        )
+        for row in previous
+    }
+    urls = []
+    for post_id, category_slug, username in posts:
+        urls += post_urls(post_id, category_slug, username)
+    invalidate_urls(urls)
+
+    if 'is_published' in values:
+        delta = 1 if values['is_published'] else -1
+        per_post = {}
+        for row in previous:
+            if row['is_published'] != values['is_published']:
+                per_post[row['post_id']] = (
+                    per_post.get(row['post_id'], 0) + delta
+                )
+        change_comment_counts(per_post)
+
+
+@receiver(bulk_created, sender=Post)
+def posts_bulk_created(sender, objects, **kwargs):
+    invalidate_urls(
+        posts_urls(Post.objects.filter(pk__in=[post.pk for post in objects]))
+    )
+    deltas = {}
+    for post in objects:
+        author = deltas.setdefault(
+            post.author_id,
+            {'published_posts': 0, 'drafts': 0, 'last_post_date': None},
+        )
+        author[post_counter(post.is_published)] += 1
+        if (
+            author['last_post_date'] is None
+            or post.pub_date > author['last_post_date']
+        ):
+            author['last_post_date'] = post.pub_date
+    for author_id, delta in deltas.items():
+        last_post_date = delta.pop('last_post_date')
+        AuthorStats.objects.change(author_id, **delta)
+        AuthorStats.objects.update_last_post_date(author_id, last_post_date)
+
+
+@receiver(bulk_created, sender=Comment)
+def comments_bulk_created(sender, objects, **kwargs):
+    per_post = {}
+    for comment in objects:
+        per_post[comment.post_id] = (
+            per_post.get(comment.post_id, 0) + comment.is_published
+        )
+    posts = Post.objects.filter(pk__in=per_post).values_list(
+        'pk', 'category__slug', 'author__username'
+    )
+    urls = []
+    for post_id, category_slug, username in posts:
+        urls += post_urls(post_id, category_slug, username)
+    invalidate_urls(urls)
+    change_comment_counts(per_post)
+
+
+# Журнал изменений для синхронизации клиентов (см. api.sync).
+
+def log_post_ids(queryset, action=ChangeLog.UPDATED):
+    ChangeLog.objects.record(
+        ChangeLog.POST, queryset.values_list('pk', flat=True), action
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+def log_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    content = ChangeLog.POST if sender is Post else ChangeLog.COMMENT
+    action = ChangeLog.CREATED if created else ChangeLog.UPDATED
+    ChangeLog.objects.record(content, [instance.pk], action)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+def log_delete(sender, instance, **kwargs):
+    content = ChangeLog.POST if sender is Post else ChangeLog.COMMENT
+    ChangeLog.objects.record(content, [instance.pk], ChangeLog.DELETED)
+
+
+@receiver(bulk_created)
+@receiver(bulk_updated)
+def log_bulk(sender, objects=None, previous=None, **kwargs):
+    content = ChangeLog.POST if sender is Post else ChangeLog.COMMENT
+    if objects is not None:
+        ChangeLog.objects.record(
+            content, [obj.pk for obj in objects], ChangeLog.CREATED
+        )
+    else:
+        ChangeLog.objects.record(
+            content, [row['pk'] for row in previous], ChangeLog.UPDATED
+        )
+
+
+@receiver(post_save, sender=Category)
+def log_category_visibility(sender, instance, raw=False, **kwargs):
+    previous = getattr(instance, '_previous', {})
+    if not raw and previous.get('is_published') not in (
+        None, instance.is_published
+    ):
+        log_post_ids(Post.objects.filter(category=instance))
+
+
+@receiver(pre_delete, sender=Category)
+def log_category_delete(sender, instance, **kwargs):
+    # После удаления у постов уже не будет ссылки на категорию.
+    log_post_ids(Post.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=Location)
+def log_location_change(sender, instance, created, raw=False, **kwargs):
+    if not (raw or created):
+        log_post_ids(Post.objects.filter(location=instance))
+
+
+# Счётчики тегов учитывают только видимые посты.
+
+def tag_deltas(post_ids, sign):
+    """Приращения счётчиков тегов для набора постов: GROUP BY на пачку."""
+    deltas = {}
+    size = Constants.BULK_BATCH_SIZE
+    for start in range(0, len(post_ids), size):
+        for row in PostTag.objects.filter(
+            post_id__in=post_ids[start:start + size]
+        ).values('tag_id').annotate(count=Count('pk')):
+            deltas[row['tag_id']] = (
+                deltas.get(row['tag_id'], 0) + sign * row['count']
+            )
+    return deltas
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def post_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        related = instance.posts if reverse else instance.tags
+        instance._cleared_pks = set(related.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    sign = 1 if action == 'post_add' else -1
+    if action == 'post_clear':
+        pk_set = instance._cleared_pks
+    if not pk_set:
+        return
+    if reverse:
+        listed = Post.objects.filter(
+            pk__in=pk_set, is_published=True, category__is_published=True
+        ).count()
+        Tag.objects.change_counts({instance.pk: sign * listed})
+    elif is_listed(instance):
+        Tag.objects.change_counts({tag_id: sign for tag_id in pk_set})
+    invalidate_urls(index_urls())
+
+
+@receiver(post_save, sender=Post)
+def update_tag_counts_on_post_save(
+        sender, instance, created, raw=False, **kwargs
+):
+    previous = getattr(instance, '_previous', {})
+    if raw or created or not previous:
+        return
+    delta = is_listed(instance) - was_listed(previous)
+    if delta:
+        Tag.objects.change_counts(tag_deltas([instance.pk], delta))
+
+
+@receiver(pre_delete, sender=Post)
+def update_tag_counts_on_post_delete(sender, instance, **kwargs):
+    if is_listed(instance):
+        Tag.objects.change_counts(tag_deltas([instance.pk], -1))
+
+
+@receiver(bulk_updated, sender=Post)
+def update_tag_counts_on_bulk_update(sender, previous, values, **kwargs):
+    moved = {1: [], -1: []}
+    for row in previous:
+        delta = listed_after_update(row, values) - was_listed(row)
+        if delta:
+            moved[delta].append(row['pk'])
+    for sign, post_ids in moved.items():
+        if post_ids:
+            Tag.objects.change_counts(tag_deltas(post_ids, sign))
+
+
+def category_post_ids(category):
+    return list(Post.objects.filter(
+        category=category, is_published=True
+    ).values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Category)
+def update_tag_counts_on_category_save(
+        sender, instance, created, raw=False, **kwargs
+):
+    sign = category_visibility_change(instance, created, raw)
+    if sign:
+        Tag.objects.change_counts(
+            tag_deltas(category_post_ids(instance), sign)
+        )
+
+
+@receiver(pre_delete, sender=Category)
+def update_tag_counts_on_category_delete(sender, instance, **kwargs):
+    if instance.is_published:
+        Tag.objects.change_counts(
+            tag_deltas(category_post_ids(instance), -1)
+        )
+
+
+# Рейтинг популярных постов: комментарии добавляют вес сразу,
+# просмотры — при переносе счётчиков в БД (см. `blog.counters`).
+
+@receiver(post_save, sender=Comment)
+def add_trending_on_comment(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        TrendingPost.objects.add(
+            {instance.post_id: Constants.TRENDING_COMMENT_WEIGHT}
+        )
+
+
+@receiver(bulk_created, sender=Comment)
+def add_trending_on_bulk_comments(sender, objects, **kwargs):
+    weights = {}
+    for comment in objects:
+        weights[comment.post_id] = (
+            weights.get(comment.post_id, 0)
+            + Constants.TRENDING_COMMENT_WEIGHT
+        )
+    TrendingPost.objects.add(weights)
+
+
+# Архив по месяцам: счётчики видимых постов.
+
+@receiver(post_save, sender=Post)
+def update_archive_on_post_save(
+        sender, instance, created, raw=False, **kwargs
+):
+    if raw:
+        return
+    previous = getattr(instance, '_previous', {})
+    deltas = {}
+    if not created and was_listed(previous):
+        month = archive_month(previous['pub_date'])
+        deltas[month] = deltas.get(month, 0) - 1
+    if is_listed(instance):
+        month = archive_month(instance.pub_date)
+        deltas[month] = deltas.get(month, 0) + 1
+    PostArchive.objects.change(deltas)
+
+
+@receiver(post_delete, sender=Post)
+def update_archive_on_post_delete(sender, instance, **kwargs):
+    if is_listed(instance):
+        PostArchive.objects.change_for_dates([instance.pub_date], -1)
+
+
+@receiver(bulk_updated, sender=Post)
+def update_archive_on_bulk_update(sender, previous, values, **kwargs):
+    deltas = {}
+    for row in previous:
+        delta = listed_after_update(row, values) - was_listed(row)
+        if delta:
+            month = archive_month(row['pub_date'])
+            deltas[month] = deltas.get(month, 0) + delta
+    PostArchive.objects.change(deltas)
+
+
+@receiver(bulk_created, sender=Post)
+def update_archive_on_bulk_create(sender, objects, **kwargs):
+    PostArchive.objects.change_for_dates(
+        [post.pub_date for post in listed_posts(objects)], 1
+    )
+
+
+@receiver(post_save, sender=Category)
+def update_archive_on_category_save(
+        sender, instance, created, raw=False, **kwargs
+):
+    sign = category_visibility_change(instance, created, raw)
+    if sign:
+        PostArchive.objects.change_for_posts(
+            Post.objects.filter(category=instance, is_published=True), sign
+        )
+
+
+@receiver(pre_delete, sender=Category)
+def update_archive_on_category_delete(sender, instance, **kwargs):
+    # Посты останутся без категории (SET_NULL) и пропадут из лент.
+    if instance.is_published:
+        PostArchive.objects.change_for_posts(
+            Post.objects.filter(category=instance, is_published=True), -1
+        )
+
+
+# Подписки: счётчик подписчиков и ленты (см. `blog.timeline`).
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    AuthorStats.objects.change(instance.author_id, followers=1)
+    followers = AuthorStats.objects.filter(
+        author_id=instance.author_id
+    ).values_list('followers', flat=True).first()
+    timeline.backfill(instance.follower_id, instance.author_id, followers)
+    invalidate_urls(profile_urls(instance.author.username))
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    AuthorStats.objects.change(instance.author_id, followers=-1)
+    TimelineEntry.objects.filter(
+        user_id=instance.follower_id, author_id=instance.author_id
+    ).delete()
+    invalidate_urls(profile_urls(
+        User.objects.filter(pk=instance.author_id).values_list(
+            'username', flat=True
+        ).first()
+    ))
+
+
+# Уведомления о новых комментариях.
+
+# Комментарии, отправленные на модерацию, уведомлений не создают:
+# уведомления отправляются, когда комментарий опубликован.
+
+@receiver(post_save, sender=Comment)
+def notify_on_comment(sender, instance, created, raw=False, **kwargs):
+    if not raw and comment_published_delta(instance, created) > 0:
+        notifications.notify(notifications.comment_notifications([instance]))
+
+
+@receiver(bulk_created, sender=Comment)
+def notify_on_bulk_comments(sender, objects, **kwargs):
+    notifications.notify(notifications.comment_notifications([
+        comment for comment in objects if comment.is_published
+    ]))
+
+
+@receiver(bulk_updated, sender=Comment)
+def notify_on_bulk_published_comments(sender, previous, values, **kwargs):
+    if not values.get('is_published'):
+        return
+    published = [row['pk'] for row in previous if not row['is_published']]
+    if published:
+        notifications.notify(notifications.comment_notifications(
+            list(Comment.objects.filter(pk__in=published))
+        ))
+
+
+# Упоминания: разбираются перед записью. Уведомления отправляются,
+# когда пост или комментарий видны читателям, — один раз каждому
+# упомянутому пользователю. Об упоминаниях в отложенных постах
+# уведомляет команда notify_scheduled_mentions.
+
+@receiver(pre_save, sender=Comment)
+def comment_pre_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    remember_previous(instance, Comment.objects, ('is_published',))
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_save, sender=Comment)
+def resolve_mentions_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        resolve_mentions([instance])
+
+
+@receiver(bulk_creating, sender=Post)
+@receiver(bulk_creating, sender=Comment)
+def resolve_mentions_on_bulk_create(sender, objects, **kwargs):
+    resolve_mentions(objects)
+
+
+@receiver(post_save, sender=Post)
+def notify_mentioned_in_post(sender, instance, raw=False, **kwargs):
+    if not raw and is_listed(instance) and (
+        instance.pub_date <= timezone.now()
+    ):
+        notifications.notify(notifications.post_mentions([instance.pk]))
+
+
+@receiver(post_save, sender=Comment)
+def notify_mentioned_in_comment(
+        sender, instance, created, raw=False, **kwargs
+):
+    if raw or not instance.is_published or (
+        comment_published_delta(instance, created) > 0
+    ):
+        # О новых и опубликованных комментариях уведомляет
+        # notify_on_comment.
+        return
+    notifications.notify(notifications.comment_mentions([instance]))
+
+
+@receiver(bulk_created, sender=Post)
+def notify_mentioned_in_bulk_posts(sender, objects, **kwargs):
+    now = timezone.now()
+    notifications.notify(notifications.post_mentions([
+        post.pk for post in listed_posts(objects) if post.pub_date <= now
+    ]))
+
+
+@receiver(bulk_updated, sender=Post)
+def notify_mentioned_in_shown_posts(sender, previous, values, **kwargs):
+    shown = [
+        row['pk'] for row in previous
+        if listed_after_update(row, values)
+        and ('pub_date' in values or not was_listed(row))
+    ]
+    if shown:
+        notifications.notify(notifications.post_mentions(shown))
+
+
+@receiver(post_save, sender=Category)
+def notify_mentioned_on_category_publish(
+        sender, instance, created, raw=False, **kwargs
+):
+    if category_visibility_change(instance, created, raw) > 0:
+        notifications.notify(notifications.post_mentions(
+            Post.objects.filter(
+                category=instance, is_published=True
+            ).values('pk')
+        ))
@@ -0,0 +1,167 @@
+from bisect import bisect_right
+from xml.sax.saxutils import escape
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
+from django.utils import timezone
+
+from constants import Constants
+from .models import AuthorStats, Category, Post
+
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+class SitemapSection:
+    """Раздел карты сайта, разбитый на части по диапазонам ключа.
+
+    Часть содержит ключи от `start` до начала следующей части
+    (около `SITEMAP_SHARD_SIZE` адресов), поэтому выбирается диапазоном
+    по индексу ключа без OFFSET. Последняя часть сверху не ограничена.
+
+    По умолчанию строки раздела — `key` и `fields` объектов
+    `queryset` (или всех объектов `model`), а адрес строки —
+    `url_name` с ключом в аргументе.
+    """
+
+    key = 'pk'
+    model = None
+    queryset = None
+    fields = ()
+    url_name = None
+
+    def get_queryset(self):
+        """Строки раздела (values_list), первая колонка — ключ."""
+        if self.queryset is not None:
+            queryset = self.queryset.all()
+        elif self.model is not None:
+            queryset = self.model._default_manager.all()
+        else:
+            raise ImproperlyConfigured(
+                f'{self.__class__.__name__}: укажите model или queryset.'
+            )
+        return queryset.values_list(self.key, *self.fields)
+
+    def location(self, row):
+        return reverse(self.url_name, args=(row[0],))
+
+    def lastmod(self, row):
+        return None
+
+    def ordered(self):
+        return self.get_queryset().order_by(self.key)
+
+    def shard_starts(self):
+        """Первые ключи частей: один запрос с небольшим смещением
+        по индексу на каждую часть.
+        """
+        size = Constants.SITEMAP_SHARD_SIZE
+        starts = []
+        start = self.ordered().values_list(self.key, flat=True).first()
+        while start is not None:
+            starts.append(start)
+            start = self.ordered().filter(
+                **{f'{self.key}__gte': start}
+            ).values_list(self.key, flat=True)[size:size + 1].first()
+        return starts
+
+    def shard(self, start, end=None):
+        rows = self.ordered().filter(**{f'{self.key}__gte': start})
+        if end is not None:
+            rows = rows.filter(**{f'{self.key}__lt': end})
+        return rows.iterator(chunk_size=2000)
+
+
+class PostSection(SitemapSection):
+    def get_queryset(self):
+        return Post.published_posts.values_list('pk', 'pub_date')
+
+    def __init__(self):
+        # Адреса постов строятся по шаблону, а не reverse() на строку.
+        self.url = reverse('blog:post_detail', args=(0,)).replace(
+            '/0/', '/{}/'
+        )
+
+    def location(self, row):
+        return self.url.format(row[0])
+
+    def lastmod(self, row):
+        return row[1]
+
+
+class CategorySection(SitemapSection):
+    def get_queryset(self):
+        # Не атрибут queryset: видимость зависит от текущего времени.
+        return Category.objects.filter(
+            is_published=True, created_at__lte=timezone.now()
+        ).values_list('pk', 'slug')
+
+    def location(self, row):
+        return reverse('blog:category_posts', args=(row[1],))
+
+
+class ProfileSection(SitemapSection):
+    # Статистика автора уже хранит дату последней публикации.
+    queryset = AuthorStats.objects.filter(published_posts__gt=0)
+    key = 'author_id'
+    fields = ('author__username', 'last_post_date')
+
+    def location(self, row):
+        return reverse('blog:profile', args=(row[1],))
+
+    def lastmod(self, row):
+        return row[2]
+
+
+SECTIONS = {
+    'posts': PostSection,
+    'categories': CategorySection,
+    'profiles': ProfileSection,
+}
+
+
+def get_shard_starts(name):
+    key = f'sitemap:starts:{name}'
+    starts = cache.get(key)
+    if starts is None:
+        starts = SECTIONS[name]().shard_starts()
+        cache.set(key, starts, Constants.SITEMAP_CACHE_TIMEOUT)
+    return starts
+
+
+def next_shard_start(name, start):
+    """Начало следующей части по тем же закешированным началам,
+    что и в индексе: так части не пересекаются и не теряют строки.
+    """
+    starts = get_shard_starts(name)
+    position = bisect_right(starts, start)
+    return starts[position] if position < len(starts) else None
+
+
+def render_index(site):
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n'
+    )
+    for name in SECTIONS:
+        for start in get_shard_starts(name):
+            location = reverse('blog:sitemap_section', args=(name, start))
+            yield f'<sitemap><loc>{escape(site + location)}</loc></sitemap>\n'
+    yield '</sitemapindex>\n'
+
+
+def render_shard(site, name, start):
+    """Часть карты сайта, которая выдаётся по мере чтения строк."""
+    section = SECTIONS[name]()
+    rows = section.shard(start, next_shard_start(name, start))
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<urlset xmlns="{SITEMAP_NAMESPACE}">\n'
+    )
+    for row in rows:
+        url = f'<url><loc>{escape(site + section.location(row))}</loc>'
+        lastmod = section.lastmod(row)
+        if lastmod is not None:
+            url += f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+        yield url + '</url>\n'
+    yield '</urlset>\n'
@@ -0,0 +1,73 @@
+import re
+
+from django.core.exceptions import ValidationError
+from django.utils.text import slugify
+
+from constants import Constants
+from .cache import index_urls, invalidate_urls
+from .models import PostTag, Tag
+from .signals import listed_posts
+
+TAG_SEPARATOR_RE = re.compile(r'[,#]')
+
+
+def parse_tags(value):
+    """Разбирает строку «тег, #тег» в список уникальных названий."""
+    names = {}
+    for name in TAG_SEPARATOR_RE.split(value or ''):
+        name = ' '.join(name.split())[:Constants.TAG_MAX_LENGTH]
+        slug = slugify(name, allow_unicode=True)
+        if slug and slug not in names:
+            names[slug] = name
+    if len(names) > Constants.TAG_MAX_PER_POST:
+        raise ValidationError(
+            f'Не больше {Constants.TAG_MAX_PER_POST} тегов на пост.'
+        )
+    return names
+
+
+def get_or_create_tags(names):
+    """Теги по словарю {slug: название}: два-три запроса на весь набор."""
+    if not names:
+        return []
+    Tag.objects.bulk_create(
+        [Tag(slug=slug, name=name) for slug, name in names.items()],
+        ignore_conflicts=True,
+    )
+    return list(Tag.objects.filter(slug__in=names))
+
+
+def set_post_tags(post, names):
+    """Заменяет теги поста. Счётчики тегов обновляет сигнал m2m_changed."""
+    post.tags.set(get_or_create_tags(names))
+
+
+def add_tags_to_posts(items):
+    """Ставит теги новым постам: [(пост, {slug: название})].
+
+    Теги создаются одним набором запросов, связи — одним bulk_create,
+    счётчики видимых постов меняются одним `change_counts` на пачку.
+    """
+    tags = {
+        tag.slug: tag
+        for tag in get_or_create_tags({
+            slug: name for _, names in items for slug, name in names.items()
+        })
+    }
+    PostTag.objects.bulk_create(
+        [
+            PostTag(post=post, tag=tags[slug])
+            for post, names in items
+            for slug in names
+        ],
+        batch_size=Constants.BULK_BATCH_SIZE,
+    )
+    listed = {post.pk for post in listed_posts([post for post, _ in items])}
+    counts = {}
+    for post, names in items:
+        if post.pk in listed:
+            for slug in names:
+                counts[tags[slug].pk] = counts.get(tags[slug].pk, 0) + 1
+    Tag.objects.change_counts(counts)
+    if counts:
+        invalidate_urls(index_urls())
@@ -0,0 +1,22 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from blog.cache import make_hole
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def punch_hole(context, template_name, **params):
+    """Выводит пользовательский фрагмент страницы.
+
+    Если страница рендерится для общего кеша, вместо фрагмента выводится
+    метка, которую `HolePunchedPageCacheMiddleware` заменяет на фрагмент
+    текущего пользователя. Иначе фрагмент рендерится сразу, как `include`.
+    """
+    request = context.get('request')
+    if getattr(request, 'punch_holes', False):
+        return mark_safe(make_hole(template_name, params))
+    fragment = context.template.engine.get_template(template_name)
+    with context.push(**params):
+        return fragment.render(context)
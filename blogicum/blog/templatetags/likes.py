@@ -0,0 +1,68 @@
+from django import template
+from django.db.models import Exists, OuterRef, Value
+
+from blog.counters import comment_likes, post_likes
+from blog.models import Comment, CommentLike, Post, PostLike
+
+register = template.Library()
+
+
+def load_likes(request, queryset, like_model, field, counter):
+    """{id: {'count', 'liked'}} для объектов queryset: один запрос
+    за сохранёнными числами и отметками пользователя, один get_many
+    за приращениями из кеша.
+    """
+    if request.user.is_authenticated:
+        liked = Exists(like_model.objects.filter(
+            user=request.user, **{field: OuterRef('pk')}
+        ))
+    else:
+        liked = Value(False)
+    rows = list(
+        queryset.annotate(liked=liked).values_list('pk', 'likes', 'liked')
+    )
+    pending = counter.pending_many([pk for pk, _, _ in rows])
+    return {
+        pk: {'count': max(likes + pending[pk], 0), 'liked': bool(is_liked)}
+        for pk, likes, is_liked in rows
+    }
+
+
+def get_post_likes(request, post_id):
+    """Лайки поста для текущего запроса: фрагмент может выводиться
+    на странице несколько раз, запрос выполняется один.
+    """
+    cache = request.__dict__.setdefault('_post_likes', {})
+    if post_id not in cache:
+        cache.update(load_likes(
+            request, Post.objects.filter(pk=post_id), PostLike, 'post',
+            post_likes,
+        ))
+        cache.setdefault(post_id, {'count': 0, 'liked': False})
+    return cache[post_id]
+
+
+@register.simple_tag(takes_context=True)
+def post_like(context, post_id):
+    """Число лайков поста и отметка, лайкнул ли его пользователь."""
+    return get_post_likes(context['request'], post_id)
+
+
+def get_post_comment_likes(request, post_id):
+    """Лайки комментариев поста для текущего запроса: один запрос
+    на все комментарии страницы, а не по два на каждый.
+    """
+    cache = request.__dict__.setdefault('_comment_likes', {})
+    if post_id not in cache:
+        cache[post_id] = load_likes(
+            request, Comment.objects.filter(post_id=post_id), CommentLike,
+            'comment', comment_likes,
+        )
+    return cache[post_id]
+
+
+@register.simple_tag(takes_context=True)
+def comment_like(context, post_id, comment_id):
+    return get_post_comment_likes(context['request'], post_id).get(
+        comment_id, {'count': 0, 'liked': False}
+    )
@@ -0,0 +1,11 @@
+from django import template
+
+from blog import mentions as mentions_module
+
+register = template.Library()
+
+
+@register.filter
+def mentions(text, resolved):
+    """`{{ comment.text|mentions:comment.mentions|linebreaksbr }}`"""
+    return mentions_module.render_mentions(text, resolved)
@@ -0,0 +1,11 @@
+from django import template
+
+from blog.notifications import unread_count
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def unread_notifications(context):
+    user = context['user']
+    return unread_count(user) if user.is_authenticated else 0
@@ -0,0 +1,15 @@
+from django import template
+
+from blog.counters import post_views
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_view_count(post_id):
+    """Число просмотров поста вместе с ещё не перенесёнными в БД.
+
+    Просмотр учитывает `DetailPostView`, в том числе когда страница
+    отдаётся из общего кеша.
+    """
+    return post_views.total(post_id)
@@ -0,0 +1,39 @@
+from django import template
+
+from blog.read_markers import (
+    is_new_comment,
+    load_read_markers,
+    new_comment_count,
+)
+
+register = template.Library()
+
+
+@register.filter
+def post_ids(posts):
+    return [post.pk for post in posts]
+
+
+@register.simple_tag(takes_context=True)
+def prefetch_read_markers(context, post_ids):
+    """Выбирает отметки всех постов страницы одним запросом."""
+    load_read_markers(context['request'], post_ids)
+    return ''
+
+
+@register.simple_tag(takes_context=True)
+def new_comment(context, post_id, comment_id, author_id):
+    request = context['request']
+    return (
+        request.user.is_authenticated
+        and request.user.pk != author_id
+        and is_new_comment(request, post_id, comment_id)
+    )
+
+
+@register.simple_tag(takes_context=True)
+def new_comments(context, post_id, comment_count):
+    request = context['request']
+    if not request.user.is_authenticated:
+        return 0
+    return new_comment_count(request, post_id, comment_count)
@@ -0,0 +1,90 @@
+import math
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.http import HttpResponse
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    """'5/m' -> (5, 60): ёмкость корзины и период её полного пополнения."""
+    number, period = rate.split('/')
+    return int(number), PERIODS[period[0]]
+
+
+class TokenBucket:
+    """Корзина токенов в кеше по алгоритму GCRA.
+
+    В кеше хранится одно число — теоретическое время прихода следующего
+    запроса (TAT) в миллисекундах. Каждый запрос атомарно увеличивает его
+    на интервал между токенами через `cache.incr`; запрос разрешён, пока
+    TAT опережает текущее время не больше чем на ёмкость корзины.
+    В БД ничего не пишется.
+    """
+
+    def __init__(self, key, rate):
+        capacity, period = parse_rate(rate)
+        self.key = key
+        self.interval = period * 1000 // capacity
+        self.burst = capacity * self.interval
+        self.timeout = period + 1
+
+    def consume(self):
+        """Берёт токен. Возвращает 0 или число секунд до следующего."""
+        now = int(time.time() * 1000)
+        cache.add(self.key, now, self.timeout)
+        try:
+            tat = cache.incr(self.key, self.interval)
+        except ValueError:
+            # Ключ истёк между add и incr.
+            cache.add(self.key, now + self.interval, self.timeout)
+            return 0
+        if tat - self.interval < now:
+            # Корзина простаивала и полностью наполнилась.
+            cache.set(self.key, now + self.interval, self.timeout)
+            return 0
+        if tat - now > self.burst:
+            cache.decr(self.key, self.interval)
+            return math.ceil((tat - self.burst - now) / 1000)
+        cache.touch(self.key, self.timeout)
+        return 0
+
+
+def get_client_ip(request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def throttle(user=None, ip=None, methods=('POST',)):
+    """Ограничивает частоту запросов к представлению.
+
+    `user` и `ip` — лимиты вида '5/m' на пользователя и на IP-адрес.
+    Проверка выполняется до вызова представления, то есть до валидации
+    формы и обращений к БД; при превышении возвращается 429.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if request.method in methods:
+                scope = f'throttle:{request.resolver_match.view_name}'
+                buckets = []
+                if ip:
+                    buckets.append((f'ip:{get_client_ip(request)}', ip))
+                if user and request.user.is_authenticated:
+                    buckets.append((f'user:{request.user.pk}', user))
+                for ident, rate in buckets:
+                    retry_after = TokenBucket(
+                        f'{scope}:{ident}', rate
+                    ).consume()
+                    if retry_after:
+                        response = HttpResponse(
+                            'Слишком много запросов, попробуйте позже.',
+                            status=429,
+                            content_type='text/plain; charset=utf-8',
+                        )
+                        response['Retry-After'] = str(retry_after)
+                        return response
+            return view(request, *args, **kwargs)
+        return wrapped
+    return decorator
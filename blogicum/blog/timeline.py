@@ -0,0 +1,178 @@
+"""Персональные ленты подписчиков.
+
+Посты обычных авторов раздаются в ленты подписчиков при записи
+(`fanout_timelines` читает журнал изменений), а посты авторов с большим
+числом подписчиков подмешиваются при чтении: раздавать их в сотни тысяч
+лент дороже, чем выбрать их по индексу автора.
+"""
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from constants import Constants
+from .bulk import iterate_batches
+from .models import ChangeLog, Follow, Post, TimelineEntry, Watermark
+
+TIMELINE_FANOUT = 'timeline_fanout'
+CURSOR_SEPARATOR = '~'
+
+
+def is_large_author(followers):
+    return (followers or 0) >= Constants.TIMELINE_FANOUT_MAX_FOLLOWERS
+
+
+def fanout_post(post):
+    """Раздаёт пост (строку values) в ленты подписчиков автора."""
+    TimelineEntry.objects.filter(post_id=post['pk']).exclude(
+        pub_date=post['pub_date']
+    ).update(pub_date=post['pub_date'])
+    followers = Follow.objects.filter(author_id=post['author_id'])
+    for batch in iterate_batches(followers, ('pk', 'follower_id')):
+        TimelineEntry.objects.bulk_create(
+            [
+                TimelineEntry(
+                    user_id=row['follower_id'],
+                    post_id=post['pk'],
+                    author_id=post['author_id'],
+                    pub_date=post['pub_date'],
+                )
+                for row in batch
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def fanout_posts(post_ids):
+    """Приводит ленты в соответствие с текущим состоянием постов."""
+    posts = Post.objects.filter(pk__in=post_ids).values(
+        'pk',
+        'author_id',
+        'pub_date',
+        'is_published',
+        'category__is_published',
+        'author__stats__followers',
+    )
+    fanned_out = set()
+    for post in posts:
+        if (
+            post['is_published']
+            and post['category__is_published']
+            and not is_large_author(post['author__stats__followers'])
+        ):
+            fanout_post(post)
+            fanned_out.add(post['pk'])
+    TimelineEntry.objects.filter(
+        post_id__in=set(post_ids) - fanned_out
+    ).delete()
+
+
+def process_changes():
+    """Обрабатывает страницу журнала изменений после отметки.
+
+    Возвращает число обработанных записей журнала.
+    """
+    with transaction.atomic():
+        watermark, _ = Watermark.objects.select_for_update(
+        ).get_or_create(name=TIMELINE_FANOUT)
+        changes = list(
+            ChangeLog.objects.filter(pk__gt=watermark.last_id).order_by(
+                'pk'
+            ).values_list('pk', 'content', 'object_id')[
+                :Constants.CHANGELOG_PAGE_SIZE
+            ]
+        )
+        if not changes:
+            return 0
+        fanout_posts({
+            object_id for _, content, object_id in changes
+            if content == ChangeLog.POST
+        })
+        watermark.last_id = changes[-1][0]
+        watermark.save(update_fields=('last_id', 'updated_at'))
+    return len(changes)
+
+
+def backfill(follower_id, author_id, followers):
+    """Добавляет в ленту нового подписчика последние посты автора."""
+    if is_large_author(followers):
+        return
+    posts = Post.published_posts.filter(author_id=author_id).values_list(
+        'pk', 'pub_date'
+    )[:Constants.TIMELINE_BACKFILL]
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(
+                user_id=follower_id,
+                post_id=post_id,
+                author_id=author_id,
+                pub_date=pub_date,
+            )
+            for post_id, pub_date in posts
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def encode_cursor(pub_date, post_id):
+    return f'{pub_date.isoformat()}{CURSOR_SEPARATOR}{post_id}'
+
+
+def decode_cursor(cursor):
+    """Возвращает (pub_date, post_id) или None для некорректного курсора."""
+    pub_date, _, post_id = (cursor or '').partition(CURSOR_SEPARATOR)
+    try:
+        pub_date = parse_datetime(pub_date)
+        post_id = int(post_id)
+    except ValueError:
+        return None
+    if pub_date is None:
+        return None
+    return pub_date, post_id
+
+
+def before_cursor(cursor, date_field, id_field):
+    pub_date, post_id = cursor
+    return models.Q(**{f'{date_field}__lt': pub_date}) | models.Q(**{
+        date_field: pub_date, f'{id_field}__lt': post_id
+    })
+
+
+def read_timeline(user, cursor=None, size=None):
+    """Страница ленты: (посты, ключ (pub_date, id) последнего поста,
+    если есть следующая страница, иначе None).
+
+    Строки ленты и посты крупных авторов выбираются диапазонами
+    по индексам и сливаются по (pub_date, id).
+    """
+    size = size or Constants.MAX_COUNT_POSTS
+    entries = TimelineEntry.objects.filter(
+        user=user, pub_date__lte=timezone.now()
+    )
+    if cursor is not None:
+        entries = entries.filter(before_cursor(cursor, 'pub_date', 'post_id'))
+    keys = set(entries.order_by('-pub_date', '-post_id').values_list(
+        'pub_date', 'post_id'
+    )[:size + 1])
+
+    large_authors = Follow.objects.filter(
+        follower=user,
+        author__stats__followers__gte=Constants.TIMELINE_FANOUT_MAX_FOLLOWERS,
+    ).values_list('author_id', flat=True)
+    large_posts = Post.published_posts.filter(author_id__in=large_authors)
+    if cursor is not None:
+        large_posts = large_posts.filter(
+            before_cursor(cursor, 'pub_date', 'pk')
+        )
+    keys.update(large_posts.order_by('-pub_date', '-pk').values_list(
+        'pub_date', 'pk'
+    )[:size + 1])
+
+    keys = sorted(keys, reverse=True)
+    page = keys[:size]
+    posts = Post.published_posts.add_count().in_bulk(
+        [post_id for _, post_id in page]
+    )
+    return (
+        [posts[post_id] for _, post_id in page if post_id in posts],
+        page[-1] if len(keys) > size else None,
+    )
@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from constants import Constants
+from .models import TrendingPost, TrendingState
+
+EPOCH_CACHE_KEY = 'trending:epoch'
+
+
+def get_epoch():
+    epoch = cache.get(EPOCH_CACHE_KEY)
+    if epoch is None:
+        state, _ = TrendingState.objects.get_or_create(
+            pk=1, defaults={'epoch': timezone.now()}
+        )
+        epoch = state.epoch
+        cache.set(EPOCH_CACHE_KEY, epoch, None)
+    return epoch
+
+
+def decay_factor(since, until):
+    """Во сколько раз вес события в момент `until` больше, чем в `since`."""
+    return 2 ** (
+        (until - since).total_seconds() / Constants.TRENDING_HALF_LIFE
+    )
+
+
+def event_factor():
+    return decay_factor(get_epoch(), timezone.now())
+
+
+def rebase():
+    """Переносит точку отсчёта на текущий момент.
+
+    Рейтинги делятся на один и тот же множитель, поэтому их порядок
+    не меняется, а числа не растут без предела. Посты, рейтинг которых
+    остыл ниже порога, удаляются из таблицы. Возвращает число
+    удалённых строк.
+    """
+    with transaction.atomic():
+        state, _ = TrendingState.objects.select_for_update().get_or_create(
+            pk=1, defaults={'epoch': timezone.now()}
+        )
+        now = timezone.now()
+        TrendingPost.objects.update(
+            score=F('score') / decay_factor(state.epoch, now)
+        )
+        deleted, _ = TrendingPost.objects.filter(
+            score__lt=Constants.TRENDING_MIN_SCORE
+        ).delete()
+        state.epoch = now
+        state.save()
+        transaction.on_commit(lambda: cache.set(EPOCH_CACHE_KEY, now, None))
+    return deleted
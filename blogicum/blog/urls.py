@@ -1,6 +1,9 @@
 from django.urls import path
+from django.views.decorators.cache import cache_control
 
+from constants import Constants
 from . import views
+from .throttling import throttle
 
 
 app_name = 'blog'
@@ -16,11 +19,51 @@ urlpatterns = [
         views.CategoryPostsListView.as_view(),
         name='category_posts'
     ),
+    path(
+        'archive/<int:year>/<int:month>/',
+        views.ArchiveMonthView.as_view(),
+        name='archive'
+    ),
+    path(
+        'trending/',
+        views.TrendingListView.as_view(),
+        name='trending'
+    ),
+    path(
+        'tag/<str:tag_slug>/',
+        views.TagPostsListView.as_view(),
+        name='tag_posts'
+    ),
     path(
         'profile/<str:username>/',
         views.ProfileListView.as_view(),
         name='profile'
     ),
+    path(
+        'profile/<str:username>/follow/',
+        views.FollowView.as_view(),
+        name='follow'
+    ),
+    path(
+        'profile/<str:username>/unfollow/',
+        views.FollowView.as_view(follow=False),
+        name='unfollow'
+    ),
+    path(
+        'notifications/',
+        views.NotificationListView.as_view(),
+        name='notifications'
+    ),
+    path(
+        'notifications/read/',
+        views.MarkNotificationsReadView.as_view(),
+        name='mark_notifications_read'
+    ),
+    path(
+        'feed/',
+        views.TimelineView.as_view(),
+        name='timeline'
+    ),
     path('edit_profile/',
          views.UpdateProfileView.as_view(),
          name='edit_profile'),
@@ -31,7 +74,7 @@ urlpatterns = [
     ),
     path(
         'posts/create/',
-        views.CreatePostView.as_view(),
+        throttle(user='10/h', ip='30/h')(views.CreatePostView.as_view()),
         name='create_post'
     ),
     path(
@@ -46,9 +89,31 @@ urlpatterns = [
     ),
     path(
         '<int:post_id>/comment/',
-        views.CreateCommentView.as_view(),
+        throttle(user='5/m', ip='20/m')(views.CreateCommentView.as_view()),
         name='add_comment'
     ),
+    path(
+        'posts/<int:post_id>/like/',
+        throttle(user='60/m')(views.LikePostView.as_view()),
+        name='like_post'
+    ),
+    path(
+        'posts/<int:post_id>/unlike/',
+        throttle(user='60/m')(views.LikePostView.as_view(liked=False)),
+        name='unlike_post'
+    ),
+    path(
+        'posts/<int:post_id>/like_comment/<int:comment_id>/',
+        throttle(user='60/m')(views.LikeCommentView.as_view()),
+        name='like_comment'
+    ),
+    path(
+        'posts/<int:post_id>/unlike_comment/<int:comment_id>/',
+        throttle(user='60/m')(
+            views.LikeCommentView.as_view(liked=False)
+        ),
+        name='unlike_comment'
+    ),
     path(
         'posts/<int:post_id>/edit_comment/<int:comment_id>/',
         views.UpdateCommentView.as_view(),
@@ -59,4 +124,18 @@ urlpatterns = [
         views.DeleteCommentView.as_view(),
         name='delete_comment'
     ),
+    path(
+        'sitemap.xml',
+        cache_control(max_age=Constants.SITEMAP_CACHE_TIMEOUT)(
+            views.SitemapIndexView.as_view()
+        ),
+        name='sitemap'
+    ),
+    path(
+        'sitemap-<slug:section>-<int:start>.xml',
+        cache_control(max_age=Constants.SITEMAP_CACHE_TIMEOUT)(
+            views.SitemapSectionView.as_view()
+        ),
+        name='sitemap_section'
+    ),
 ]
@@ -1,12 +1,15 @@
-from django.db import models
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models import Q
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.views.generic import (
+    View,
     ListView,
+    TemplateView,
     UpdateView,
     DeleteView,
     DetailView,
@@ -14,27 +17,121 @@ from django.views.generic import (
 
 from constants import Constants
 from .forms import PostForm, CommentForm, UserForm
-from .models import Post, Category
+from .counters import post_views
+from .likes import set_comment_like, set_post_like
+from .managers import month_range
+from .models import (
+    Category,
+    Comment,
+    Follow,
+    Notification,
+    Post,
+    PostArchive,
+    Tag,
+)
+from .moderation import hold, screen
+from .notifications import mark_all_read
+from .read_markers import mark_post_read, mark_read
+from .related import related_posts
 from .mixins import (
     CommentMixin,
     CommentSuccessUrlMixin,
     OnlyAuthorMixin,
     PostFormMixin,
-    PostMixin
+    PostMixin,
+    SharedPageCacheMixin
 )
+from .sitemaps import SECTIONS, render_index, render_shard
+from .timeline import decode_cursor, encode_cursor, read_timeline
 
 User = get_user_model()
 
 
-class IndexListView(ListView):
+class IndexListView(SharedPageCacheMixin, ListView):
     """Главная страница со списком постов."""
 
     template_name = 'blog/index.html'
     paginate_by = Constants.MAX_COUNT_POSTS
     queryset = Post.published_posts.add_count().all()
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['tag_cloud'] = Tag.objects.cloud()
+        context['archive_months'] = PostArchive.objects.histogram()
+        return context
+
+
+class ArchiveMonthView(ListView):
+    """Посты, опубликованные в выбранном месяце."""
+
+    template_name = 'blog/archive.html'
+    paginate_by = Constants.MAX_COUNT_POSTS
+
+    @cached_property
+    def month_bounds(self):
+        # Месяц 13 или год за пределами datetime (например, 9999/12,
+        # у которого нет следующего месяца) — 404, а не ошибка сервера.
+        try:
+            return month_range(self.kwargs['year'], self.kwargs['month'])
+        except (ValueError, OverflowError):
+            raise Http404
+
+    @property
+    def month_start(self):
+        return self.month_bounds[0]
+
+    @property
+    def month_end(self):
+        return self.month_bounds[1]
+
+    def get_queryset(self):
+        # Диапазон по индексу pub_date, без выражений над датой.
+        return Post.published_posts.add_count().filter(
+            pub_date__gte=self.month_start,
+            pub_date__lt=self.month_end,
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['month'] = self.month_start
+        context['archive_months'] = PostArchive.objects.histogram()
+        return context
+
+
+class TrendingListView(SharedPageCacheMixin, ListView):
+    """Популярные посты по затухающему рейтингу (см. `TrendingPost`)."""
+
+    template_name = 'blog/trending.html'
+    paginate_by = Constants.MAX_COUNT_POSTS
+
+    def get_queryset(self):
+        return Post.published_posts.add_count().filter(
+            trending__isnull=False
+        ).order_by('-trending__score')[:Constants.TRENDING_SIZE]
+
+
+class TagPostsListView(ListView):
+    """Страница со списком постов с выбранным тегом."""
+
+    template_name = 'blog/tag.html'
+    paginate_by = Constants.MAX_COUNT_POSTS
+
+    @cached_property
+    def tag(self):
+        return get_object_or_404(Tag, slug=self.kwargs['tag_slug'])
+
+    def get_queryset(self):
+        return Post.published_posts.add_count().filter(
+            post_tags__tag=self.tag
+        )
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['tag'] = self.tag
+        return context
 
-class CategoryPostsListView(ListView):
+
+class CategoryPostsListView(SharedPageCacheMixin, ListView):
     """Страница со списком постов выбранной категории."""
 
     template_name = 'blog/category.html'
@@ -58,12 +155,30 @@ class CategoryPostsListView(ListView):
         return context
 
 
-class DetailPostView(LoginRequiredMixin, DetailView):
+class DetailPostView(SharedPageCacheMixin, LoginRequiredMixin, DetailView):
     """Страница выбранного поста."""
 
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
+    @classmethod
+    def shared_page_served(cls, request, post_id):
+        post_views.record(post_id)
+        mark_post_read(request, post_id)
+
+    def get(self, request, *args, **kwargs):
+        # Ответ ещё не отрисован: фрагменты страницы увидят отметку
+        # прочтения, прочитанную до сдвига.
+        response = super().get(request, *args, **kwargs)
+        post_views.record(self.object.pk)
+        mark_read(
+            request,
+            self.object.pk,
+            response.context_data['last_comment_id'],
+            response.context_data['post'].comment_count,
+        )
+        return response
+
     def get_object(self, queryset=None):
         post_id = self.kwargs.get(self.pk_url_kwarg)
         return (
@@ -79,11 +194,26 @@ class DetailPostView(LoginRequiredMixin, DetailView):
             )
         )
 
+    def is_shared_page(self):
+        return (
+            self.object.is_published
+            and self.object.category is not None
+            and self.object.category.is_published
+            and self.object.pub_date <= timezone.now()
+        )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['post'] = self.get_object()
         context['form'] = CommentForm()
-        context['comments'] = self.get_object().comments.all()
+        context['comments'] = self.get_object().comments.filter(
+            is_published=True
+        )
+        # Отметка прочтения сдвигается на последний выведенный комментарий.
+        context['last_comment_id'] = max(
+            (comment.pk for comment in context['comments']), default=0
+        )
+        context['related_posts'] = related_posts(context['post'])
         return context
 
 
@@ -143,7 +273,10 @@ class CreateCommentView(CommentSuccessUrlMixin, CreateView):
     def form_valid(self, form):
         form.instance.author = self.request.user
         form.instance.post = self.get_object()
-        return super().form_valid(form)
+        spam_score = screen(form.instance)
+        response = super().form_valid(form)
+        hold([self.object], [spam_score])
+        return response
 
 
 class UpdateCommentView(CommentMixin, CommentSuccessUrlMixin, UpdateView):
@@ -151,6 +284,12 @@ class UpdateCommentView(CommentMixin, CommentSuccessUrlMixin, UpdateView):
 
     form_class = CommentForm
 
+    def form_valid(self, form):
+        spam_score = screen(form.instance)
+        response = super().form_valid(form)
+        hold([self.object], [spam_score])
+        return response
+
 
 class DeleteCommentView(CommentMixin, CommentSuccessUrlMixin, DeleteView):
     """Удаление комментария."""
@@ -158,33 +297,138 @@ class DeleteCommentView(CommentMixin, CommentSuccessUrlMixin, DeleteView):
     pass
 
 
-class ProfileListView(ListView):
+class ProfileListView(SharedPageCacheMixin, ListView):
     """Страница со списком постов пользователя."""
 
     template_name = 'blog/profile.html'
     paginate_by = Constants.MAX_COUNT_POSTS
 
-    def get_profile(self):
+    @classmethod
+    def is_shared_request(cls, request, **kwargs):
+        # Владелец видит на своей странице ещё и неопубликованные посты.
+        return request.user.username != kwargs['username']
+
+    @cached_property
+    def profile(self):
         return get_object_or_404(
-            User,
+            User.objects.select_related('stats'),
             username=self.kwargs['username']
         )
 
     def get_queryset(self):
-        if self.request.user == self.get_profile():
+        if self.request.user == self.profile:
             return Post.objects.filter(
-                author=self.get_profile()
-            ).annotate(
-                comment_count=models.Count('comments')
+                author=self.profile
+            ).select_related(
+                'author', 'location', 'category'
             ).order_by('-pub_date')
         else:
             return Post.published_posts.add_count().filter(
-                author=self.get_profile()
+                author=self.profile
             )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['profile'] = self.get_profile()
+        context['profile'] = self.profile
+        return context
+
+
+class FollowView(LoginRequiredMixin, View):
+    """Подписка на автора и отписка; повторный запрос ничего не меняет."""
+
+    follow = True
+
+    def post(self, request, username):
+        author = get_object_or_404(User, username=username)
+        if author != request.user:
+            if self.follow:
+                Follow.objects.get_or_create(
+                    follower=request.user, author=author
+                )
+            else:
+                for follow in Follow.objects.filter(
+                    follower=request.user, author=author
+                ):
+                    follow.delete()
+        return redirect('blog:profile', username=username)
+
+
+def visible_post(user, prefix=''):
+    """Условие на пост, который видит пользователь: опубликованный
+    или его собственный. `prefix` — путь к посту, например 'post__'.
+    """
+    return Q(**{f'{prefix}author': user}) | Q(**{
+        f'{prefix}is_published': True,
+        f'{prefix}category__is_published': True,
+        f'{prefix}pub_date__lte': timezone.now(),
+    })
+
+
+class LikePostView(LoginRequiredMixin, View):
+    """Лайк поста и его снятие; повторный запрос ничего не меняет."""
+
+    liked = True
+
+    def post(self, request, post_id):
+        post = get_object_or_404(
+            Post.objects.filter(visible_post(request.user)), pk=post_id
+        )
+        set_post_like(request.user, post.pk, self.liked)
+        return redirect('blog:post_detail', post_id=post.pk)
+
+
+class LikeCommentView(LoginRequiredMixin, View):
+    """Лайк комментария и его снятие."""
+
+    liked = True
+
+    def post(self, request, post_id, comment_id):
+        comment = get_object_or_404(
+            Comment.objects.filter(
+                visible_post(request.user, 'post__'), is_published=True
+            ),
+            pk=comment_id,
+            post_id=post_id,
+        )
+        set_comment_like(request.user, comment.pk, self.liked)
+        return redirect(
+            reverse('blog:post_detail', args=(post_id,))
+            + f'#comment_{comment.pk}'
+        )
+
+
+class NotificationListView(LoginRequiredMixin, ListView):
+    """Уведомления пользователя, непрочитанные — первыми."""
+
+    template_name = 'blog/notifications.html'
+    paginate_by = Constants.NOTIFICATIONS_PER_PAGE
+
+    def get_queryset(self):
+        return Notification.objects.filter(
+            recipient=self.request.user
+        ).select_related('actor', 'post').order_by('-unread', '-created_at')
+
+
+class MarkNotificationsReadView(LoginRequiredMixin, View):
+    def post(self, request):
+        mark_all_read(request.user)
+        return redirect('blog:notifications')
+
+
+class TimelineView(LoginRequiredMixin, TemplateView):
+    """Лента постов авторов, на которых подписан пользователь."""
+
+    template_name = 'blog/timeline.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        cursor = self.request.GET.get('before')
+        if cursor is not None:
+            cursor = decode_cursor(cursor)
+            if cursor is None:
+                raise Http404
+        context['posts'], last = read_timeline(self.request.user, cursor)
+        context['next_cursor'] = encode_cursor(*last) if last else None
         return context
 
 
@@ -202,3 +446,27 @@ class UpdateProfileView(LoginRequiredMixin, UpdateView):
         return reverse_lazy(
             'blog:profile', kwargs={'username': self.request.user.username}
         )
+
+
+class SitemapIndexView(View):
+    """Индекс карты сайта со ссылками на все её части."""
+
+    def get(self, request):
+        return HttpResponse(
+            ''.join(render_index(request.build_absolute_uri('/')[:-1])),
+            content_type='application/xml',
+        )
+
+
+class SitemapSectionView(View):
+    """Часть карты сайта, отдаваемая потоком."""
+
+    def get(self, request, section, start):
+        if section not in SECTIONS:
+            raise Http404
+        return StreamingHttpResponse(
+            render_shard(
+                request.build_absolute_uri('/')[:-1], section, start
+            ),
+            content_type='application/xml',
+        )
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 
@@ -22,14 +23,19 @@ INSTALLED_APPS = [
     'django_bootstrap5',
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
+    'api.apps.ApiConfig',
+    'outbox.apps.OutboxConfig',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blog.middleware.AnonymousPageCacheMiddleware',
+    'blog.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blog.middleware.HolePunchedPageCacheMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -66,6 +72,20 @@ DATABASES = {
     }
 }
 
+# Кеш общий для веб-процессов и команд manage.py: в нём лежат страницы,
+# буферизованные счётчики, корзины ограничения частоты запросов, эпоха
+# рейтинга и версия фильтра спама. Счётчики и ограничение частоты
+# требуют атомарного incr, поэтому нужен Memcached (или Redis).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': os.getenv('MEMCACHED_LOCATION', '127.0.0.1:11211'),
+    }
+}
+
+# Полностраничный кеш лент (см. blog.middleware):
+PAGE_CACHE_ENABLED = True
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -107,3 +127,6 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 CSRF_FAILURE_VIEW = "pages.views.csrf_failure"
+
+# Адрес сайта для ссылок в письмах, которые отправляются вне запроса:
+SITE_URL = 'http://127.0.0.1:8000'
@@ -1,15 +1,23 @@
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.views import PasswordResetView
 from django.urls import include, path, reverse_lazy
 from django.views.generic import CreateView
 from django.conf import settings
 from django.conf.urls.static import static
 
+from outbox.forms import OutboxPasswordResetForm
+
 handler403 = 'pages.views.csrf_failure'
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.internal_server_error'
 
 auth_urls = [
+    path(
+        'password_reset/',
+        PasswordResetView.as_view(form_class=OutboxPasswordResetForm),
+        name='password_reset'
+    ),
     path('', include('django.contrib.auth.urls')),
     path(
         'registration/',
@@ -25,6 +33,7 @@ auth_urls = [
 urlpatterns = [
     path('', include('blog.urls', namespace='blog')),
     path('pages/', include('pages.urls', namespace='pages')),
+    path('api/v1/', include('api.urls', namespace='api')),
     path('admin/', admin.site.urls),
     path('auth/', include(auth_urls)),
 
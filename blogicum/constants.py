@@ -2,3 +2,59 @@ class Constants:
     MAX_LENGTH_TEXT: int = 256
     NUM_DISPLAYED_POSTS = 5
     MAX_COUNT_POSTS = 10
+    COMPRESSION_MIN_LENGTH = 200
+    GZIP_LEVEL = 6
+    BROTLI_QUALITY = 5
+    PAGE_CACHE_TIMEOUT = 60 * 5
+    PAGE_CACHE_INVALIDATE_PAGES = 5
+    PAGE_CACHE_VIEW_NAMES = (
+        'blog:index',
+        'blog:trending',
+        'blog:category_posts',
+        'blog:profile',
+    )
+    ADMIN_EXACT_COUNT_LIMIT = 10000
+    ADMIN_LIST_PER_PAGE = 50
+    BULK_BATCH_SIZE = 500
+    API_PAGE_SIZE = 20
+    API_MAX_PAGE_SIZE = 100
+    API_BATCH_MAX_ITEMS = 5000
+    CHANGELOG_PAGE_SIZE = 1000
+    CHANGELOG_RETENTION_DAYS = 30
+    OUTBOX_BATCH_SIZE = 100
+    OUTBOX_MAX_ATTEMPTS = 5
+    OUTBOX_RETRY_DELAY = 60
+    OUTBOX_LEASE = 5 * 60
+    COMMENT_DIGEST_MAX_POSTS = 10
+    SITEMAP_SHARD_SIZE = 50000
+    SITEMAP_CACHE_TIMEOUT = 60 * 60
+    TAG_MAX_LENGTH = 64
+    TAG_MAX_PER_POST = 10
+    TAG_CLOUD_SIZE = 30
+    COUNTER_TIMEOUT = 60 * 60 * 24
+    TRENDING_HALF_LIFE = 60 * 60 * 6
+    TRENDING_MIN_SCORE = 0.05
+    TRENDING_COMMENT_WEIGHT = 3
+    TRENDING_VIEW_WEIGHT = 1
+    TRENDING_SIZE = 100
+    TIMELINE_FANOUT_MAX_FOLLOWERS = 10000
+    TIMELINE_BACKFILL = 20
+    NOTIFICATION_COUNT_TIMEOUT = 60 * 60 * 24
+    NOTIFICATIONS_PER_PAGE = 20
+    MAX_MENTIONS = 20
+    SCHEDULED_MENTIONS_LOOKBACK = 60 * 60 * 24
+    RELATED_FEATURES = 2 ** 14
+    RELATED_BATCH_SIZE = 512
+    RELATED_NEIGHBOURS = 10
+    RELATED_POSTS = 5
+    RELATED_MIN_SCORE = 0.05
+    RELATED_INDEX_TERMS = 20
+    MINHASH_PERMUTATIONS = 64
+    MINHASH_BANDS = 16
+    SHINGLE_SIZE = 3
+    DUPLICATE_SIMILARITY = 0.7
+    DUPLICATE_SCAN_CHUNK = 1000
+    SPAM_FEATURES = 2 ** 16
+    SPAM_THRESHOLD = 0.9
+    SPAM_RESCORE_BATCH = 1000
+    SPAM_FILTER_CHECK_TIMEOUT = 60
@@ -0,0 +1,27 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = (
+        'subject',
+        'to',
+        'created_at',
+        'send_after',
+        'attempts',
+        'sent_at',
+        'failed',
+    )
+    list_filter = ('failed', 'sent_at')
+    readonly_fields = ('created_at', 'sent_at', 'attempts', 'last_error')
+    actions = ('retry',)
+
+    @admin.action(description='Отправить повторно')
+    def retry(self, request, queryset):
+        updated = queryset.filter(sent_at__isnull=True).update(
+            failed=False, attempts=0, send_after=timezone.now()
+        )
+        self.message_user(request, f'Поставлено в очередь: {updated}.')
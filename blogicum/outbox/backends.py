@@ -0,0 +1,20 @@
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .models import OutboxMessage
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """Почтовый бэкенд, который складывает письма в исходящие.
+
+    Письма сохраняются одним bulk_create в текущей транзакции, а реально
+    отправляются командой `send_outbox` через EMAIL_BACKEND.
+    """
+
+    def send_messages(self, email_messages):
+        messages = [
+            OutboxMessage.from_email_message(message)
+            for message in email_messages
+            if message.recipients()
+        ]
+        OutboxMessage.objects.bulk_create(messages)
+        return len(messages)
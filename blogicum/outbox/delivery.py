@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+from django.core.mail import get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+
+from constants import Constants
+from .models import OutboxMessage
+
+
+def claim_batch(batch_size):
+    """Забирает пачку писем на отправку.
+
+    Письмам выставляется `send_after` в будущем (аренда): другой
+    обработчик их не возьмёт, а если этот упадёт, письма вернутся
+    в очередь по истечении аренды. Транзакция короткая и не держит
+    блокировки на время общения с почтовым сервером.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        pending = OutboxMessage.objects.filter(
+            sent_at__isnull=True, failed=False, send_after__lte=now
+        ).order_by('send_after')
+        if connection.features.has_select_for_update_skip_locked:
+            pending = pending.select_for_update(skip_locked=True)
+        messages = list(pending[:batch_size])
+        OutboxMessage.objects.filter(
+            pk__in=[message.pk for message in messages]
+        ).update(
+            send_after=now + timedelta(seconds=Constants.OUTBOX_LEASE)
+        )
+    return messages
+
+
+def retry_delay(attempts):
+    return timedelta(
+        seconds=Constants.OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    )
+
+
+def deliver_batch(batch_size=None):
+    """Отправляет пачку писем через одно соединение EMAIL_BACKEND.
+
+    Возвращает (отправлено, с ошибкой).
+    """
+    messages = claim_batch(batch_size or Constants.OUTBOX_BATCH_SIZE)
+    if not messages:
+        return 0, 0
+    sent, failed = [], []
+    mail_connection = get_connection()
+    is_open = False
+    try:
+        for message in messages:
+            try:
+                if not is_open:
+                    # Открытое здесь соединение бэкенд не закрывает
+                    # после каждого send_messages.
+                    mail_connection.open()
+                    is_open = True
+                mail_connection.send_messages([message.to_email_message()])
+            except Exception as error:
+                # Соединение могло оборваться: следующее письмо откроет
+                # новое.
+                mail_connection.close()
+                is_open = False
+                failed.append(message)
+                message.attempts += 1
+                message.last_error = f'{type(error).__name__}: {error}'
+                message.send_after = timezone.now() + retry_delay(
+                    message.attempts
+                )
+                message.failed = (
+                    message.attempts >= Constants.OUTBOX_MAX_ATTEMPTS
+                )
+            else:
+                sent.append(message.pk)
+    finally:
+        mail_connection.close()
+
+    OutboxMessage.objects.filter(pk__in=sent).update(sent_at=timezone.now())
+    OutboxMessage.objects.bulk_update(
+        failed, ('attempts', 'last_error', 'send_after', 'failed')
+    )
+    return len(sent), len(failed)
@@ -0,0 +1,26 @@
+from django.contrib.auth.forms import PasswordResetForm
+from django.core.mail import EmailMultiAlternatives
+from django.template import loader
+
+from .mail import get_outbox_connection
+
+
+class OutboxPasswordResetForm(PasswordResetForm):
+    """Сброс пароля, письмо которого уходит через исходящие."""
+
+    def send_mail(self, subject_template_name, email_template_name,
+                  context, from_email, to_email,
+                  html_email_template_name=None):
+        subject = loader.render_to_string(subject_template_name, context)
+        subject = ''.join(subject.splitlines())
+        body = loader.render_to_string(email_template_name, context)
+        message = EmailMultiAlternatives(
+            subject, body, from_email, [to_email],
+            connection=get_outbox_connection(),
+        )
+        if html_email_template_name is not None:
+            message.attach_alternative(
+                loader.render_to_string(html_email_template_name, context),
+                'text/html',
+            )
+        message.send()
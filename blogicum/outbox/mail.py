@@ -0,0 +1,10 @@
+from django.core.mail import get_connection
+
+OUTBOX_BACKEND = 'outbox.backends.OutboxEmailBackend'
+
+
+def get_outbox_connection():
+    """Соединение для `send_mail`/`EmailMessage`, ставящее письма
+    в очередь вместо отправки в рамках запроса.
+    """
+    return get_connection(OUTBOX_BACKEND)
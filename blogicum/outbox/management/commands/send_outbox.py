@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from constants import Constants
+from outbox.delivery import deliver_batch
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из исходящих пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=Constants.OUTBOX_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Работать постоянно, опрашивая очередь.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза между опросами пустой очереди, секунд.'
+        )
+
+    def handle(self, *args, batch_size, loop, interval, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = deliver_batch(batch_size)
+            total_sent += sent
+            total_failed += failed
+            if sent + failed == 0:
+                if not loop:
+                    break
+                time.sleep(interval)
+        self.stdout.write(self.style.SUCCESS(
+            f'Отправлено: {total_sent}, с ошибкой: {total_failed}'
+        ))
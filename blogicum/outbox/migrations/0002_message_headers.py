@@ -0,0 +1,48 @@
+# Generated by Django 3.2.16 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('outbox', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='outboxmessage',
+            old_name='recipients',
+            new_name='to',
+        ),
+        migrations.AlterField(
+            model_name='outboxmessage',
+            name='to',
+            field=models.JSONField(default=list, verbose_name='Кому'),
+        ),
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='cc',
+            field=models.JSONField(default=list, verbose_name='Копия'),
+        ),
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='bcc',
+            field=models.JSONField(default=list, verbose_name='Скрытая копия'),
+        ),
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='reply_to',
+            field=models.JSONField(default=list, verbose_name='Ответить'),
+        ),
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='headers',
+            field=models.JSONField(default=dict, verbose_name='Дополнительные заголовки'),
+        ),
+        migrations.AddField(
+            model_name='outboxmessage',
+            name='attachments',
+            field=models.JSONField(default=list, verbose_name='Вложения'),
+        ),
+    ]
@@ -0,0 +1,128 @@
+import base64
+from email.mime.base import MIMEBase
+
+from django.core.mail import EmailMultiAlternatives
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessage(models.Model):
+    """Письмо, ожидающее отправки командой `send_outbox`.
+
+    Пишется в той же транзакции, что и запрос, который его породил:
+    письмо уходит, только если транзакция зафиксирована.
+    """
+
+    subject = models.CharField(max_length=998, verbose_name='Тема')
+    body = models.TextField(verbose_name='Текст')
+    html_body = models.TextField(blank=True, verbose_name='HTML')
+    from_email = models.CharField(max_length=254, verbose_name='Отправитель')
+    to = models.JSONField(default=list, verbose_name='Кому')
+    cc = models.JSONField(default=list, verbose_name='Копия')
+    bcc = models.JSONField(default=list, verbose_name='Скрытая копия')
+    reply_to = models.JSONField(default=list, verbose_name='Ответить')
+    headers = models.JSONField(
+        default=dict,
+        verbose_name='Дополнительные заголовки'
+    )
+    attachments = models.JSONField(
+        default=list,
+        verbose_name='Вложения'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+    send_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Отправить после'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попыток отправки'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Отправлено'
+    )
+    failed = models.BooleanField(
+        default=False,
+        verbose_name='Отправка прекращена'
+    )
+
+    class Meta:
+        verbose_name = 'исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('send_after',)
+        indexes = (
+            models.Index(
+                fields=('sent_at', 'failed', 'send_after'),
+                name='outbox_pending_idx',
+            ),
+        )
+
+    def __str__(self):
+        return self.subject
+
+    @classmethod
+    def from_email_message(cls, message):
+        """Исходящее письмо из `EmailMessage`. Получатели копии
+        и скрытой копии хранятся отдельно, чтобы скрытые адреса
+        не попали в заголовки письма.
+        """
+        html_body = next(
+            (
+                content for content, mimetype
+                in getattr(message, 'alternatives', ())
+                if mimetype == 'text/html'
+            ),
+            '',
+        )
+        return cls(
+            subject=message.subject,
+            body=message.body,
+            html_body=html_body,
+            from_email=message.from_email,
+            to=list(message.to),
+            cc=list(message.cc),
+            bcc=list(message.bcc),
+            reply_to=list(message.reply_to),
+            headers=dict(message.extra_headers),
+            attachments=[
+                dump_attachment(attachment)
+                for attachment in message.attachments
+            ],
+        )
+
+    def to_email_message(self, connection=None):
+        message = EmailMultiAlternatives(
+            self.subject,
+            self.body,
+            self.from_email,
+            self.to,
+            bcc=self.bcc,
+            connection=connection,
+            headers=self.headers,
+            cc=self.cc,
+            reply_to=self.reply_to,
+        )
+        if self.html_body:
+            message.attach_alternative(self.html_body, 'text/html')
+        for filename, content, mimetype in self.attachments:
+            message.attach(filename, base64.b64decode(content), mimetype)
+        return message
+
+
+def dump_attachment(attachment):
+    """Вложение `EmailMessage` в виде [имя, содержимое в base64, тип]."""
+    if isinstance(attachment, MIMEBase):
+        filename = attachment.get_filename()
+        content = attachment.get_payload(decode=True)
+        mimetype = attachment.get_content_type()
+    else:
+        filename, content, mimetype = attachment
+    if isinstance(content, str):
+        content = content.encode()
+    return [filename, base64.b64encode(content).decode(), mimetype]
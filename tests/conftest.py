@@ -41,6 +41,30 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture
+def disable_page_cache():
+    with override_settings(PAGE_CACHE_ENABLED=False):
+        yield
+
+
+@pytest.fixture(autouse=True, scope='session')
+def local_cache():
+    # Тесты идут в одном процессе, общий кеш им не нужен.
+    with override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }}):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
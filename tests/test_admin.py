@@ -0,0 +1,42 @@
+import pytest
+from django.test import Client
+
+from blog.models import Post
+from blog.paginators import EstimatedCountPaginator
+
+
+@pytest.fixture
+def admin_client_(mixer):
+    from django.contrib.auth import get_user_model
+
+    admin = mixer.blend(
+        get_user_model(), is_staff=True, is_superuser=True
+    )
+    client = Client()
+    client.force_login(admin)
+    return client
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url', (
+    '/admin/blog/post/',
+    '/admin/blog/comment/',
+    '/admin/blog/post/?q=a',
+    '/admin/blog/post/add/',
+))
+def test_admin_pages_load(admin_client_, comment_to_a_post, url):
+    assert admin_client_.get(url).status_code == 200
+
+
+@pytest.mark.django_db
+def test_estimated_count_paginator(
+        monkeypatch, many_posts_with_published_locations
+):
+    monkeypatch.setattr(EstimatedCountPaginator, 'limit', 5)
+    posts = Post.objects.all()
+    assert EstimatedCountPaginator(posts, 10).count >= 20, (
+        'Убедитесь, что для списка без фильтров используется оценка '
+        'размера таблицы.'
+    )
+    filtered = posts.filter(title__isnull=False)
+    assert EstimatedCountPaginator(filtered, 10).count == 5
@@ -0,0 +1,191 @@
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def get_json(client, url, **params):
+    response = client.get(url, params)
+    if response.streaming:
+        content = b''.join(response.streaming_content)
+    else:
+        content = response.content
+    return response.status_code, json.loads(content)
+
+
+@pytest.mark.django_db
+def test_posts_cursor_pagination(
+        client, many_posts_with_published_locations, future_posts
+):
+    seen = []
+    status, data = get_json(client, '/api/v1/posts/', limit=7)
+    assert status == 200
+    while True:
+        seen += [post['id'] for post in data['results']]
+        if not data['next']:
+            break
+        status, data = get_json(client, data['next'])
+    expected = sorted(
+        many_posts_with_published_locations,
+        key=lambda post: (post.pub_date, post.pk),
+        reverse=True,
+    )
+    assert seen == [post.pk for post in expected], (
+        'Убедитесь, что курсорная пагинация выдаёт все опубликованные посты '
+        'по одному разу и без отложенных.'
+    )
+
+
+@pytest.mark.django_db
+def test_sparse_fields_are_projected_in_sql(
+        client, post_with_published_location
+):
+    with CaptureQueriesContext(connection) as queries:
+        status, data = get_json(
+            client, '/api/v1/posts/', fields='id,title'
+        )
+    assert status == 200
+    assert set(data['results'][0]) == {'id', 'title'}
+    select = next(
+        query['sql'] for query in queries.captured_queries
+        if 'FROM "blog_post"' in query['sql']
+    )
+    assert '"blog_post"."text"' not in select
+    status, data = get_json(client, '/api/v1/posts/', fields='nope')
+    assert status == 400
+
+
+@pytest.mark.django_db
+def test_post_detail_and_comments(client, comment_to_a_post):
+    post = comment_to_a_post.post
+    status, data = get_json(client, f'/api/v1/posts/{post.pk}/')
+    assert (status, data['title']) == (200, post.title)
+    assert data['comment_count'] == 1
+    status, data = get_json(client, f'/api/v1/posts/{post.pk}/comments/')
+    assert [comment['id'] for comment in data['results']] == [
+        comment_to_a_post.pk
+    ]
+
+
+@pytest.mark.django_db
+def test_hidden_post_is_not_found(client, posts_with_unpublished_category):
+    post = posts_with_unpublished_category[0]
+    status, _ = get_json(client, f'/api/v1/posts/{post.pk}/')
+    assert status == 404
+    status, _ = get_json(client, f'/api/v1/posts/{post.pk}/comments/')
+    assert status == 404
+
+
+@pytest.mark.django_db
+def test_profile_and_categories(client, user, published_category):
+    status, data = get_json(client, f'/api/v1/profiles/{user.username}/')
+    assert (status, data['username']) == (200, user.username)
+    status, data = get_json(client, '/api/v1/categories/')
+    assert [item['slug'] for item in data['results']] == [
+        published_category.slug
+    ]
+    status, _ = get_json(client, '/api/v1/posts/', cursor='garbage')
+    assert status == 400
+
+
+def post_json(client, url, items):
+    response = client.post(
+        url, json.dumps({'items': items}), content_type='application/json'
+    )
+    return response.status_code, response.json()
+
+
+@pytest.mark.django_db
+def test_batch_create_posts(
+        user, user_client, published_category, published_location
+):
+    from blog.models import AuthorStats, Post, PostSignature, Tag
+
+    items = [
+        {
+            'title': f'Пост {number}',
+            'text': 'Текст',
+            'pub_date': '2024-01-0%dT10:00' % (number + 1),
+            'category': published_category.pk,
+            'location': published_location.pk,
+            'tags': 'горы, #походы',
+        }
+        for number in range(3)
+    ]
+    items.append({'title': 'Без категории', 'text': 'Текст'})
+    with CaptureQueriesContext(connection) as queries:
+        status, data = post_json(user_client, '/api/v1/posts/batch/', items)
+    assert status == 201
+    assert (data['created'], data['failed']) == (3, 1)
+    assert 'category' in data['results'][3]['errors']
+    created = Post.objects.filter(author=user).order_by('pk')
+    assert [result['id'] for result in data['results'][:3]] == [
+        post.pk for post in created
+    ], 'Убедитесь, что в ответе указаны id созданных постов.'
+    assert AuthorStats.objects.get(author=user).published_posts == 3
+    assert dict(Tag.objects.values_list('name', 'post_count')) == {
+        'горы': 3, 'походы': 3,
+    }, 'Убедитесь, что пакетно созданным постам сохраняются теги.'
+    assert set(PostSignature.objects.filter(
+        post__in=created
+    ).values_list('cluster', flat=True)) == {created[0].pk}, (
+        'Убедитесь, что пакетно созданные посты проверяются на дубликаты.'
+    )
+    for table in ('blog_post', 'blog_posttag', 'blog_postsignature'):
+        inserts = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith(f'INSERT INTO "{table}"')
+        ]
+        assert len(inserts) == 1, (
+            f'Убедитесь, что записи {table} пачки сохраняются одним '
+            'bulk_create.'
+        )
+    tag_updates = [
+        query for query in queries.captured_queries
+        if query['sql'].startswith('UPDATE "blog_tag"')
+    ]
+    assert len(tag_updates) == 1, (
+        'Убедитесь, что счётчики тегов обновляются один раз на пачку.'
+    )
+    category_selects = [
+        query for query in queries.captured_queries
+        if query['sql'].startswith('SELECT')
+        and 'FROM "blog_category"' in query['sql']
+    ]
+    assert len(category_selects) == 1, (
+        'Убедитесь, что категории загружаются одним запросом на пачку.'
+    )
+
+
+@pytest.mark.django_db
+def test_batch_create_comments(
+        user_client, post_with_published_location, unlogged_client
+):
+    post = post_with_published_location
+    items = [{'post': post.pk, 'text': 'Первый'}, {'post': 0, 'text': 'x'}]
+    status, data = post_json(user_client, '/api/v1/comments/batch/', items)
+    assert (status, data['created']) == (201, 1)
+    assert data['results'][0]['id'] == post.comments.get().pk
+    assert 'post' in data['results'][1]['errors']
+    status, _ = post_json(unlogged_client, '/api/v1/comments/batch/', items)
+    assert status == 401
+
+
+@pytest.mark.django_db(transaction=True)
+def test_batch_is_atomic(monkeypatch, user, user_client, published_category):
+    from blog.models import Post, Tag
+
+    def broken_index(posts):
+        raise RuntimeError('сбой индексации')
+
+    monkeypatch.setattr('api.batch.index_posts', broken_index)
+    with pytest.raises(RuntimeError):
+        post_json(user_client, '/api/v1/posts/batch/', [{
+            'title': 'Пост', 'text': 'Текст', 'tags': 'горы',
+            'pub_date': '2024-01-01T10:00',
+            'category': published_category.pk,
+        }])
+    assert not Post.objects.exists() and not Tag.objects.exists(), (
+        'Убедитесь, что пачка сохраняется в одной транзакции.'
+    )
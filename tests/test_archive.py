@@ -0,0 +1,112 @@
+from datetime import datetime
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import bulk
+from blog.models import Post, PostArchive
+
+
+def histogram():
+    return {
+        (row.year, row.month): row.post_count
+        for row in PostArchive.objects.histogram()
+    }
+
+
+def moscow(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+@pytest.mark.django_db
+def test_archive_month_page(
+        mixer, client, user, published_category, published_location
+):
+    posts = [
+        mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            location=published_location, is_published=True,
+            pub_date=pub_date,
+        )
+        for pub_date in (
+            moscow(2023, 3, 1, 0, 30),
+            moscow(2023, 3, 31, 23, 0),
+            moscow(2023, 4, 1, 0, 0),
+        )
+    ]
+    response = client.get('/archive/2023/3/')
+    assert response.status_code == 200
+    assert list(response.context['page_obj']) == posts[1::-1], (
+        'Убедитесь, что в архиве месяца выводятся посты только этого месяца.'
+    )
+    assert histogram() == {(2023, 3): 2, (2023, 4): 1}
+    assert client.get('/archive/2023/13/').status_code == 404
+    assert client.get('/archive/9999/12/').status_code == 404, (
+        'Убедитесь, что месяц без следующего месяца в календаре '
+        'возвращает 404.'
+    )
+
+
+@pytest.mark.django_db
+def test_archive_counts_follow_publication(mixer, user):
+    post = mixer.blend(
+        'blog.Post', author=user, is_published=True,
+        pub_date=moscow(2022, 5, 10),
+    )
+    mixer.blend(
+        'blog.Post', author=user, is_published=False,
+        pub_date=moscow(2022, 5, 11),
+    )
+    assert histogram() == {(2022, 5): 1}, (
+        'Убедитесь, что архив учитывает только опубликованные посты.'
+    )
+    post.pub_date = moscow(2022, 6, 1)
+    post.save()
+    assert histogram() == {(2022, 6): 1}
+    bulk.set_published(Post.objects.all(), True)
+    assert histogram() == {(2022, 5): 1, (2022, 6): 1}
+    post.delete()
+    assert histogram() == {(2022, 5): 1}
+
+    PostArchive.objects.update(post_count=9)
+    call_command('recalculate_archive')
+    assert histogram() == {(2022, 5): 1}
+
+
+@pytest.mark.django_db
+def test_archive_counts_use_feed_visibility(
+        monkeypatch, mixer, user, published_category, another_category
+):
+    another_category.is_published = False
+    another_category.save()
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=moscow(2022, 5, 10),
+    )
+    hidden = mixer.blend(
+        'blog.Post', author=user, category=another_category,
+        is_published=True, pub_date=moscow(2022, 5, 11),
+    )
+    assert histogram() == {(2022, 5): 1}, (
+        'Убедитесь, что архив не учитывает посты неопубликованных категорий.'
+    )
+    another_category.is_published = True
+    another_category.save()
+    assert histogram() == {(2022, 5): 2}
+    bulk.set_category(Post.objects.filter(pk=hidden.pk), None)
+    assert histogram() == {(2022, 5): 1}
+    published_category.delete()
+    assert histogram() == {}
+
+    monkeypatch.setattr(
+        'blog.managers.timezone.now', lambda: moscow(2022, 7, 15)
+    )
+    for day in (10, 20):
+        mixer.blend(
+            'blog.Post', author=user, category=another_category,
+            is_published=True, pub_date=moscow(2022, 7, day),
+        )
+    assert histogram() == {(2022, 7): 1}, (
+        'Убедитесь, что отложенные посты не учитываются в архиве.'
+    )
@@ -0,0 +1,57 @@
+import pytest
+from django.urls import reverse
+
+from blog.models import AuthorStats
+
+
+def get_stats(user):
+    return AuthorStats.objects.get(author=user)
+
+
+@pytest.mark.django_db
+def test_stats_follow_posts_and_comments(mixer, user, published_category):
+    post = mixer.blend('blog.Post', author=user, category=published_category)
+    mixer.blend('blog.Post', author=user, is_published=False)
+    stats = get_stats(user)
+    assert (stats.published_posts, stats.drafts) == (1, 1), (
+        'Убедитесь, что статистика автора учитывает новые посты.'
+    )
+    comment = mixer.blend('blog.Comment', post=post)
+    assert get_stats(user).comments_received == 1
+    post.is_published = False
+    post.save()
+    stats = get_stats(user)
+    assert (stats.published_posts, stats.drafts) == (0, 2)
+    comment.delete()
+    post.delete()
+    stats = get_stats(user)
+    assert (stats.drafts, stats.comments_received) == (1, 0)
+
+
+@pytest.mark.django_db
+def test_recalculate_matches_incremental(mixer, user, published_category):
+    posts = mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category
+    )
+    mixer.cycle(2).blend('blog.Comment', post=posts[0])
+    incremental = get_stats(user)
+    AuthorStats.objects.recalculate(user.pk)
+    recalculated = get_stats(user)
+    for field in (
+        'published_posts', 'drafts', 'comments_received', 'last_post_date'
+    ):
+        assert getattr(incremental, field) == getattr(recalculated, field)
+
+
+@pytest.mark.django_db
+def test_profile_queries(
+        client, django_assert_max_num_queries,
+        many_posts_with_published_locations
+):
+    url = reverse(
+        'blog:profile',
+        args=(many_posts_with_published_locations[0].author.username,)
+    )
+    with django_assert_max_num_queries(3):
+        response = client.get(url)
+    assert 'Публикаций: 20' in response.content.decode()
@@ -0,0 +1,68 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import bulk
+from blog.models import AuthorStats, Post
+
+
+@pytest.mark.django_db
+def test_bulk_unpublish_updates_stats(
+        monkeypatch, user, many_posts_with_published_locations
+):
+    monkeypatch.setattr(bulk.Constants, 'BULK_BATCH_SIZE', 8)
+    queryset = Post.objects.filter(author=user)
+    with CaptureQueriesContext(connection) as queries:
+        assert bulk.set_published(queryset, False) == 20
+    updates = [
+        query for query in queries.captured_queries
+        if query['sql'].startswith('UPDATE "blog_post"')
+    ]
+    assert len(updates) == 3, (
+        'Убедитесь, что посты обновляются одним UPDATE на пачку.'
+    )
+    assert not Post.objects.filter(is_published=True).exists()
+    stats = AuthorStats.objects.get(author=user)
+    assert (stats.published_posts, stats.drafts) == (0, 20)
+
+
+@pytest.mark.django_db
+def test_bulk_moderate_command(
+        user, another_category, many_posts_with_published_locations,
+        comment_to_a_post
+):
+    call_command(
+        'bulk_moderate', 'posts', author=user.username,
+        category=another_category.slug
+    )
+    assert Post.objects.filter(category=another_category).count() == (
+        Post.objects.filter(author=user).count()
+    )
+    call_command(
+        'bulk_moderate', 'comments', '--unpublish',
+        ids=[comment_to_a_post.pk]
+    )
+    comment_to_a_post.refresh_from_db()
+    assert not comment_to_a_post.is_published
+    with pytest.raises(CommandError):
+        call_command('bulk_moderate', 'comments', '--publish', '--ids', '1,a')
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('vendor', ['sqlite', 'other'])
+def test_bulk_create_assigns_inserted_pks(
+        monkeypatch, vendor, user, published_category
+):
+    monkeypatch.setattr(connection, 'vendor', vendor)
+    posts = bulk.bulk_create(Post, [
+        Post(
+            title=f'Пост {number}', text='Текст', author=user,
+            category=published_category, pub_date=timezone.now(),
+        )
+        for number in range(5)
+    ])
+    assert {post.pk: post.title for post in posts} == dict(
+        Post.objects.values_list('pk', 'title')
+    ), 'Убедитесь, что созданным объектам присвоены их первичные ключи.'
@@ -0,0 +1,99 @@
+import gzip
+
+import brotli
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from blog.middleware import CompressionMiddleware, choose_encoding
+
+
+def compress(response, accept_encoding='gzip'):
+    request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+def test_choose_encoding():
+    assert choose_encoding('gzip, deflate') == 'gzip'
+    assert choose_encoding('gzip;q=0, deflate') is None
+    assert choose_encoding('') is None
+
+
+def test_choose_encoding_fractional_quality():
+    assert choose_encoding('gzip;q=0.5') == 'gzip', (
+        'Убедитесь, что кодировка с ненулевым q принимается.'
+    )
+    assert choose_encoding('gzip; q=0.8, br') in ('gzip', 'br')
+    assert choose_encoding('deflate, gzip; q=0.8') == 'gzip'
+    assert choose_encoding('gzip;q=0.0') is None
+    assert choose_encoding('gzip;q=0.000, br;q=0') is None
+
+
+def test_choose_encoding_ignores_lookalike_tokens():
+    assert choose_encoding('x-gzip') is None, (
+        'Убедитесь, что x-gzip не принимается за gzip.'
+    )
+    assert choose_encoding('gzip-x, brx') is None
+
+
+def test_large_html_is_gzipped():
+    body = '<p>Блогикум</p>' * 100
+    response = compress(HttpResponse(body))
+    assert response['Content-Encoding'] == 'gzip', (
+        'Убедитесь, что HTML-ответ сжимается gzip.'
+    )
+    assert gzip.decompress(response.content).decode() == body
+    assert 'Accept-Encoding' in response['Vary']
+
+
+def test_large_html_is_brotli_compressed():
+    body = '<p>Блогикум</p>' * 100
+    response = compress(HttpResponse(body), accept_encoding='gzip, br')
+    assert response['Content-Encoding'] == 'br', (
+        'Убедитесь, что при поддержке br ответ сжимается brotli.'
+    )
+    assert brotli.decompress(response.content).decode() == body
+    assert response['Content-Length'] == str(len(response.content))
+
+
+def test_small_and_media_responses_are_not_compressed():
+    small = compress(HttpResponse('ok'))
+    assert not small.has_header('Content-Encoding')
+    image = compress(HttpResponse(b'\x89PNG' * 500, content_type='image/png'))
+    assert not image.has_header('Content-Encoding')
+
+
+def test_no_accept_encoding():
+    response = compress(HttpResponse('x' * 1000), accept_encoding='')
+    assert not response.has_header('Content-Encoding')
+
+
+def test_streaming_response_is_compressed_by_chunks():
+    chunks = [b'chunk-%d ' % i * 50 for i in range(10)]
+    response = compress(StreamingHttpResponse(iter(chunks)))
+    assert response['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(b''.join(response.streaming_content)) == (
+        b''.join(chunks)
+    )
+
+
+def test_streaming_response_is_brotli_compressed_by_chunks():
+    chunks = [b'chunk-%d ' % i * 50 for i in range(10)]
+    response = compress(
+        StreamingHttpResponse(iter(chunks)), accept_encoding='br'
+    )
+    assert response['Content-Encoding'] == 'br'
+    assert not response.has_header('Content-Length')
+    assert brotli.decompress(b''.join(response.streaming_content)) == (
+        b''.join(chunks)
+    )
+
+
+@pytest.mark.django_db
+def test_index_page_is_compressed(client):
+    response = client.get('/', HTTP_ACCEPT_ENCODING='gzip')
+    assert response.status_code == 200
+    assert response['Content-Encoding'] == 'gzip', (
+        'Убедитесь, что главная страница отдаётся в сжатом виде.'
+    )
+    assert b'<html' in gzip.decompress(response.content)
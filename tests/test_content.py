@@ -472,6 +472,9 @@ class TestContent:
             ), ("Убедитесь, что на странице категории "
                 "не отображаются отложенные публикации.")
 
+    # Одна и та же страница запрашивается несколькими клиентами, а ответ
+    # из кеша страниц не содержит контекста шаблона.
+    @pytest.mark.usefixtures('disable_page_cache')
     def test_pagination(
         self, user_client, many_posts_with_published_locations
     ):
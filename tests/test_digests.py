@@ -0,0 +1,52 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.digests import collect_comment_digests, send_comment_digests
+from blog.models import Comment
+from outbox.models import OutboxMessage
+
+
+@pytest.fixture
+def commented_posts(mixer, user, another_user):
+    user.email = 'author@example.com'
+    user.save()
+    posts = mixer.cycle(2).blend('blog.Post', author=user)
+    mixer.cycle(3).blend('blog.Comment', post=posts[0], author=another_user)
+    mixer.blend('blog.Comment', post=posts[1], author=another_user)
+    mixer.blend('blog.Comment', post=posts[1], author=user)
+    return posts
+
+
+@pytest.mark.django_db
+def test_digest_aggregates_comments_per_author(commented_posts, user):
+    upto_id = Comment.objects.order_by('-pk').values_list('pk', flat=True)[0]
+    with CaptureQueriesContext(connection) as queries:
+        digests = collect_comment_digests(0, upto_id)
+    assert len(queries) == 1, (
+        'Убедитесь, что дайджесты собираются одним запросом.'
+    )
+    assert len(digests) == 1
+    digest = digests[0]
+    assert digest['email'] == user.email
+    assert digest['total'] == 4, (
+        'Убедитесь, что комментарии автора к своим постам не попадают '
+        'в дайджест.'
+    )
+    assert [post['comments'] for post in digest['posts']] == [3, 1]
+
+
+@pytest.mark.django_db
+def test_digest_is_queued_once(commented_posts, mixer, another_user):
+    call_command('send_comment_digests')
+    message = OutboxMessage.objects.get()
+    assert message.to == ['author@example.com']
+    assert commented_posts[0].title in message.body
+    assert send_comment_digests() == 0, (
+        'Убедитесь, что повторная рассылка не включает уже учтённые '
+        'комментарии.'
+    )
+    mixer.blend('blog.Comment', post=commented_posts[1], author=another_user)
+    assert send_comment_digests() == 1
+    assert OutboxMessage.objects.latest('pk').subject.endswith(': 1')
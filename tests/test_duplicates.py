@@ -0,0 +1,92 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import duplicates
+from blog.duplicates import find_duplicates, signature
+from blog.models import Post, PostSignature
+
+SPAM = (
+    'Лучшие скидки недели только сегодня переходите по ссылке и получите '
+    'подарок каждому новому покупателю нашего магазина бесплатная доставка '
+    'по всей стране без предоплаты и скрытых платежей'
+)
+EDITED = SPAM.replace('недели', 'месяца')
+OTHER = 'Осенний поход по горам: маршрут, снаряжение и погода в долине реки'
+
+
+def create_post(client, category, title, text):
+    response = client.post('/posts/create/', data={
+        'title': title,
+        'text': text,
+        'pub_date': '2020-01-01T10:00',
+        'category': category.id,
+    })
+    assert response.status_code == 302
+    return Post.objects.get(title=title)
+
+
+@pytest.mark.django_db
+def test_duplicates_are_flagged_on_form_save(
+        user_client, another_user_client, published_category
+):
+    first = create_post(user_client, published_category, 'Первый', SPAM)
+    other = create_post(user_client, published_category, 'Поход', OTHER)
+    second = create_post(
+        another_user_client, published_category, 'Второй', EDITED
+    )
+    clusters = dict(PostSignature.objects.values_list('post_id', 'cluster'))
+    assert clusters[first.id] == clusters[second.id] == first.id, (
+        'Убедитесь, что почти одинаковые посты отмечаются одной группой '
+        'при сохранении формы.'
+    )
+    assert clusters[other.id] is None
+
+    with CaptureQueriesContext(connection) as queries:
+        duplicates = find_duplicates(signature(EDITED))
+    assert set(duplicates) == {first.id, second.id}
+    assert len(queries) == 1, (
+        'Убедитесь, что кандидаты в дубликаты выбираются одним запросом.'
+    )
+
+
+@pytest.mark.django_db
+def test_scan_command_groups_existing_posts(
+        mixer, user, published_category
+):
+    posts = [
+        mixer.blend(
+            'blog.Post', author=user, category=published_category, text=text
+        )
+        for text in (SPAM, OTHER, EDITED, SPAM + ' акция')
+    ]
+    call_command('find_duplicate_posts', '--workers', '2')
+    clusters = dict(PostSignature.objects.values_list('post_id', 'cluster'))
+    spam_ids = [posts[0].id, posts[2].id, posts[3].id]
+    assert {clusters[post_id] for post_id in spam_ids} == {posts[0].id}, (
+        'Убедитесь, что команда объединяет почти дубликаты в группы.'
+    )
+    assert clusters[posts[1].id] is None
+
+
+def test_identical_bucket_is_grouped_in_linear_time(monkeypatch):
+    sig = signature('Купите дешёвые часы по ссылке прямо сейчас')
+    post_ids = list(range(1, 5001))
+    calls = []
+    similarity = duplicates.similarity
+
+    def counted(first, second):
+        calls.append(1)
+        return similarity(first, second)
+
+    monkeypatch.setattr(duplicates, 'similarity', counted)
+    groups = duplicates.group_duplicates(
+        dict.fromkeys(post_ids, sig),
+        {(band, 0): post_ids for band in range(2)},
+    )
+    assert groups == {1: post_ids}
+    assert len(calls) < len(post_ids), (
+        'Убедитесь, что пост сравнивается только с представителями уже '
+        'найденных групп корзины, а не со всеми её постами.'
+    )
@@ -0,0 +1,72 @@
+import pytest
+
+from blog.counters import flush_counters
+from blog.models import CommentLike, PostLike
+
+
+@pytest.mark.django_db(transaction=True)
+def test_post_like_is_idempotent(
+        user_client, user, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    for _ in range(2):
+        response = user_client.post(f'/posts/{post.id}/like/')
+        assert response.status_code == 302
+    another_user_client.post(f'/posts/{post.id}/like/')
+    assert PostLike.objects.filter(post=post).count() == 2, (
+        'Убедитесь, что повторный лайк не создаёт новую запись.'
+    )
+    post.refresh_from_db()
+    assert post.likes == 0, (
+        'Убедитесь, что лайки не обновляют строку поста при каждом запросе.'
+    )
+    content = user_client.get(f'/posts/{post.id}/').content.decode()
+    assert '♥ 2' in content
+
+    user_client.post(f'/posts/{post.id}/unlike/')
+    user_client.post(f'/posts/{post.id}/unlike/')
+    flush_counters()
+    flush_counters()
+    post.refresh_from_db()
+    assert post.likes == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comment_like(user_client, user, comment_to_a_post):
+    comment = comment_to_a_post
+    url = f'/posts/{comment.post_id}/like_comment/{comment.id}/'
+    response = user_client.post(url)
+    assert response.url.endswith(f'#comment_{comment.id}')
+    assert CommentLike.objects.filter(user=user, comment=comment).exists()
+    content = user_client.get(f'/posts/{comment.post_id}/').content.decode()
+    assert '♥ 1' in content
+    flush_counters()
+    flush_counters()
+    comment.refresh_from_db()
+    assert comment.likes == 1
+
+
+@pytest.mark.django_db
+def test_like_requires_visible_post(
+        another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.post(f'/posts/{post.id}/like/')
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_comment_like_requires_visible_post(
+        another_user_client, comment_to_a_post
+):
+    comment = comment_to_a_post
+    url = f'/posts/{comment.post_id}/like_comment/{comment.id}/'
+    comment.post.is_published = False
+    comment.post.save()
+    response = another_user_client.post(url)
+    assert response.status_code == 404, (
+        'Убедитесь, что нельзя лайкнуть комментарий к скрытому посту.'
+    )
+    assert not CommentLike.objects.exists()
@@ -0,0 +1,124 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.mentions import render_mentions
+from blog.models import Comment, Notification, Post
+
+
+@pytest.fixture
+def named_users(mixer):
+    return [
+        mixer.blend('auth.User', username=name)
+        for name in ('anna', 'boris.k')
+    ]
+
+
+@pytest.mark.django_db
+def test_mentions_are_resolved_with_one_query(
+        named_users, user, post_with_published_location
+):
+    comment = Comment(
+        post=post_with_published_location, author=user,
+        text='Привет, @anna и @boris.k. Ещё @anna, @nobody и mail@anna.ru',
+    )
+    with CaptureQueriesContext(connection) as queries:
+        comment.save()
+    user_queries = [
+        query for query in queries if 'auth_user' in query['sql']
+        and '"username" IN' in query['sql']
+    ]
+    assert len(user_queries) == 1, (
+        'Убедитесь, что упоминания разрешаются одним запросом `username__in`.'
+    )
+    anna, boris = named_users
+    assert [mention[2:] for mention in comment.mentions] == [
+        [anna.id, 'anna'], [boris.id, 'boris.k'], [anna.id, 'anna'],
+    ]
+    html = render_mentions(comment.text, comment.mentions)
+    assert '<a href="/profile/boris.k/">@boris.k</a>.' in html
+    assert 'mail@anna.ru' in html
+
+
+@pytest.mark.django_db(transaction=True)
+def test_mentions_notify_once(
+        named_users, user, user_client, post_with_published_location
+):
+    anna, boris = named_users
+    post = post_with_published_location
+    comment = Comment.objects.create(
+        post=post, author=user, text='@anna смотри'
+    )
+    assert list(Notification.objects.values_list(
+        'recipient_id', 'kind'
+    )) == [(anna.id, Notification.MENTION)]
+    comment.text = '@anna и @boris.k смотрите'
+    comment.save()
+    assert Notification.objects.filter(
+        kind=Notification.MENTION
+    ).count() == 2, (
+        'Убедитесь, что при редактировании уведомляются только новые '
+        'упомянутые пользователи.'
+    )
+    content = user_client.get(f'/posts/{post.id}/').content.decode()
+    assert '<a href="/profile/anna/">@anna</a>' in content
+
+
+@pytest.mark.django_db
+def test_mentions_notify_when_post_becomes_visible(
+        named_users, user, published_category
+):
+    anna, _ = named_users
+    post = Post.objects.create(
+        title='Пост', text='@anna смотри', author=user,
+        category=published_category, is_published=False,
+        pub_date=timezone.now(),
+    )
+    published_category.is_published = False
+    published_category.save()
+    post.is_published = True
+    post.save()
+    hidden = Comment.objects.create(
+        post=post, author=user, text='@anna и тут'
+    )
+    assert not Notification.objects.exists(), (
+        'Убедитесь, что упоминания в скрытых постах и комментариях к ним '
+        'не создают уведомлений.'
+    )
+    published_category.is_published = True
+    published_category.save()
+    assert set(Notification.objects.values_list(
+        'recipient_id', 'post_id', 'comment_id'
+    )) == {(anna.id, post.id, None), (anna.id, post.id, hidden.id)}, (
+        'Убедитесь, что упомянутые пользователи уведомляются, когда пост '
+        'становится видимым.'
+    )
+    post.save()
+    hidden.save()
+    assert Notification.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_scheduled_post_mentions(named_users, user, published_category):
+    anna, _ = named_users
+    post = Post.objects.create(
+        title='Пост', text='@anna смотри', author=user,
+        category=published_category, is_published=True,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    assert not Notification.objects.exists()
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(minutes=1)
+    )
+    call_command('notify_scheduled_mentions')
+    call_command('notify_scheduled_mentions')
+    assert list(Notification.objects.values_list(
+        'recipient_id', 'post_id'
+    )) == [(anna.id, post.id)], (
+        'Убедитесь, что об упоминаниях в отложенном посте уведомляют один '
+        'раз, когда наступает дата публикации.'
+    )
@@ -0,0 +1,210 @@
+import json
+import math
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from blog import moderation
+from blog.models import (
+    AuthorStats,
+    Comment,
+    CommentModeration,
+    Notification,
+    Post,
+    SpamFilter,
+)
+
+SPAM = 'Дешёвые кредиты без проверки переходите по ссылке казино бонус'
+HAM = 'Спасибо за подробный рассказ о походе, фотографии отличные'
+
+
+@pytest.fixture
+def trained_filter(user, post_with_published_location):
+    post = post_with_published_location
+    for index in range(5):
+        Comment.objects.create(
+            post=post, author=user, text=f'{SPAM} {index}', is_published=False
+        )
+        Comment.objects.create(post=post, author=user, text=f'{HAM} {index}')
+    call_command('train_spam_filter')
+    return post
+
+
+@pytest.mark.django_db
+def test_spam_comment_goes_to_moderation_queue(
+        another_user_client, another_user, trained_filter
+):
+    post = trained_filter
+    url = f'/{post.id}/comment/'
+    another_user_client.post(url, data={'text': 'Казино бонус по ссылке'})
+    another_user_client.post(url, data={'text': 'Отличные фотографии!'})
+    spam = Comment.objects.get(text='Казино бонус по ссылке')
+    assert not spam.is_published, (
+        'Убедитесь, что комментарий, похожий на спам, снимается '
+        'с публикации.'
+    )
+    assert spam.moderation.status == CommentModeration.QUEUED
+    assert spam.moderation.score >= 0.9
+    assert Comment.objects.get(text='Отличные фотографии!').is_published
+    assert not Notification.objects.filter(comment=spam).exists()
+
+    content = another_user_client.get(f'/posts/{post.id}/').content.decode()
+    assert 'Казино бонус по ссылке' not in content, (
+        'Убедитесь, что комментарии на модерации не выводятся на странице '
+        'поста.'
+    )
+    assert 'Отличные фотографии!' in content
+
+
+@pytest.mark.django_db
+def test_rescore_backlog_and_review(
+        user, another_user, trained_filter
+):
+    post = trained_filter
+    backlog = Comment.objects.create(
+        post=post, author=another_user, text='Кредиты без проверки, казино'
+    )
+    normal = Comment.objects.create(
+        post=post, author=another_user, text='Подробный рассказ, спасибо'
+    )
+    call_command('rescore_comments')
+    backlog.refresh_from_db()
+    normal.refresh_from_db()
+    assert not backlog.is_published, (
+        'Убедитесь, что пересчёт оценок отправляет спам в очередь '
+        'модерации.'
+    )
+    assert normal.is_published
+
+    moderation.review(
+        CommentModeration.objects.filter(comment=backlog), is_spam=False
+    )
+    backlog.refresh_from_db()
+    assert backlog.is_published
+    assert backlog.moderation.status == CommentModeration.HAM
+
+
+@pytest.mark.django_db
+def test_edited_comment_is_rescreened_and_approval_notifies(
+        user, another_user, another_user_client, trained_filter
+):
+    post = trained_filter
+    comment = Comment.objects.create(
+        post=post, author=another_user, text='Отличные фотографии!'
+    )
+    another_user_client.post(
+        f'/posts/{post.id}/edit_comment/{comment.id}/',
+        data={'text': 'Казино бонус по ссылке'},
+    )
+    comment.refresh_from_db()
+    assert not comment.is_published, (
+        'Убедитесь, что отредактированный комментарий снова проверяется '
+        'фильтром спама.'
+    )
+    assert comment.moderation.status == CommentModeration.QUEUED
+
+    Notification.objects.all().delete()
+    moderation.review(
+        CommentModeration.objects.filter(comment=comment), is_spam=False
+    )
+    assert Notification.objects.filter(
+        recipient=user, comment=comment, kind=Notification.COMMENT
+    ).exists(), (
+        'Убедитесь, что автор поста получает уведомление, когда '
+        'комментарий из очереди модерации опубликован.'
+    )
+
+
+@pytest.mark.django_db
+def test_batch_comments_are_screened(another_user_client, trained_filter):
+    post = trained_filter
+    response = another_user_client.post(
+        '/api/v1/comments/batch/',
+        data=json.dumps({'items': [
+            {'post': post.pk, 'text': 'Казино бонус по ссылке'},
+            {'post': post.pk, 'text': 'Отличные фотографии!'},
+        ]}),
+        content_type='application/json',
+    )
+    assert response.status_code == 201
+    spam = Comment.objects.get(text='Казино бонус по ссылке')
+    assert not spam.is_published, (
+        'Убедитесь, что комментарии из пакетного API проверяются '
+        'фильтром спама.'
+    )
+    assert spam.moderation.status == CommentModeration.QUEUED
+    assert Comment.objects.get(text='Отличные фотографии!').is_published
+
+
+@pytest.mark.django_db
+def test_counts_include_only_published_comments(
+        user, another_user_client, trained_filter
+):
+    post = trained_filter
+
+    def counts():
+        post.refresh_from_db()
+        return (
+            post.comment_count,
+            AuthorStats.objects.get(author=user).comments_received,
+        )
+
+    assert counts() == (5, 5), (
+        'Убедитесь, что снятые с публикации комментарии не учитываются '
+        'в счётчиках.'
+    )
+    another_user_client.post(
+        f'/{post.id}/comment/', data={'text': 'Казино бонус по ссылке'}
+    )
+    assert counts() == (5, 5), (
+        'Убедитесь, что комментарий на модерации не учитывается '
+        'в счётчиках.'
+    )
+    moderation.review(CommentModeration.objects.all(), is_spam=False)
+    assert counts() == (6, 6)
+
+    comment = Comment.objects.get(text='Казино бонус по ссылке')
+    comment.is_published = False
+    comment.save()
+    assert counts() == (5, 5)
+    comment.delete()
+    assert counts() == (5, 5)
+
+    Post.objects.update(comment_count=0)
+    Post.objects.recalculate_comment_counts()
+    AuthorStats.objects.recalculate(user.pk)
+    assert counts() == (5, 5)
+
+
+@pytest.mark.django_db
+def test_filter_reloads_after_retrain_elsewhere(trained_filter):
+    assert moderation.get_filter() is not None
+    spam_filter = SpamFilter.objects.get()
+    # Переобучение в другом процессе: кеш этого процесса не сброшен.
+    SpamFilter.objects.update(
+        bias=spam_filter.bias + 1,
+        trained_at=spam_filter.trained_at + timedelta(minutes=1),
+    )
+    cache.delete(moderation.FILTER_TRAINED_AT_KEY)
+    assert moderation.get_filter()['bias'] == pytest.approx(
+        spam_filter.bias + 1
+    ), (
+        'Убедитесь, что веса фильтра перечитываются, когда меняется '
+        'время обучения.'
+    )
+
+
+def test_score_batch_matches_single_scores():
+    spam_filter = {
+        'weights': moderation.array('f', [0.5]) * 2 ** 16,
+        'bias': -1.0,
+    }
+    texts = [SPAM, HAM, '']
+    batch = moderation.score_batch(texts, spam_filter)
+    for text, score in zip(texts, batch):
+        expected = 1 / (1 + math.exp(
+            1.0 - 0.5 * len(moderation.features(text))
+        ))
+        assert score == pytest.approx(expected, rel=1e-5)
@@ -0,0 +1,54 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Notification
+from blog.notifications import unread_count
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comments_notify_author_and_participants(
+        mixer, user, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    third_user = mixer.blend('auth.User')
+    mixer.blend('blog.Comment', post=post, author=another_user)
+    mixer.blend('blog.Comment', post=post, author=third_user)
+    assert set(Notification.objects.values_list(
+        'recipient_id', 'actor_id', 'kind'
+    )) == {
+        (user.id, another_user.id, Notification.COMMENT),
+        (user.id, third_user.id, Notification.COMMENT),
+        (another_user.id, third_user.id, Notification.REPLY),
+    }, (
+        'Убедитесь, что о новом комментарии узнают автор поста '
+        'и участники обсуждения.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_unread_count_is_cached(
+        mixer, user, user_client, another_user, post_with_published_location
+):
+    assert unread_count(user) == 0
+    mixer.cycle(2).blend(
+        'blog.Comment', post=post_with_published_location,
+        author=another_user,
+    )
+    with CaptureQueriesContext(connection) as queries:
+        assert unread_count(user) == 2
+    assert not queries, (
+        'Убедитесь, что число непрочитанных уведомлений берётся из кеша.'
+    )
+    content = user_client.get('/notifications/').content.decode()
+    assert 'Уведомления <span class="badge bg-danger">2</span>' in content
+
+    with CaptureQueriesContext(connection) as queries:
+        user_client.post('/notifications/read/')
+    updates = [
+        query for query in queries
+        if query['sql'].startswith('UPDATE "blog_notification"')
+    ]
+    assert len(updates) == 1
+    assert unread_count(user) == 0
+    assert not Notification.objects.filter(unread=True).exists()
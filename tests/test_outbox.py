@@ -0,0 +1,133 @@
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from django.utils import timezone
+
+from constants import Constants
+from outbox.mail import get_outbox_connection
+from outbox.models import OutboxMessage
+
+
+@pytest.fixture
+def locmem_email(settings):
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+
+@pytest.mark.django_db
+def test_password_reset_is_queued(client, user, locmem_email):
+    user.email = 'author@example.com'
+    user.save()
+    response = client.post(
+        '/auth/password_reset/', data={'email': user.email}
+    )
+    assert response.status_code == 302
+    assert not mail.outbox, (
+        'Убедитесь, что письмо сброса пароля не отправляется в запросе.'
+    )
+    message = OutboxMessage.objects.get()
+    assert message.to == [user.email]
+    assert message.sent_at is None
+
+
+@pytest.mark.django_db
+def test_send_outbox_delivers_pending(locmem_email):
+    OutboxMessage.objects.bulk_create([
+        OutboxMessage(
+            subject=f'Тема {number}', body='Текст',
+            from_email='from@example.com', to=['to@example.com'],
+        )
+        for number in range(3)
+    ])
+    OutboxMessage.objects.create(
+        subject='Позже', body='', from_email='from@example.com',
+        to=['to@example.com'],
+        send_after=timezone.now() + timezone.timedelta(hours=1),
+    )
+    call_command('send_outbox', batch_size=2)
+    assert len(mail.outbox) == 3, (
+        'Убедитесь, что `send_outbox` отправляет все готовые письма.'
+    )
+    assert OutboxMessage.objects.filter(sent_at__isnull=True).count() == 1
+
+
+@pytest.mark.django_db
+def test_failed_delivery_is_retried_with_backoff(locmem_email, monkeypatch):
+    message = OutboxMessage.objects.create(
+        subject='Тема', body='', from_email='from@example.com',
+        to=['to@example.com'],
+    )
+
+    def broken_send(self, messages):
+        raise ConnectionError('сервер недоступен')
+
+    monkeypatch.setattr(
+        'django.core.mail.backends.locmem.EmailBackend.send_messages',
+        broken_send,
+    )
+    monkeypatch.setattr(Constants, 'OUTBOX_MAX_ATTEMPTS', 2)
+    call_command('send_outbox')
+    message.refresh_from_db()
+    assert message.attempts == 1
+    assert 'сервер недоступен' in message.last_error
+    assert message.send_after > timezone.now()
+    assert not message.failed
+
+    OutboxMessage.objects.update(send_after=timezone.now())
+    call_command('send_outbox')
+    message.refresh_from_db()
+    assert message.attempts == 2
+    assert message.failed, (
+        'Убедитесь, что после исчерпания попыток письмо помечается '
+        'как неотправляемое.'
+    )
+
+
+@pytest.mark.django_db
+def test_message_fields_survive_the_outbox(locmem_email):
+    EmailMessage(
+        'Тема', 'Текст', 'from@example.com', ['to@example.com'],
+        bcc=['hidden@example.com'], cc=['copy@example.com'],
+        reply_to=['reply@example.com'], headers={'X-Tag': 'digest'},
+        attachments=[('note.txt', 'вложение', 'text/plain')],
+        connection=get_outbox_connection(),
+    ).send()
+    call_command('send_outbox')
+    message = mail.outbox[0]
+    assert (message.to, message.cc, message.bcc, message.reply_to) == (
+        ['to@example.com'], ['copy@example.com'], ['hidden@example.com'],
+        ['reply@example.com'],
+    )
+    assert message.extra_headers == {'X-Tag': 'digest'}
+    assert message.attachments == [('note.txt', 'вложение', 'text/plain')]
+    assert 'hidden@example.com' not in message.message().as_string(), (
+        'Убедитесь, что адреса скрытой копии не попадают в заголовки.'
+    )
+
+
+@pytest.mark.django_db
+def test_batch_reuses_one_connection(locmem_email, monkeypatch):
+    OutboxMessage.objects.bulk_create([
+        OutboxMessage(
+            subject=f'Тема {number}', body='Текст',
+            from_email='from@example.com', to=['to@example.com'],
+        )
+        for number in range(4)
+    ])
+    opened = []
+    backend = 'django.core.mail.backends.locmem.EmailBackend'
+    send_messages = mail.backends.locmem.EmailBackend.send_messages
+
+    def flaky_send(self, messages):
+        if messages[0].subject == 'Тема 1':
+            raise ConnectionError('обрыв')
+        return send_messages(self, messages)
+
+    monkeypatch.setattr(f'{backend}.open', lambda self: opened.append(1))
+    monkeypatch.setattr(f'{backend}.send_messages', flaky_send)
+    call_command('send_outbox')
+    assert len(mail.outbox) == 3
+    assert len(opened) == 2, (
+        'Убедитесь, что пачка писем отправляется через одно соединение, '
+        'которое открывается заново только после ошибки.'
+    )
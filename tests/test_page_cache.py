@@ -0,0 +1,171 @@
+import pytest
+from django.db import connection
+from django.template import RequestContext
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from django.core.cache import cache
+
+from blog.cache import SHARED_VARIANT, page_cache_key
+from constants import Constants
+
+
+@pytest.fixture(autouse=True)
+def enable_page_cache(settings):
+    settings.PAGE_CACHE_ENABLED = True
+
+
+def is_cached(url, query_string=''):
+    return cache.get(page_cache_key(url, query_string, None)) is not None
+
+
+@pytest.mark.django_db
+def test_anonymous_index_is_cached(client, post_with_published_location):
+    url = reverse('blog:index')
+    client.get(url)
+    assert is_cached(url), (
+        'Убедитесь, что главная страница кешируется для анонимных посетителей.'
+    )
+    response = client.get(url)
+    assert post_with_published_location.title in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_logged_in_user_is_not_cached(user_client):
+    url = reverse('blog:index')
+    user_client.get(url)
+    assert not is_cached(url)
+
+
+@pytest.mark.django_db
+def test_post_change_invalidates_affected_pages(
+        client, post_with_published_location, another_category
+):
+    post = post_with_published_location
+    old_category_url = reverse(
+        'blog:category_posts', args=(post.category.slug,)
+    )
+    urls = (
+        reverse('blog:index'),
+        old_category_url,
+        reverse('blog:profile', args=(post.author.username,)),
+    )
+    for url in urls:
+        client.get(url)
+        assert is_cached(url)
+    post.category = another_category
+    post.title = 'Новый заголовок'
+    post.save()
+    for url in urls:
+        assert not is_cached(url), (
+            f'Убедитесь, что изменение поста сбрасывает кеш страницы {url}.'
+        )
+    assert 'Новый заголовок' in client.get(reverse('blog:index')).content.decode()
+
+
+@pytest.mark.django_db
+def test_comment_invalidates_first_index_pages(
+        client, mixer, monkeypatch, many_posts_with_published_locations
+):
+    monkeypatch.setattr(Constants, 'PAGE_CACHE_INVALIDATE_PAGES', 1)
+    url = reverse('blog:index')
+    client.get(url)
+    client.get(url, {'page': 2})
+    assert is_cached(url, 'page=2')
+    mixer.blend('blog.Comment', post=many_posts_with_published_locations[0])
+    assert not is_cached(url)
+    assert is_cached(url, 'page=2'), (
+        'Убедитесь, что сбрасываются только первые страницы ленты.'
+    )
+
+
+@pytest.mark.django_db
+def test_shared_page_fills_user_fragments(
+        user, another_user, user_client, another_user_client,
+        post_with_published_location
+):
+    url = reverse('blog:index')
+    user_client.get(url)
+    assert cache.get(page_cache_key(url, '', SHARED_VARIANT)) is not None, (
+        'Убедитесь, что общая копия ленты кешируется '
+        'для авторизованных пользователей.'
+    )
+    content = another_user_client.get(url).content.decode()
+    assert another_user.username in content
+    assert '<!--hole' not in content
+
+
+@pytest.mark.django_db
+def test_detail_page_author_links_and_csrf(
+        user_client, another_user_client, post_with_published_location
+):
+    url = reverse('blog:post_detail', args=(post_with_published_location.id,))
+    edit_url = reverse(
+        'blog:edit_post', args=(post_with_published_location.id,)
+    )
+    assert edit_url not in another_user_client.get(url).content.decode()
+    content = user_client.get(url).content.decode()
+    assert edit_url in content, (
+        'Убедитесь, что автор видит ссылки редактирования '
+        'на закешированной странице поста.'
+    )
+    assert 'csrfmiddlewaretoken' in content
+    assert '<!--hole' not in content
+
+
+@pytest.mark.django_db
+def test_holes_share_request_context_and_like_queries(
+        monkeypatch, user, user_client, another_user_client,
+        post_with_published_location
+):
+    from blog.models import Comment
+
+    post = post_with_published_location
+    for number in range(3):
+        Comment.objects.create(post=post, author=user, text=f'Текст {number}')
+    url = reverse('blog:post_detail', args=(post.id,))
+    another_user_client.get(url)
+
+    binds = []
+    bind_template = RequestContext.bind_template
+
+    def counting_bind(self, template):
+        binds.append(template)
+        return bind_template(self, template)
+
+    monkeypatch.setattr(RequestContext, 'bind_template', counting_bind)
+    with CaptureQueriesContext(connection) as queries:
+        content = user_client.get(url).content.decode()
+    assert '<!--hole' not in content
+    assert len(binds) == 1, (
+        'Убедитесь, что контекст запроса строится один раз на ответ, '
+        'а не для каждого фрагмента.'
+    )
+    for table in ('blog_postlike', 'blog_commentlike'):
+        assert len([
+            query for query in queries.captured_queries
+            if f'"{table}"' in query['sql']
+        ]) == 1, 'Убедитесь, что лайки страницы читаются одним запросом.'
+
+
+@pytest.mark.django_db
+def test_owner_profile_is_not_shared(user, user_client):
+    url = reverse('blog:profile', args=(user.username,))
+    user_client.get(url)
+    assert cache.get(page_cache_key(url, '', SHARED_VARIANT)) is None
+
+
+@pytest.mark.parametrize('backend', [
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.db.DatabaseCache',
+])
+def test_unsuitable_cache_is_rejected(settings, backend):
+    from blog.checks import check_shared_cache
+
+    settings.CACHES = {'default': {'BACKEND': backend}}
+    assert [error.id for error in check_shared_cache(None)] == ['blog.E001']
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': '127.0.0.1:11211',
+    }}
+    assert check_shared_cache(None) == []
@@ -0,0 +1,117 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post, ReadMarker
+
+
+def marker_queries(queries, statement):
+    return [
+        query for query in queries
+        if query['sql'].startswith(statement)
+        and 'blog_readmarker' in query['sql']
+    ]
+
+
+@pytest.mark.django_db
+def test_comment_count_is_denormalized(
+        user, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    comments = [
+        Comment.objects.create(post=post, author=another_user, text='текст')
+        for _ in range(3)
+    ]
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        'Убедитесь, что число комментариев хранится в `Post.comment_count`.'
+    )
+    comments[0].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 2
+    Post.objects.update(comment_count=0)
+    Post.objects.recalculate_comment_counts()
+    post.refresh_from_db()
+    assert post.comment_count == 2
+
+
+@pytest.mark.django_db
+def test_new_comments_are_highlighted_once(
+        user, user_client, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    first = Comment.objects.create(post=post, author=another_user, text='1')
+    content = user_client.get(url).content.decode()
+    assert 'новый' not in content
+    marker = ReadMarker.objects.get(user=user, post=post)
+    assert (marker.last_comment_id, marker.comment_count) == (first.id, 1)
+
+    with CaptureQueriesContext(connection) as queries:
+        user_client.get(url)
+    assert not marker_queries(queries, 'UPDATE'), (
+        'Убедитесь, что отметка прочтения не перезаписывается, '
+        'если новых комментариев нет.'
+    )
+
+    second = Comment.objects.create(post=post, author=another_user, text='2')
+    with CaptureQueriesContext(connection) as queries:
+        content = user_client.get(url).content.decode()
+    assert content.count('новый') == 1, (
+        'Убедитесь, что на странице поста подсвечиваются только '
+        'комментарии, появившиеся после прошлого визита.'
+    )
+    assert len(marker_queries(queries, 'UPDATE')) == 1
+    marker.refresh_from_db()
+    assert (marker.last_comment_id, marker.comment_count) == (second.id, 2)
+    assert 'новый' not in user_client.get(url).content.decode()
+
+
+@pytest.mark.django_db
+def test_feed_badges_use_one_query(
+        settings, user, user_client, another_user,
+        post_with_published_location
+):
+    settings.PAGE_CACHE_ENABLED = True
+    post = post_with_published_location
+    Comment.objects.create(post=post, author=another_user, text='1')
+    user_client.get(f'/posts/{post.id}/')
+    for _ in range(2):
+        Comment.objects.create(post=post, author=another_user, text='ещё')
+    uncached = user_client.get('/').content.decode()
+    assert 'новых: 2' in uncached
+    with CaptureQueriesContext(connection) as queries:
+        content = user_client.get('/').content.decode()
+    assert 'новых: 2' in content, (
+        'Убедитесь, что в ленте выводится число новых комментариев.'
+    )
+    assert len(marker_queries(queries, 'SELECT')) == 1, (
+        'Убедитесь, что отметки всех постов ленты выбираются одним запросом.'
+    )
+
+
+@pytest.mark.django_db
+def test_cached_post_page_moves_marker(
+        settings, user, user_client, another_user, another_user_client,
+        post_with_published_location
+):
+    settings.PAGE_CACHE_ENABLED = True
+    post = post_with_published_location
+    comment = Comment.objects.create(post=post, author=another_user, text='1')
+    another_user_client.get(f'/posts/{post.id}/')
+    content = user_client.get(f'/posts/{post.id}/').content.decode()
+    assert 'новый' not in content
+    marker = ReadMarker.objects.get(user=user, post=post)
+    assert (marker.last_comment_id, marker.comment_count) == (comment.id, 1), (
+        'Убедитесь, что отметка прочтения сдвигается и для страницы поста '
+        'из кеша.'
+    )
+
+
+def test_read_marker_tags_are_read_only():
+    from blog.templatetags import read_markers
+
+    assert 'read_post' not in read_markers.register.tags, (
+        'Убедитесь, что отметка прочтения не записывается при отрисовке '
+        'шаблона.'
+    )
@@ -0,0 +1,101 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import related
+from blog.models import Post, RelatedPost
+
+TEXTS = {
+    'tea': 'Зелёный чай заваривают водой восемьдесят градусов',
+    'tea2': 'Как заваривают зелёный чай: вода восемьдесят градусов',
+    'bike': 'Велосипедный маршрут вдоль реки и старого моста',
+}
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make(key):
+        return mixer.blend(
+            'blog.Post',
+            title=key,
+            text=TEXTS[key],
+            author=user,
+            category=published_category,
+            is_published=True,
+            pub_date=timezone.now(),
+        )
+    return make
+
+
+@pytest.mark.django_db
+def test_detail_renders_related_posts_with_one_query(
+        user_client, make_post
+):
+    post, similar, hidden = make_post('tea'), make_post('tea2'), make_post(
+        'bike'
+    )
+    RelatedPost.objects.bulk_create([
+        RelatedPost(post=post, related=similar, score=0.9),
+        RelatedPost(post=post, related=hidden, score=0.5),
+    ])
+    Post.objects.filter(pk=hidden.pk).update(is_published=False)
+    with CaptureQueriesContext(connection) as queries:
+        content = user_client.get(f'/posts/{post.id}/').content.decode()
+    assert f'href="/posts/{similar.id}/"' in content, (
+        'Убедитесь, что на странице поста выводятся похожие посты.'
+    )
+    assert f'href="/posts/{hidden.id}/"' not in content
+    assert len([
+        query for query in queries
+        if 'blog_relatedpost' in query['sql']
+    ]) == 1
+
+
+@pytest.mark.django_db
+def test_related_posts_are_built_and_updated(make_post):
+    tea, bike = make_post('tea'), make_post('bike')
+    call_command('build_related_posts', '--full')
+    assert not RelatedPost.objects.filter(post=tea, related=bike).exists(), (
+        'Убедитесь, что посты без общих слов не считаются похожими.'
+    )
+
+    tea2 = make_post('tea2')
+    call_command('build_related_posts')
+    assert list(RelatedPost.objects.filter(post=tea2).values_list(
+        'related_id', flat=True
+    )) == [tea.id], (
+        'Убедитесь, что для нового поста находятся похожие без полного '
+        'пересчёта.'
+    )
+    assert RelatedPost.objects.filter(post=tea, related=tea2).exists(), (
+        'Убедитесь, что новый пост добавляется в списки похожих постов.'
+    )
+
+    tea2.delete()
+    call_command('build_related_posts')
+    assert not RelatedPost.objects.filter(post=tea).exists()
+
+
+@pytest.mark.django_db
+def test_update_reads_only_candidate_vectors(make_post):
+    tea, _ = make_post('tea'), make_post('bike')
+    call_command('build_related_posts', '--full')
+    tea2 = make_post('tea2')
+    with CaptureQueriesContext(connection) as queries:
+        related.update_posts([tea2.pk])
+    vector_reads = [
+        query['sql'] for query in queries
+        if query['sql'].startswith('SELECT')
+        and 'FROM "blog_postvector"' in query['sql']
+    ]
+    assert vector_reads and all(
+        '"post_id" IN' in sql for sql in vector_reads
+    ), 'Убедитесь, что векторы читаются только для постов-кандидатов.'
+    assert not [
+        query for query in queries
+        if 'GROUP BY' in query['sql'] and 'blog_relatedpost' in query['sql']
+        and '"post_id" IN' not in query['sql']
+    ], 'Убедитесь, что пороги соседей считаются только для кандидатов.'
+    assert RelatedPost.objects.filter(post=tea, related=tea2).exists()
@@ -0,0 +1,89 @@
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from constants import Constants
+
+
+def locations(content):
+    return re.findall(r'<loc>http://testserver([^<]*)</loc>', content)
+
+
+def read(response):
+    if response.streaming:
+        return b''.join(response.streaming_content).decode()
+    return response.content.decode()
+
+
+@pytest.mark.django_db
+def test_sitemap_shards_cover_published_posts(
+        client, monkeypatch, many_posts_with_published_locations,
+        posts_with_unpublished_category
+):
+    monkeypatch.setattr(Constants, 'SITEMAP_SHARD_SIZE', 7)
+    index = client.get('/sitemap.xml')
+    assert index.status_code == 200
+    shards = locations(read(index))
+    post_shards = [url for url in shards if url.startswith('/sitemap-posts-')]
+    assert len(post_shards) == 3, (
+        'Убедитесь, что карта сайта разбита на части по '
+        '`SITEMAP_SHARD_SIZE` адресов.'
+    )
+    urls = []
+    for shard in post_shards:
+        with CaptureQueriesContext(connection) as queries:
+            urls += locations(read(client.get(shard)))
+        assert len(queries) == 1
+    expected = {
+        f'/posts/{post.id}/' for post in many_posts_with_published_locations
+    }
+    assert set(urls) == expected and len(urls) == len(expected), (
+        'Убедитесь, что части карты сайта содержат все опубликованные '
+        'посты ровно по одному разу.'
+    )
+
+
+@pytest.mark.django_db
+def test_sitemap_shards_follow_cached_starts(
+        client, mixer, monkeypatch, many_posts_with_published_locations
+):
+    monkeypatch.setattr(Constants, 'SITEMAP_SHARD_SIZE', 7)
+    shards = [
+        url for url in locations(read(client.get('/sitemap.xml')))
+        if url.startswith('/sitemap-posts-')
+    ]
+    # Начала частей закешированы, а посты тем временем меняются.
+    posts = many_posts_with_published_locations
+    Post.objects.filter(pk__in=[posts[0].pk, posts[8].pk]).delete()
+    mixer.cycle(10).blend(
+        'blog.Post', author=posts[0].author, category=posts[0].category,
+        location=posts[0].location,
+    )
+    urls = []
+    for shard in shards:
+        urls += locations(read(client.get(shard)))
+    expected = {
+        f'/posts/{pk}/'
+        for pk in Post.published_posts.values_list('pk', flat=True)
+    }
+    assert set(urls) == expected and len(urls) == len(expected), (
+        'Убедитесь, что части карты сайта ограничены началом следующей '
+        'части и не пересекаются, пока начала частей в кеше.'
+    )
+
+
+@pytest.mark.django_db
+def test_sitemap_lists_categories_and_profiles(
+        client, post_with_published_location
+):
+    shards = locations(read(client.get('/sitemap.xml')))
+    urls = []
+    for shard in shards:
+        urls += locations(read(client.get(shard)))
+    post = post_with_published_location
+    assert f'/category/{post.category.slug}/' in urls
+    assert f'/profile/{post.author.username}/' in urls
+    assert client.get('/sitemap-unknown-1.xml').status_code == 404
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog import bulk
+from blog.models import Post
+
+
+def get_changes(client, token):
+    response = client.get('/api/v1/changes/', {'since': token})
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.fixture
+def token(client):
+    return client.get('/api/v1/changes/').json()['token']
+
+
+@pytest.mark.django_db
+def test_changes_since_token(
+        client, mixer, token, post_with_published_location,
+        post_of_another_author
+):
+    comment = mixer.blend('blog.Comment', post=post_with_published_location)
+    data = get_changes(client, token)
+    assert sorted(post['id'] for post in data['posts']['created']) == sorted(
+        [post_with_published_location.pk, post_of_another_author.pk]
+    ), 'Убедитесь, что новые посты попадают в изменения.'
+    assert [item['id'] for item in data['comments']['created']] == [
+        comment.pk
+    ]
+
+    token = data['token']
+    assert get_changes(client, token)['posts'] == {
+        'created': [], 'updated': [], 'deleted': []
+    }
+    post_of_another_author.title = 'Исправленный заголовок'
+    post_of_another_author.save()
+    deleted_pk = post_with_published_location.pk
+    post_with_published_location.delete()
+    data = get_changes(client, token)
+    assert [post['title'] for post in data['posts']['updated']] == [
+        'Исправленный заголовок'
+    ]
+    assert data['posts']['deleted'] == [deleted_pk]
+    assert data['comments']['deleted'] == [comment.pk], (
+        'Убедитесь, что удаление поста оставляет отметки об удалении '
+        'его комментариев.'
+    )
+
+
+@pytest.mark.django_db
+def test_unpublished_and_bulk_changes_are_tombstones(
+        client, user, many_posts_with_published_locations
+):
+    token = client.get('/api/v1/changes/').json()['token']
+    bulk.set_published(Post.objects.filter(author=user), False)
+    data = get_changes(client, token)
+    assert len(data['posts']['deleted']) == len(
+        many_posts_with_published_locations
+    )
+
+
+@pytest.mark.django_db
+def test_scheduled_post_appears_when_due(
+        client, mixer, user, published_category
+):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(hours=1),
+    )
+    token = client.get('/api/v1/changes/').json()['token']
+    Post.objects.filter(pk=post.pk).update(
+        pub_date=timezone.now() - timedelta(seconds=1)
+    )
+    past_token = token.split('.')[0] + '.' + str(
+        int((timezone.now() - timedelta(minutes=1)).timestamp())
+    )
+    data = get_changes(client, past_token)
+    assert [item['id'] for item in data['posts']['updated']] == [post.pk]
+
+
+@pytest.mark.django_db
+def test_bad_and_expired_tokens(client):
+    assert client.get(
+        '/api/v1/changes/', {'since': 'oops'}
+    ).status_code == 400
+    assert client.get('/api/v1/changes/', {'since': '0.0'}).status_code == 410
@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import bulk
+from blog.models import Post, Tag
+
+
+def tag_counts():
+    return dict(Tag.objects.values_list('slug', 'post_count'))
+
+
+@pytest.mark.django_db
+def test_create_post_with_tags(user_client, published_category):
+    response = user_client.post('/posts/create/', data={
+        'title': 'Поход',
+        'text': 'Текст',
+        'pub_date': '2020-01-01T10:00',
+        'category': published_category.id,
+        'tags': 'Горы, #путешествия, горы',
+    })
+    assert response.status_code == 302
+    post = Post.objects.get(title='Поход')
+    assert set(post.tags.values_list('slug', flat=True)) == {
+        'горы', 'путешествия'
+    }
+    assert tag_counts() == {'горы': 1, 'путешествия': 1}
+
+    response = user_client.get(f'/tag/{post.tags.get(slug="горы").slug}/')
+    assert response.status_code == 200
+    assert list(response.context['page_obj']) == [post], (
+        'Убедитесь, что на странице тега выводятся посты с этим тегом.'
+    )
+    cloud = user_client.get('/').context['tag_cloud']
+    assert [tag.slug for tag in cloud] == ['горы', 'путешествия']
+
+
+@pytest.mark.django_db
+def test_tag_counts_follow_publication(mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True,
+    )
+    draft = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=False,
+    )
+    tag = Tag.objects.create(name='горы', slug='горы')
+    post.tags.add(tag)
+    draft.tags.add(tag)
+    assert tag_counts() == {'горы': 1}, (
+        'Убедитесь, что счётчик тега учитывает только опубликованные посты.'
+    )
+    draft.is_published = True
+    draft.save()
+    assert tag_counts() == {'горы': 2}
+    bulk.set_published(Post.objects.all(), False)
+    assert tag_counts() == {'горы': 0}
+    bulk.set_published(Post.objects.all(), True)
+    post.tags.clear()
+    assert tag_counts() == {'горы': 1}
+    draft.delete()
+    assert tag_counts() == {'горы': 0}
+
+    Tag.objects.update(post_count=7)
+    call_command('recalculate_tag_counts')
+    assert tag_counts() == {'горы': 0}
+
+
+@pytest.mark.django_db
+def test_tag_counts_follow_visibility(
+        mixer, user, published_category, another_category
+):
+    posts = mixer.cycle(2).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    tag = Tag.objects.create(name='горы', slug='горы')
+    for post in posts:
+        post.tags.add(tag)
+    published_category.is_published = False
+    published_category.save()
+    assert tag_counts() == {'горы': 0}, (
+        'Убедитесь, что счётчик тега не учитывает посты снятых '
+        'с публикации категорий.'
+    )
+    another_category.is_published = False
+    another_category.save()
+    bulk.set_category(Post.objects.filter(pk=posts[0].pk), another_category)
+    published_category.is_published = True
+    published_category.save()
+    assert tag_counts() == {'горы': 1}
+    published_category.delete()
+    assert tag_counts() == {'горы': 0}
+
+    another_category.is_published = True
+    another_category.save()
+    assert [item.post_count for item in Tag.objects.cloud()] == [1]
+    Post.objects.filter(pk=posts[0].pk).update(
+        pub_date=timezone.now() + timedelta(days=1)
+    )
+    assert Tag.objects.cloud() == [], (
+        'Убедитесь, что облако тегов не учитывает отложенные посты.'
+    )
+    Tag.objects.update(post_count=7)
+    call_command('recalculate_tag_counts')
+    assert tag_counts() == {'горы': 1}
+
+
+@pytest.mark.django_db
+def test_unknown_tag_page(client):
+    assert client.get('/tag/нет-такого/').status_code == 404
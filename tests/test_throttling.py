@@ -0,0 +1,32 @@
+import pytest
+from django.urls import reverse
+
+from blog.models import Comment
+from blog.throttling import TokenBucket
+
+
+@pytest.mark.django_db
+def test_token_bucket_burst_and_retry_after():
+    bucket = TokenBucket('throttle:test', '3/m')
+    assert [bucket.consume() for _ in range(3)] == [0, 0, 0]
+    retry_after = bucket.consume()
+    assert 0 < retry_after <= 20, (
+        'Убедитесь, что после исчерпания корзины возвращается время '
+        'до следующего токена.'
+    )
+
+
+@pytest.mark.django_db
+def test_comment_flood_gets_429(user_client, post_with_published_location):
+    url = reverse('blog:add_comment', args=(post_with_published_location.pk,))
+    statuses = [
+        user_client.post(url, {'text': f'Комментарий {number}'}).status_code
+        for number in range(5)
+    ]
+    assert statuses == [302] * 5
+    response = user_client.post(url, {'text': 'Ещё один'})
+    assert response.status_code == 429
+    assert int(response['Retry-After']) > 0
+    assert Comment.objects.count() == 5, (
+        'Убедитесь, что отклонённые запросы не создают комментарии.'
+    )
@@ -0,0 +1,100 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import AuthorStats, Follow, TimelineEntry
+from blog.timeline import read_timeline
+from constants import Constants
+
+
+@pytest.fixture
+def followed_posts(mixer, another_user, published_category):
+    return mixer.cycle(5).blend(
+        'blog.Post', author=another_user, category=published_category,
+        is_published=True,
+    )
+
+
+@pytest.mark.django_db
+def test_follow_and_unfollow(user_client, user, another_user, followed_posts):
+    url = f'/profile/{another_user.username}/'
+    for _ in range(2):
+        response = user_client.post(url + 'follow/')
+        assert response.status_code == 302
+    assert Follow.objects.filter(follower=user, author=another_user).exists()
+    assert AuthorStats.objects.get(author=another_user).followers == 1, (
+        'Убедитесь, что повторная подписка не меняет счётчик подписчиков.'
+    )
+    assert TimelineEntry.objects.filter(user=user).count() == 5, (
+        'Убедитесь, что при подписке в ленту добавляются посты автора.'
+    )
+    assert 'Отписаться' in user_client.get(url).content.decode()
+
+    user_client.post(url + 'unfollow/')
+    assert AuthorStats.objects.get(author=another_user).followers == 0
+    assert not TimelineEntry.objects.filter(user=user).exists()
+
+
+@pytest.mark.django_db
+def test_new_posts_are_fanned_out(
+        mixer, user, another_user, published_category, user_client
+):
+    Follow.objects.create(follower=user, author=another_user)
+    post = mixer.blend(
+        'blog.Post', author=another_user, category=published_category,
+        is_published=True,
+    )
+    assert not TimelineEntry.objects.exists()
+    call_command('fanout_timelines')
+    assert TimelineEntry.objects.filter(user=user, post=post).exists(), (
+        'Убедитесь, что `fanout_timelines` раздаёт новые посты подписчикам.'
+    )
+    response = user_client.get('/feed/')
+    assert response.context['posts'] == [post]
+
+    post.is_published = False
+    post.save()
+    call_command('fanout_timelines')
+    assert not TimelineEntry.objects.exists(), (
+        'Убедитесь, что снятые с публикации посты удаляются из лент.'
+    )
+
+
+@pytest.mark.django_db
+def test_timeline_keyset_pages(
+        user, another_user, followed_posts, monkeypatch, mixer,
+        published_category
+):
+    Follow.objects.create(follower=user, author=another_user)
+    large_author = mixer.blend('auth.User')
+    large_posts = mixer.cycle(3).blend(
+        'blog.Post', author=large_author, category=published_category,
+        is_published=True,
+    )
+    monkeypatch.setattr(Constants, 'TIMELINE_FANOUT_MAX_FOLLOWERS', 1)
+    Follow.objects.create(follower=user, author=large_author)
+    assert not TimelineEntry.objects.filter(author=large_author).exists()
+
+    seen, cursor = [], None
+    while True:
+        with CaptureQueriesContext(connection) as queries:
+            posts, cursor = read_timeline(user, cursor, size=3)
+        assert len(queries) <= 4
+        seen += posts
+        if cursor is None:
+            break
+    expected = sorted(
+        followed_posts + large_posts,
+        key=lambda post: (post.pub_date, post.id),
+        reverse=True,
+    )
+    assert seen == expected, (
+        'Убедитесь, что лента выдаёт посты всех подписок по порядку '
+        'и без повторов.'
+    )
+
+
+@pytest.mark.django_db
+def test_timeline_bad_cursor(user_client):
+    assert user_client.get('/feed/?before=bad').status_code == 404
@@ -0,0 +1,46 @@
+import pytest
+from django.core.management import call_command
+
+from blog.counters import flush_counters, post_views
+from blog.models import TrendingPost
+
+
+def scores():
+    return dict(TrendingPost.objects.values_list('post_id', 'score'))
+
+
+@pytest.mark.django_db
+def test_trending_follows_comments_and_views(
+        mixer, client, many_posts_with_published_locations
+):
+    quiet, popular, viewed = many_posts_with_published_locations[:3]
+    mixer.cycle(3).blend('blog.Comment', post=popular)
+    for _ in range(2):
+        post_views.record(viewed.id)
+    flush_counters()
+    flush_counters()
+    assert set(scores()) == {popular.id, viewed.id}, (
+        'Убедитесь, что рейтинг обновляется комментариями и просмотрами.'
+    )
+
+    response = client.get('/trending/')
+    assert response.status_code == 200
+    assert list(response.context['page_obj']) == [popular, viewed], (
+        'Убедитесь, что популярные посты упорядочены по рейтингу.'
+    )
+
+
+@pytest.mark.django_db
+def test_rebase_keeps_order_and_drops_cold_posts(
+        mixer, many_posts_with_published_locations
+):
+    hot, cold = many_posts_with_published_locations[:2]
+    mixer.cycle(2).blend('blog.Comment', post=hot)
+    TrendingPost.objects.create(post=cold, score=0.01)
+    before = scores()[hot.id]
+    call_command('rebase_trending')
+    after = scores()
+    assert set(after) == {hot.id}, (
+        'Убедитесь, что остывшие посты удаляются из рейтинга.'
+    )
+    assert after[hot.id] == pytest.approx(before, rel=1e-3)
@@ -0,0 +1,61 @@
+import pytest
+from django.core.management import call_command
+
+from blog.counters import flush_counters, post_views
+
+
+@pytest.mark.django_db
+def test_views_are_buffered_and_flushed(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    for _ in range(3):
+        response = user_client.get(f'/posts/{post.id}/')
+    assert 'Просмотров: 3' in response.content.decode()
+    post.refresh_from_db()
+    assert post.views == 0, (
+        'Убедитесь, что просмотры не записываются в БД при каждом запросе.'
+    )
+    assert post_views.pending(post.id) == 3
+
+    flush_counters()
+    user_client.get(f'/posts/{post.id}/')
+    call_command('flush_counters')
+    post.refresh_from_db()
+    assert post.views == 3, (
+        'Убедитесь, что команда `flush_counters` переносит просмотры '
+        'в БД.'
+    )
+    assert post_views.total(post.id) == 4
+    flush_counters()
+    post.refresh_from_db()
+    assert (post.views, post_views.pending(post.id)) == (4, 0)
+
+
+@pytest.mark.django_db
+def test_cached_detail_page_counts_views(
+        settings, user_client, post_with_published_location
+):
+    settings.PAGE_CACHE_ENABLED = True
+    post = post_with_published_location
+    user_client.get(f'/posts/{post.id}/')
+    response = user_client.get(f'/posts/{post.id}/')
+    assert 'Просмотров: 2' in response.content.decode(), (
+        'Убедитесь, что просмотры учитываются и для страниц из кеша.'
+    )
+
+
+def test_view_count_tag_is_read_only(monkeypatch):
+    from django.template import Context, Template
+
+    recorded = []
+    monkeypatch.setattr(post_views, 'record', recorded.append)
+    monkeypatch.setattr(post_views, 'total', lambda post_id: 7)
+    content = Template(
+        '{% load post_views %}{% post_view_count 1 as views %}{{ views }}'
+    ).render(Context())
+    assert content == '7'
+    assert not recorded, (
+        'Убедитесь, что тег шаблона только выводит число просмотров, '
+        'а не учитывает просмотр.'
+    )